@@ -1,5 +1,13 @@
+import glob
 import torch
 import numpy as np
+import os
+import uuid
+
+from .utils.block_matching import find_block_shifts, apply_block_shifts
+
+# Name prefix of the memory-mapped output files in ComfyUI's temp directory
+MEMMAP_PREFIX = "djz_datamosh_v2_"
 
 class DJZDatamoshV2:
     def __init__(self):
@@ -37,6 +45,18 @@ class DJZDatamoshV2:
                     "step": 1,
                     "description": "Number of frames to generate for glide mode"
                 })
+            },
+            "optional": {
+                "window_size": ("INT", {
+                    "default": 16,
+                    "min": 1,
+                    "max": 300,
+                    "step": 1,
+                    "description": "Frames processed per window; only the previous frame is carried between windows"
+                }),
+                "output_mode": (["memory", "memmap"], {
+                    "default": "memory"
+                })
             }
         }
     
@@ -45,148 +65,111 @@ class DJZDatamoshV2:
     CATEGORY = "image/effects"
 
     def find_shifts_fast(self, prev_frame, curr_frame, block_size, max_shift, shift_range):
-        """Fast version of shift finding"""
-        # Convert to expected format and scale to byte range
-        prev_frame = (prev_frame.permute(0, 3, 1, 2) * 255).byte()
-        curr_frame = (curr_frame.permute(0, 3, 1, 2) * 255).byte()
-        
-        _, channels, height, width = prev_frame.shape
-        h_blocks = height // block_size
-        w_blocks = width // block_size
-        
-        # Initialize output shift tensor
-        best_shifts = torch.zeros((h_blocks, w_blocks, 2), device=prev_frame.device)
-        
-        # Create step size for faster search
-        step = shift_range
-        shift_values = list(range(-max_shift, max_shift + 1, step))
-        
-        for h in range(h_blocks):
-            for w in range(w_blocks):
-                y = h * block_size
-                x = w * block_size
-                
-                # Get current block dimensions
-                block_height = min(block_size, height - y)
-                block_width = min(block_size, width - x)
-                
-                # Extract current block
-                curr_block = curr_frame[0, :, y:y+block_height, x:x+block_width]
-                
-                min_diff = float('inf')
-                best_dx = 0
-                best_dy = 0
-                
-                # Search for best match
-                for dy in shift_values:
-                    for dx in shift_values:
-                        # Calculate wrapped coordinates
-                        py = (y + dy) % height
-                        px = (x + dx) % width
-                        
-                        # Get comparison block
-                        prev_block = prev_frame[0, :, 
-                                              py:py+block_height,
-                                              px:px+block_width]
-                        
-                        if prev_block.shape == curr_block.shape:
-                            diff = torch.abs(prev_block - curr_block).sum().item()
-                            if diff < min_diff:
-                                min_diff = diff
-                                best_dx = dx
-                                best_dy = dy
-                
-                best_shifts[h, w, 0] = best_dx
-                best_shifts[h, w, 1] = best_dy
-        
-        return best_shifts
+        """Fast version of shift finding: SAD for all blocks at once per candidate shift"""
+        return find_block_shifts(prev_frame, curr_frame, block_size, max_shift, shift_range)
 
     def apply_shifts(self, frame, shifts, block_size):
-        """Apply computed motion vectors"""
-        # Convert to processing format
-        frame = frame.permute(0, 3, 1, 2)
-        
-        # Get dimensions
-        batch, channels, height, width = frame.shape
-        h_blocks = height // block_size
-        w_blocks = width // block_size
-        
-        # Create output tensor
-        output = frame.clone()
-        
-        # Apply shifts block by block
-        for h in range(h_blocks):
-            for w in range(w_blocks):
-                y_start = h * block_size
-                x_start = w * block_size
-                
-                # Calculate block size (handle edge cases)
-                block_height = min(block_size, height - y_start)
-                block_width = min(block_size, width - x_start)
-                
-                # Get shift values
-                dx = int(shifts[h, w, 0].item())
-                dy = int(shifts[h, w, 1].item())
-                
-                # Calculate source coordinates with wrapping
-                src_y = int((y_start + dy) % height)
-                src_x = int((x_start + dx) % width)
-                
-                # Apply shift
-                output[0, :, y_start:y_start+block_height, x_start:x_start+block_width] = \
-                    frame[0, :, src_y:src_y+block_height, src_x:src_x+block_width]
-        
-        # Convert back to original format
-        return output.permute(0, 2, 3, 1)
+        """Apply computed motion vectors as a single remap"""
+        return apply_block_shifts(frame, shifts, block_size)
+
+    def allocate_output(self, shape, dtype, output_mode):
+        """Preallocate the output batch in RAM, or memory-mapped in ComfyUI's temp directory"""
+        if output_mode == "memmap":
+            import folder_paths
+            temp_dir = folder_paths.get_temp_directory()
+            os.makedirs(temp_dir, exist_ok=True)
+            self.remove_stale_memmaps(temp_dir)
+            path = os.path.join(temp_dir, f"{MEMMAP_PREFIX}{uuid.uuid4().hex}.dat")
+            np_dtype = torch.empty(0, dtype=dtype).numpy().dtype
+            backing = np.memmap(path, dtype=np_dtype, mode='w+', shape=shape)
+            print(f"Writing output to memory-mapped file {path}")
+            try:
+                # The mapping keeps the data alive; the name is not needed once it exists
+                os.unlink(path)
+            except OSError:
+                # Windows cannot delete a file that is still mapped; a later run removes it
+                pass
+            return torch.from_numpy(backing), backing
+        return torch.empty(shape, dtype=dtype), None
+
+    @staticmethod
+    def remove_stale_memmaps(temp_dir):
+        """Delete memmap files earlier runs could not unlink, skipping any still mapped"""
+        for path in glob.glob(os.path.join(temp_dir, f"{MEMMAP_PREFIX}*.dat")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
-    def process_glide(self, images, block_size, max_shift, shift_range, sequence_length):
+    def process_glide(self, images, block_size, max_shift, shift_range, sequence_length,
+                      window_size=16, output_mode="memory"):
         """Process in glide mode - propagate motion from two frames"""
         if images.shape[0] < 2:
             return images
             
+        output, backing = self.allocate_output(
+            (sequence_length,) + tuple(images.shape[1:]), images.dtype, output_mode
+        )
+        
         # Initialize with first frame
-        output_frames = [images[0]]
+        output[0] = images[0]
         current_frame = images[0:1].clone()
         
         # Calculate initial shifts between first two frames
         shifts = self.find_shifts_fast(images[0:1], images[1:2], block_size, max_shift, shift_range)
         
-        # Generate sequence by repeatedly applying shifts
-        for i in range(sequence_length - 1):
-            print(f"Generating glide frame {i+1}/{sequence_length-1}")
-            current_frame = self.apply_shifts(current_frame, shifts, block_size)
-            output_frames.append(current_frame[0])
+        # Generate sequence by repeatedly applying shifts, one window at a time
+        for window_start in range(1, sequence_length, window_size):
+            window_end = min(window_start + window_size, sequence_length)
+            for i in range(window_start, window_end):
+                print(f"Generating glide frame {i}/{sequence_length-1}")
+                current_frame = self.apply_shifts(current_frame, shifts, block_size)
+                output[i] = current_frame[0]
+            if backing is not None:
+                backing.flush()
             
-        return torch.stack(output_frames)
+        return output
 
     def process_copy(self, images, block_size, max_shift, shift_range):
         """Process in copy mode - preserve original frames"""
         return images
 
-    def process_movement(self, images, block_size, max_shift, shift_range):
+    def process_movement(self, images, block_size, max_shift, shift_range,
+                         window_size=16, output_mode="memory"):
         """Process in movement mode - calculate shifts between all consecutive frames"""
         if images.shape[0] < 2:
             return images
             
-        output_frames = [images[0]]
+        n_frames = images.shape[0]
+        output, backing = self.allocate_output(tuple(images.shape), images.dtype, output_mode)
+        
+        output[0] = images[0]
         current_frame = images[0:1].clone()
         
-        # Process each consecutive pair of frames
-        for i in range(1, images.shape[0]):
-            print(f"Processing movement frame {i}/{images.shape[0]-1}")
-            next_frame = images[i:i+1]
+        # Process consecutive pairs window by window; only current_frame crosses window boundaries
+        for window_start in range(1, n_frames, window_size):
+            window_end = min(window_start + window_size, n_frames)
+            window = images[window_start:window_end].to(device=current_frame.device, dtype=current_frame.dtype)
             
-            # Calculate shifts between current and next frame
-            shifts = self.find_shifts_fast(current_frame, next_frame, block_size, max_shift, shift_range)
+            for offset in range(window.shape[0]):
+                i = window_start + offset
+                print(f"Processing movement frame {i}/{n_frames-1}")
+                next_frame = window[offset:offset+1]
+                
+                # Calculate shifts between current and next frame
+                shifts = self.find_shifts_fast(current_frame, next_frame, block_size, max_shift, shift_range)
+                
+                # Apply shifts to current frame
+                current_frame = self.apply_shifts(current_frame, shifts, block_size)
+                output[i] = current_frame[0]
             
-            # Apply shifts to current frame
-            datamoshed = self.apply_shifts(current_frame, shifts, block_size)
-            output_frames.append(datamoshed[0])
-            current_frame = datamoshed.clone()
+            if backing is not None:
+                backing.flush()
         
-        return torch.stack(output_frames)
+        return output
 
-    def datamosh(self, images, mode, block_size, max_shift, shift_range, sequence_length):
+    def datamosh(self, images, mode, block_size, max_shift, shift_range, sequence_length,
+                 window_size=16, output_mode="memory"):
         print(f"Starting datamosh V2 in {mode} mode")
         print(f"Input batch shape: {images.shape}")
         
@@ -196,11 +179,13 @@ class DJZDatamoshV2:
         
         # Process according to selected mode
         if mode == "glide":
-            result = self.process_glide(images, block_size, max_shift, shift_range, sequence_length)
+            result = self.process_glide(images, block_size, max_shift, shift_range, sequence_length,
+                                        window_size, output_mode)
         elif mode == "copy":
             result = self.process_copy(images, block_size, max_shift, shift_range)
         else:  # movement
-            result = self.process_movement(images, block_size, max_shift, shift_range)
+            result = self.process_movement(images, block_size, max_shift, shift_range,
+                                           window_size, output_mode)
             
         print(f"Processing complete. Output shape: {result.shape}")
         return (result,)
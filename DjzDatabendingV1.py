@@ -1,11 +1,6 @@
 import numpy as np
 import torch
-import cv2
-from PIL import Image
-import io
 import scipy.signal as signal
-import tempfile
-import os
 
 class DjzDatabendingV1:
     @classmethod
@@ -51,6 +46,8 @@ class DjzDatabendingV1:
     FUNCTION = "apply_databending"
     CATEGORY = "image/effects"
 
+    # Effects operate on a 2-D (frames x samples) array, filtering along the sample axis
+
     def apply_echo(self, audio_data, delay, decay, sample_rate=44100):
         """Apply echo effect to audio data"""
         print(f"Applying echo effect (delay: {delay}, decay: {decay})")
@@ -58,15 +55,16 @@ class DjzDatabendingV1:
         echo_filter = np.zeros(delay_samples + 1)
         echo_filter[0] = 1
         echo_filter[-1] = decay
-        return signal.convolve(audio_data, echo_filter, mode='same')
+        return signal.fftconvolve(audio_data, echo_filter[np.newaxis, :], mode='same', axes=-1)
         
     def apply_reverb(self, audio_data, depth, decay, sample_rate=44100):
         """Apply reverb effect to audio data"""
         print(f"Applying reverb effect (depth: {depth}, decay: {decay})")
         num_reflections = int(depth * sample_rate)
         decay_curve = np.exp(-decay * np.arange(num_reflections))
-        impulse = np.random.rand(num_reflections) * decay_curve
-        return signal.convolve(audio_data, impulse, mode='same')
+        # One random impulse response per frame, convolved row by row in a single call
+        impulses = np.random.rand(audio_data.shape[0], num_reflections) * decay_curve
+        return signal.fftconvolve(audio_data, impulses, mode='same', axes=-1)
     
     def apply_distortion(self, audio_data, intensity):
         """Apply distortion effect to audio data"""
@@ -83,41 +81,60 @@ class DjzDatabendingV1:
     def apply_tremolo(self, audio_data, rate, depth, sample_rate=44100):
         """Apply tremolo effect to audio data"""
         print(f"Applying tremolo effect (rate: {rate}, depth: {depth})")
-        t = np.arange(len(audio_data)) / sample_rate
+        t = np.arange(audio_data.shape[-1]) / sample_rate
         mod = depth * np.sin(2 * np.pi * rate * t) + (1 - depth)
         return audio_data * mod
         
     def apply_phaser(self, audio_data, rate, depth, sample_rate=44100):
         """Apply phaser effect to audio data"""
         print(f"Applying phaser effect (rate: {rate}, depth: {depth})")
-        t = np.arange(len(audio_data)) / sample_rate
+        t = np.arange(audio_data.shape[-1]) / sample_rate
         lfo = (np.sin(2 * np.pi * rate * t) + 1) * depth
-        allpass = np.exp(-2j * np.pi * lfo / sample_rate)
-        return np.real(audio_data * allpass)
+        # Real part of the complex all-pass rotation, shared by every frame
+        gain = np.cos(2 * np.pi * lfo / sample_rate)
+        return audio_data * gain
         
     def apply_chorus(self, audio_data, rate, depth, sample_rate=44100):
         """Apply chorus effect to audio data"""
         print(f"Applying chorus effect (rate: {rate}, depth: {depth})")
-        t = np.arange(len(audio_data)) / sample_rate
+        n_samples = audio_data.shape[-1]
+        t = np.arange(n_samples) / sample_rate
         mod = depth * np.sin(2 * np.pi * rate * t)
-        indices = np.arange(len(audio_data)) + (mod * sample_rate).astype(int)
-        indices = np.clip(indices, 0, len(audio_data) - 1)
-        return 0.5 * (audio_data + audio_data[indices])
+        indices = np.arange(n_samples) + (mod * sample_rate).astype(int)
+        indices = np.clip(indices, 0, n_samples - 1)
+        return 0.5 * (audio_data + audio_data[:, indices])
+
+    def images_to_audio(self, batch):
+        """Lay out a (N, H, W, 3) batch as the pixel bytes of 24-bit BMP files, one row per frame
+
+        BMP stores rows bottom-up in BGR order, each row padded to a multiple of 4 bytes.
+        """
+        batch_size, height, width, _ = batch.shape
+        row_bytes = width * 3
+        stride = (row_bytes + 3) // 4 * 4
+
+        pixels = (batch * 255).astype(np.uint8)[:, ::-1, :, ::-1].reshape(batch_size, height, row_bytes)
+        raw = np.zeros((batch_size, height, stride), dtype=np.uint8)
+        raw[:, :, :row_bytes] = pixels
+        return raw.reshape(batch_size, height * stride).astype(np.float32) / 255.0
+
+    def audio_to_images(self, audio_data, height, width):
+        """Inverse of images_to_audio: decode BMP pixel bytes back to a (N, H, W, 3) batch"""
+        batch_size = audio_data.shape[0]
+        row_bytes = width * 3
+        stride = (row_bytes + 3) // 4 * 4
+
+        raw = (audio_data * 255).astype(np.uint8).reshape(batch_size, height, stride)
+        pixels = raw[:, :, :row_bytes].reshape(batch_size, height, width, 3)[:, ::-1, :, ::-1]
+        return pixels.astype(np.float32) / 255.0
+
+    def process_batch(self, batch, effect_type, params):
+        """Process a whole batch with one vectorized pass of the selected effect"""
+        print(f"Processing {batch.shape[0]} images with {effect_type} effect...")
+        _, height, width, _ = batch.shape
 
-    def process_single_image(self, image, effect_type, params):
-        """Process a single image with databending effects"""
-        print(f"Processing image with {effect_type} effect...")
-        
-        # Create temporary BMP file
-        with tempfile.NamedTemporaryFile(suffix='.bmp', delete=False) as tmp_bmp:
-            bmp_path = tmp_bmp.name
-            Image.fromarray((image * 255).astype(np.uint8)).save(bmp_path, 'BMP')
-        
         print("Converting to raw audio data...")
-        # Read BMP header
-        with open(bmp_path, 'rb') as f:
-            header = f.read(54)  # BMP header size
-            audio_data = np.frombuffer(f.read(), dtype=np.uint8).astype(np.float32) / 255.0
+        audio_data = self.images_to_audio(batch)
 
         print("Applying audio effect...")
         # Apply selected effect
@@ -137,22 +154,11 @@ class DjzDatabendingV1:
             processed_audio = self.apply_chorus(audio_data, params['rate'], params['depth'])
 
         print("Converting back to image...")
-        # Convert back to image data
-        processed_data = (processed_audio * 255).astype(np.uint8)
-        
-        # Create new image with original header
-        with tempfile.NamedTemporaryFile(suffix='.bmp', delete=False) as tmp_out:
-            tmp_out.write(header)
-            tmp_out.write(processed_data.tobytes())
-            
-        # Read processed image
-        processed_image = np.array(Image.open(tmp_out.name)).astype(np.float32) / 255.0
-        
-        # Cleanup temporary files
-        os.unlink(bmp_path)
-        os.unlink(tmp_out.name)
-        
-        return processed_image
+        return self.audio_to_images(processed_audio, height, width)
+
+    def process_single_image(self, image, effect_type, params):
+        """Process a single image with databending effects"""
+        return self.process_batch(image[np.newaxis], effect_type, params)[0]
 
     def apply_databending(self, images, effect_type, echo_delay, echo_decay, distortion_intensity, modulation_rate, modulation_depth):
         """Process batch of images with databending effects"""
@@ -160,7 +166,6 @@ class DjzDatabendingV1:
         
         # Convert from torch tensor to numpy array
         batch_numpy = images.cpu().numpy()
-        batch_size = batch_numpy.shape[0]
         
         # Prepare parameters
         params = {
@@ -171,11 +176,8 @@ class DjzDatabendingV1:
             'depth': modulation_depth
         }
         
-        # Process each image in the batch
-        processed_batch = np.zeros_like(batch_numpy)
-        for i in range(batch_size):
-            print(f"\nProcessing image {i+1}/{batch_size}")
-            processed_batch[i] = self.process_single_image(batch_numpy[i], effect_type, params)
+        # Process the whole batch at once
+        processed_batch = self.process_batch(batch_numpy, effect_type, params)
         
         print("\nDatabending process complete!")
         return (torch.from_numpy(processed_batch).to(images.device),)
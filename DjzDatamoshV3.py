@@ -1,15 +1,14 @@
 import torch
 import numpy as np
 import subprocess
-import os
-import tempfile
-from PIL import Image
-import io
+import threading
 
 class DjzDatamoshV3:
     def __init__(self):
         self.type = "DjzDatamoshV3"
         self.output_node = True
+        # Executable used for encoding/decoding, override to point at a local build
+        self.ffmpeg_binary = "ffmpeg"
         
     @classmethod
     def INPUT_TYPES(cls):
@@ -42,131 +41,149 @@ class DjzDatamoshV3:
     FUNCTION = "datamosh"
     CATEGORY = "image/effects"
 
-    def batch_to_initial_avi(self, images, temp_dir):
-        """Convert image batch to initial AVI format"""
-        # First save frames as PNG
-        frame_pattern = os.path.join(temp_dir, 'frame_%04d.png')
-        for i in range(len(images)):
-            img_np = (images[i].cpu().numpy() * 255).astype(np.uint8)
-            Image.fromarray(img_np).save(frame_pattern % i)
-            
-        # Convert to AVI using exact ffmpeg command from mosh.py
-        input_avi = os.path.join(temp_dir, 'input.avi')
-        subprocess.call(
-            f'ffmpeg -loglevel error -y -i "{frame_pattern}" '
-            f'-crf 0 -pix_fmt yuv420p -bf 0 -b 10000k -r 30 "{input_avi}"',
-            shell=True
+    def run_ffmpeg_pipe(self, args, input_chunks):
+        """Run ffmpeg with raw data streamed to stdin and return everything it writes to stdout"""
+        process = subprocess.Popen(
+            [self.ffmpeg_binary, '-loglevel', 'error', '-y'] + args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
         )
-        
-        # Clean up PNGs
-        for i in range(len(images)):
-            os.remove(frame_pattern % i)
-            
-        return input_avi
 
-    def apply_datamosh(self, input_avi, output_avi, mode, start_frame, end_frame, delta_frames):
-        """Apply datamoshing effect following mosh.py logic exactly"""
-        # Read input AVI
-        with open(input_avi, 'rb') as in_file:
-            in_file_bytes = in_file.read()
+        def feed():
+            # Feed from a separate thread so a full stdout pipe cannot deadlock the writer
+            try:
+                for chunk in input_chunks:
+                    process.stdin.write(chunk)
+            except BrokenPipeError:
+                pass
+            finally:
+                process.stdin.close()
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        output = process.stdout.read()
+        writer.join()
+        process.wait()
+        return output
+
+    def batch_to_initial_avi(self, images):
+        """Convert image batch to initial AVI format in memory"""
+        height, width = images.shape[1], images.shape[2]
+
+        def raw_frames():
+            for i in range(len(images)):
+                yield (images[i].cpu().numpy() * 255).astype(np.uint8).tobytes()
 
-        # Split into frames exactly as mosh.py does
+        # Same encoder settings as mosh.py; the input rate matches the 25fps default
+        # of the former PNG sequence input so frame timing is unchanged
+        return self.run_ffmpeg_pipe([
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-framerate', '25',
+            '-i', 'pipe:0',
+            '-crf', '0', '-pix_fmt', 'yuv420p', '-bf', '0', '-b:v', '10000k', '-r', '30',
+            '-f', 'avi', 'pipe:1'
+        ], raw_frames())
+
+    def build_frame_index(self, avi_data, frame_start):
+        """Index chunk markers with a single forward scan, without copying any payload
+
+        Returns the header length and an (N, 2) int64 array of (offset, length) for each
+        chunk, where a chunk runs from its marker up to the next one. This matches what
+        bytes.split(frame_start) yields, with the marker kept on every chunk.
+        """
+        offsets = []
+        position = avi_data.find(frame_start)
+        header_length = position if position >= 0 else len(avi_data)
+        while position >= 0:
+            offsets.append(position)
+            position = avi_data.find(frame_start, position + len(frame_start))
+
+        offsets = np.array(offsets, dtype=np.int64)
+        lengths = np.diff(np.append(offsets, len(avi_data)))
+        return header_length, np.stack([offsets, lengths], axis=1)
+
+    def apply_datamosh(self, avi_data, mode, start_frame, end_frame, delta_frames):
+        """Apply datamoshing effect following mosh.py logic exactly
+
+        Returns the moshed AVI as a list of memoryview slices of avi_data, so no
+        frame payload is copied; repeated frames simply reference the same slice.
+        """
         frame_start = bytes.fromhex('30306463')
-        frames = in_file_bytes.split(frame_start)
-        
-        # Open output file
-        with open(output_avi, 'wb') as out_file:
-            # Write header as mosh.py does
-            out_file.write(frames[0])
-            frames = frames[1:]  # Remove header from frames
-            
-            # Frame type markers
-            iframe = bytes.fromhex('0001B0')
-            pframe = bytes.fromhex('0001B6')
-            
-            # Count actual video frames
-            n_video_frames = len([frame for frame in frames if frame[5:8] == iframe or frame[5:8] == pframe])
-            if end_frame < 0:
-                end_frame = n_video_frames
-                
-            print(f"Total frames: {len(frames)}")
-            print(f"Video frames: {n_video_frames}")
-            
-            # Write frames based on mode
-            if mode == "iframe_removal":
-                frames_written = 0
-                for index, frame in enumerate(frames):
-                    if index < start_frame or end_frame < index or frame[5:8] != iframe:
-                        out_file.write(frame_start + frame)
-                        frames_written += 1
-                print(f"Frames written: {frames_written}")
-                
-            else:  # delta_repeat mode
-                # Check if we have enough frames
-                if delta_frames > end_frame - start_frame:
-                    print('Not enough frames to repeat')
-                    return
-
-                repeat_frames = []
-                repeat_index = 0
-                frames_written = 0
-                
-                for index, frame in enumerate(frames):
-                    # Handle non-video frames as mosh.py does
-                    if (frame[5:8] != iframe and frame[5:8] != pframe) or not start_frame <= index < end_frame:
-                        out_file.write(frame_start + frame)
-                        frames_written += 1
-                        continue
-
-                    if len(repeat_frames) < delta_frames and frame[5:8] != iframe:
-                        # Collect initial frames to repeat
-                        repeat_frames.append(frame)
-                        out_file.write(frame_start + frame)
-                        frames_written += 1
-                    elif len(repeat_frames) == delta_frames:
-                        out_file.write(frame_start + repeat_frames[repeat_index])
-                        repeat_index = (repeat_index + 1) % delta_frames
-                        frames_written += 1
-                    else:
-                        # Handle i-frames as mosh.py does
-                        out_file.write(frame_start + frame)
-                        frames_written += 1
-                        
-                print(f"Frames written: {frames_written}")
-
-    def final_conversion(self, output_avi, temp_dir):
-        """Convert moshed AVI back to frames"""
-        # First convert to MP4 using exact ffmpeg command from mosh.py
-        output_mp4 = os.path.join(temp_dir, 'output.mp4')
-        subprocess.call(
-            f'ffmpeg -loglevel error -y -i "{output_avi}" '
-            f'-crf 18 -pix_fmt yuv420p -vcodec libx264 -acodec aac -b 10000k -r 30 "{output_mp4}"',
-            shell=True
-        )
-        
-        # Extract frames
-        frames_pattern = os.path.join(temp_dir, 'moshed_%04d.png')
-        subprocess.call(
-            f'ffmpeg -y -i "{output_mp4}" "{frames_pattern}"',
-            shell=True
-        )
-        
-        # Load frames back into tensors
-        frames = []
-        frame_idx = 1  # ffmpeg starts at 1
-        while True:
-            frame_path = frames_pattern % frame_idx
-            if not os.path.exists(frame_path):
-                break
-                
-            img = Image.open(frame_path)
-            frame_np = np.array(img).astype(np.float32) / 255.0
-            frames.append(torch.from_numpy(frame_np))
-            
-            os.remove(frame_path)
-            frame_idx += 1
-            
-        return torch.stack(frames) if frames else None
+        header_length, frame_index = self.build_frame_index(avi_data, frame_start)
+        view = memoryview(avi_data)
+
+        # Each chunk slice includes its marker, as mosh.py writes frame_start + frame
+        chunks = [view[offset:offset + length] for offset, length in frame_index.tolist()]
+        # Frame type lives at frame[5:8] of the payload, i.e. after the 4-byte marker
+        frame_types = [bytes(chunk[9:12]) for chunk in chunks]
+
+        # Write header as mosh.py does
+        out_segments = [view[:header_length]]
+
+        # Frame type markers
+        iframe = bytes.fromhex('0001B0')
+        pframe = bytes.fromhex('0001B6')
+
+        # Count actual video frames
+        n_video_frames = sum(1 for frame_type in frame_types if frame_type == iframe or frame_type == pframe)
+        if end_frame < 0:
+            end_frame = n_video_frames
+
+        print(f"Total frames: {len(chunks)}")
+        print(f"Video frames: {n_video_frames}")
+
+        # Write frames based on mode
+        if mode == "iframe_removal":
+            for index, (chunk, frame_type) in enumerate(zip(chunks, frame_types)):
+                if index < start_frame or end_frame < index or frame_type != iframe:
+                    out_segments.append(chunk)
+            print(f"Frames written: {len(out_segments) - 1}")
+
+        else:  # delta_repeat mode
+            # Check if we have enough frames
+            if delta_frames > end_frame - start_frame:
+                print('Not enough frames to repeat')
+                return out_segments
+
+            repeat_frames = []
+            repeat_index = 0
+
+            for index, (chunk, frame_type) in enumerate(zip(chunks, frame_types)):
+                # Handle non-video frames as mosh.py does
+                if (frame_type != iframe and frame_type != pframe) or not start_frame <= index < end_frame:
+                    out_segments.append(chunk)
+                    continue
+
+                if len(repeat_frames) < delta_frames and frame_type != iframe:
+                    # Collect initial frames to repeat
+                    repeat_frames.append(chunk)
+                    out_segments.append(chunk)
+                elif len(repeat_frames) == delta_frames:
+                    out_segments.append(repeat_frames[repeat_index])
+                    repeat_index = (repeat_index + 1) % delta_frames
+                else:
+                    # Handle i-frames as mosh.py does
+                    out_segments.append(chunk)
+
+            print(f"Frames written: {len(out_segments) - 1}")
+
+        return out_segments
+
+    def final_conversion(self, moshed_segments, width, height):
+        """Decode moshed AVI straight back to frames"""
+        # Segments are written to ffmpeg one slice at a time, never joined into one buffer
+        raw = self.run_ffmpeg_pipe([
+            '-f', 'avi', '-i', 'pipe:0',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-r', '30', 'pipe:1'
+        ], moshed_segments)
+
+        frame_size = width * height * 3
+        n_frames = len(raw) // frame_size
+        if n_frames == 0:
+            return None
+
+        frames = np.frombuffer(raw, dtype=np.uint8, count=n_frames * frame_size)
+        frames = frames.reshape(n_frames, height, width, 3).astype(np.float32) / 255.0
+        return torch.from_numpy(frames)
 
     def datamosh(self, images, mode, start_frame, end_frame, delta_frames):
         print(f"Starting DjzDatamoshV3 in {mode} mode")
@@ -176,35 +193,32 @@ class DjzDatamoshV3:
             print("Warning: DjzDatamoshV3 requires at least 2 input images")
             return (images,)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                # Convert to initial AVI
-                input_avi = self.batch_to_initial_avi(images, temp_dir)
-                output_avi = os.path.join(temp_dir, 'output.avi')
-                
-                # Apply datamoshing
-                self.apply_datamosh(
-                    input_avi=input_avi,
-                    output_avi=output_avi,
-                    mode=mode,
-                    start_frame=start_frame,
-                    end_frame=end_frame,
-                    delta_frames=delta_frames
-                )
-                
-                # Convert back to frames
-                result = self.final_conversion(output_avi, temp_dir)
-                
-                if result is None:
-                    print("Error: Failed to process video")
-                    return (images,)
-                    
-                print(f"Processing complete. Output shape: {result.shape}")
-                return (result,)
-                
-            except Exception as e:
-                print(f"Error during processing: {str(e)}")
+        try:
+            # Convert to initial AVI
+            input_avi = self.batch_to_initial_avi(images)
+            
+            # Apply datamoshing
+            output_segments = self.apply_datamosh(
+                avi_data=input_avi,
+                mode=mode,
+                start_frame=start_frame,
+                end_frame=end_frame,
+                delta_frames=delta_frames
+            )
+            
+            # Convert back to frames
+            result = self.final_conversion(output_segments, images.shape[2], images.shape[1])
+            
+            if result is None:
+                print("Error: Failed to process video")
                 return (images,)
+                
+            print(f"Processing complete. Output shape: {result.shape}")
+            return (result,)
+            
+        except Exception as e:
+            print(f"Error during processing: {str(e)}")
+            return (images,)
 
 # Register the node with ComfyUI
 NODE_CLASS_MAPPINGS = {
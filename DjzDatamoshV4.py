@@ -4,9 +4,13 @@ import subprocess
 import os
 import tempfile
 import json
+import hashlib
 from PIL import Image
 import folder_paths
 
+# Bumped whenever the layout of cached vector files changes, so old entries are never misread
+VECTOR_CACHE_FORMAT = 2
+
 class DjzDatamoshV4:
     def __init__(self):
         self.type = "DjzDatamoshV4"
@@ -57,6 +61,75 @@ class DjzDatamoshV4:
         for i in range(len(images)):
             os.remove(frame_pattern % i)
 
+    def get_cache_key(self, images, gop_period):
+        """Content hash of the source frames plus the encoding settings"""
+        hasher = hashlib.sha256()
+        hasher.update(f"{tuple(images.shape)}|gop={gop_period}|format={VECTOR_CACHE_FORMAT}".encode())
+        # Hash the 8-bit frames that are actually encoded, one frame at a time
+        for i in range(len(images)):
+            hasher.update((images[i].cpu().numpy() * 255).astype(np.uint8).tobytes())
+        return hasher.hexdigest()
+
+    def load_cached_vectors(self, cache_dir, cache_key):
+        """Load vectors from the motion-vector cache, or None on a miss"""
+        cache_path = os.path.join(cache_dir, f"{cache_key}.npz")
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with np.load(cache_path) as data:
+                missing = set(data["missing_frames"].tolist())
+                vectors = []
+                for i in range(int(data["n_frames"])):
+                    if i in missing:
+                        vectors.append(None)
+                        continue
+                    filled = data[f"frame_{i}"].tolist()
+                    valid = data[f"valid_{i}"].tolist()
+                    # Blocks without a vector (intra-coded macroblocks) come back as null
+                    vectors.append([[mv if ok else None for mv, ok in zip(row, valid_row)]
+                                    for row, valid_row in zip(filled, valid)])
+                return vectors
+        except Exception as e:
+            print(f"Error reading vector cache {cache_path}: {e}")
+            return None
+
+    def save_cached_vectors(self, cache_dir, cache_key, vectors):
+        """Store vectors as compact int arrays plus a validity mask per frame
+
+        ffedit reports null for blocks without a forward vector (intra-coded
+        macroblocks in P-frames) and for frames without any; those are kept
+        as masked-out entries and a list of missing frames.
+        """
+        arrays = {}
+        missing_frames = []
+        try:
+            for i, frame in enumerate(vectors):
+                if frame is None:
+                    missing_frames.append(i)
+                    continue
+                arrays[f"valid_{i}"] = np.array([[mv is not None for mv in row] for row in frame], dtype=bool)
+                arrays[f"frame_{i}"] = np.array([[(0, 0) if mv is None else mv for mv in row] for row in frame],
+                                                dtype=np.int32)
+        except (TypeError, ValueError):
+            print("Motion vectors are not rectangular integer arrays, skipping cache")
+            return
+
+        cache_path = os.path.join(cache_dir, f"{cache_key}.npz")
+        partial_path = cache_path + ".partial.npz"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez_compressed(partial_path, n_frames=len(vectors),
+                                missing_frames=np.array(missing_frames, dtype=np.int64), **arrays)
+            # Rename into place so concurrent runs never see a half-written entry
+            os.replace(partial_path, cache_path)
+        except OSError as e:
+            print(f"Error writing vector cache {cache_path}: {e}")
+            if os.path.exists(partial_path):
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+
     def get_vectors(self, input_video, temp_dir):
         """Extract motion vectors using ffgac and ffedit"""
         try:
@@ -195,6 +268,7 @@ class DjzDatamoshV4:
         temp_dir = folder_paths.get_temp_directory()
         output_dir = os.path.join(folder_paths.base_path, "custom_nodes", "motion_vectors")
         os.makedirs(output_dir, exist_ok=True)
+        cache_dir = os.path.join(output_dir, "cache")
         
         source_mpg = None
         target_mpg = None
@@ -203,14 +277,24 @@ class DjzDatamoshV4:
         
         try:
             if mode in ["extract_only", "extract_and_transfer"]:
-                # Convert source images to MPG
-                source_mpg = os.path.join(temp_dir, 'source.mpg')
-                self.batch_to_mpg(source_images, source_mpg, temp_dir)
-                print("Converted source images to MPG")
+                # Reuse vectors previously extracted from identical source frames
+                cache_key = self.get_cache_key(source_images, gop_period)
+                vectors = self.load_cached_vectors(cache_dir, cache_key)
+                
+                if vectors is not None:
+                    print(f"Loaded motion vectors from cache ({cache_key[:12]})")
+                else:
+                    # Convert source images to MPG
+                    source_mpg = os.path.join(temp_dir, 'source.mpg')
+                    self.batch_to_mpg(source_images, source_mpg, temp_dir)
+                    print("Converted source images to MPG")
+                    
+                    # Extract vectors
+                    print("Extracting motion vectors...")
+                    vectors = self.get_vectors(source_mpg, temp_dir)
+                    if vectors:
+                        self.save_cached_vectors(cache_dir, cache_key, vectors)
                 
-                # Extract vectors
-                print("Extracting motion vectors...")
-                vectors = self.get_vectors(source_mpg, temp_dir)
                 if vectors:
                     print(f"Extracted motion vectors from {len(vectors)} frames")
                     vector_file_path = os.path.join(output_dir, vector_file)
@@ -1,9 +1,9 @@
 import torch
 import numpy as np
-import os
-import tempfile
+import io
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
-import subprocess
 
 class DjzDatamoshV5:
     def __init__(self):
@@ -31,6 +31,11 @@ class DjzDatamoshV5:
                     "max": 999,
                     "step": 1
                 })
+            },
+            "optional": {
+                "size_estimate": (["png", "deflate_fast"], {
+                    "default": "png"
+                })
             }
         }
     
@@ -38,92 +43,49 @@ class DjzDatamoshV5:
     FUNCTION = "datamosh"
     CATEGORY = "image/effects"
 
-    def extract_frame_sizes(self, images, temp_dir):
-        """Save frames and get their sizes"""
-        frame_sizes = []
-        frame_paths = []
-        
-        for i in range(len(images)):
-            frame_path = os.path.join(temp_dir, f'frame_{i:04d}.png')
-            img_np = (images[i].cpu().numpy() * 255).astype(np.uint8)
-            Image.fromarray(img_np).save(frame_path)
-            
-            # Get file size
-            frame_sizes.append((os.path.getsize(frame_path), i))
-            frame_paths.append(frame_path)
-            
-        return frame_sizes, frame_paths
+    def png_size(self, frame):
+        """Size in bytes of the frame encoded as PNG, computed in memory"""
+        buffer = io.BytesIO()
+        Image.fromarray(frame).save(buffer, format='PNG')
+        return buffer.tell()
 
-    def create_sorted_video(self, frame_sizes, frame_paths, temp_dir, reverse_sort, start_frame, end_frame):
-        """Create video with frames sorted by size"""
-        try:
-            if end_frame < 0:
-                end_frame = len(frame_sizes)
-            
-            # Split frames into sections
-            pre_frames = list(range(start_frame))
-            sort_frames = list(range(start_frame, min(end_frame, len(frame_sizes))))
-            post_frames = list(range(end_frame, len(frame_sizes)))
-            
-            # Sort middle section by frame size
-            sorted_section = sorted(
-                [(size, idx) for size, idx in frame_sizes if idx in sort_frames],
-                reverse=reverse_sort
-            )
-            sorted_indices = [idx for _, idx in sorted_section]
-            
-            # Combine all sections
-            final_order = pre_frames + sorted_indices + post_frames
-            
-            # Create new frame sequence
-            sorted_frames_dir = os.path.join(temp_dir, 'sorted_frames')
-            os.makedirs(sorted_frames_dir, exist_ok=True)
-            
-            for new_idx, old_idx in enumerate(final_order):
-                src_path = frame_paths[old_idx]
-                dst_path = os.path.join(sorted_frames_dir, f'frame_{new_idx:04d}.png')
-                os.link(src_path, dst_path)  # Hard link to avoid copying
-            
-            # Convert to video
-            output_path = os.path.join(temp_dir, 'output.mp4')
-            frames_pattern = os.path.join(sorted_frames_dir, 'frame_%04d.png')
-            subprocess.call(
-                f'ffmpeg -loglevel error -y -i "{frames_pattern}" '
-                f'-crf 18 -pix_fmt yuv420p -vcodec libx264 -acodec aac -b 10000k -r 30 "{output_path}"',
-                shell=True
-            )
-            
-            return output_path
-            
-        except Exception as e:
-            print(f"Error in frame sorting: {str(e)}")
-            return None
+    def deflate_size(self, frame):
+        """Fast size approximation: raw pixels compressed with deflate level 1"""
+        return len(zlib.compress(frame.tobytes(), 1))
+
+    def extract_frame_sizes(self, images, size_estimate="png"):
+        """Get the compressed size of every frame without touching disk"""
+        frames = (images.cpu().numpy() * 255).astype(np.uint8)
+        size_fn = self.deflate_size if size_estimate == "deflate_fast" else self.png_size
 
-    def load_sorted_frames(self, video_path, temp_dir):
-        """Load sorted frames back into tensors"""
-        frames_pattern = os.path.join(temp_dir, 'final_%04d.png')
-        subprocess.call(
-            f'ffmpeg -y -i "{video_path}" "{frames_pattern}"',
-            shell=True
+        # zlib releases the GIL while compressing, so threads encode frames in parallel
+        with ThreadPoolExecutor() as executor:
+            sizes = list(executor.map(size_fn, frames))
+
+        return [(size, i) for i, size in enumerate(sizes)]
+
+    def get_sorted_order(self, frame_sizes, reverse_sort, start_frame, end_frame):
+        """Frame order with the selected range sorted by frame size"""
+        if end_frame < 0:
+            end_frame = len(frame_sizes)
+        start_frame = min(start_frame, len(frame_sizes))
+        
+        # Split frames into sections
+        pre_frames = list(range(start_frame))
+        sort_frames = range(start_frame, min(end_frame, len(frame_sizes)))
+        post_frames = list(range(end_frame, len(frame_sizes)))
+        
+        # Sort middle section by frame size
+        sorted_section = sorted(
+            [(size, idx) for size, idx in frame_sizes if idx in sort_frames],
+            reverse=reverse_sort
         )
+        sorted_indices = [idx for _, idx in sorted_section]
         
-        frames = []
-        frame_idx = 1  # ffmpeg starts at 1
-        while True:
-            frame_path = frames_pattern % frame_idx
-            if not os.path.exists(frame_path):
-                break
-                
-            img = Image.open(frame_path)
-            frame_np = np.array(img).astype(np.float32) / 255.0
-            frames.append(torch.from_numpy(frame_np))
-            
-            os.remove(frame_path)
-            frame_idx += 1
-            
-        return torch.stack(frames) if frames else None
+        # Combine all sections
+        return pre_frames + sorted_indices + post_frames
 
-    def datamosh(self, images, reverse_sort, start_frame, end_frame):
+    def datamosh(self, images, reverse_sort, start_frame, end_frame, size_estimate="png"):
         print(f"Starting DjzDatamoshV5 with reverse_sort={reverse_sort}")
         print(f"Input batch shape: {images.shape}")
         
@@ -131,38 +93,25 @@ class DjzDatamoshV5:
             print("Warning: DjzDatamoshV5 requires at least 2 input images")
             return (images,)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                # Extract frame sizes and save frames
-                frame_sizes, frame_paths = self.extract_frame_sizes(images, temp_dir)
-                
-                # Create sorted video
-                output_path = self.create_sorted_video(
-                    frame_sizes=frame_sizes,
-                    frame_paths=frame_paths,
-                    temp_dir=temp_dir,
-                    reverse_sort=reverse_sort,
-                    start_frame=start_frame,
-                    end_frame=end_frame
-                )
-                
-                if output_path is None:
-                    print("Error: Failed to create sorted video")
-                    return (images,)
-                
-                # Load sorted frames
-                result = self.load_sorted_frames(output_path, temp_dir)
-                
-                if result is None:
-                    print("Error: Failed to load sorted frames")
-                    return (images,)
-                    
-                print(f"Processing complete. Output shape: {result.shape}")
-                return (result,)
+        try:
+            # Measure compressed frame sizes in memory
+            frame_sizes = self.extract_frame_sizes(images, size_estimate)
+            
+            # Reorder the batch directly
+            final_order = self.get_sorted_order(
+                frame_sizes=frame_sizes,
+                reverse_sort=reverse_sort,
+                start_frame=start_frame,
+                end_frame=end_frame
+            )
+            result = images[torch.tensor(final_order, dtype=torch.long, device=images.device)]
                 
-            except Exception as e:
-                print(f"Error during processing: {str(e)}")
-                return (images,)
+            print(f"Processing complete. Output shape: {result.shape}")
+            return (result,)
+            
+        except Exception as e:
+            print(f"Error during processing: {str(e)}")
+            return (images,)
 
 # Register the node with ComfyUI
 NODE_CLASS_MAPPINGS = {
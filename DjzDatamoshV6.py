@@ -58,50 +58,47 @@ class DjzDatamoshV6:
         return magnitude > threshold
 
     def get_segments(self, sobel_coordinates):
-        """Get segments for sorting based on Sobel edges"""
+        """Run-length encode the Sobel edge mask row by row
+
+        Returns an (N, 3) int32 array of (row, start, end) runs, where each run
+        is a maximal span of equal edge values within a row ([start, end)).
+        """
         height, width = sobel_coordinates.shape
-        segments = []
-        
-        for i in range(height):
-            current_segment = []
-            for j in range(width):
-                if not current_segment:
-                    current_segment.append((i, j))
-                    continue
-                    
-                # If we hit an edge or column changes, start new segment
-                if (sobel_coordinates[i, j] != sobel_coordinates[current_segment[0][0], current_segment[0][1]]):
-                    segments.append(current_segment)
-                    current_segment = []
-                
-                current_segment.append((i, j))
-                
-            if current_segment:
-                segments.append(current_segment)
-                
-        return segments
+
+        # A run starts at column 0 and wherever the edge value changes
+        run_starts = np.ones((height, width), dtype=bool)
+        run_starts[:, 1:] = sobel_coordinates[:, 1:] != sobel_coordinates[:, :-1]
+        rows, starts = np.nonzero(run_starts)
+
+        # A run ends where the next one starts, or at the end of its row
+        continues_row = np.zeros(len(rows), dtype=bool)
+        continues_row[:-1] = rows[1:] == rows[:-1]
+        ends = np.full(len(rows), width, dtype=np.int64)
+        ends[:-1][continues_row[:-1]] = starts[1:][continues_row[:-1]]
+
+        return np.stack([rows, starts, ends], axis=1).astype(np.int32)
 
     def sort_segments(self, image_data, luma, segments):
         """Sort image segments based on luma values"""
         sorted_data = image_data.copy()
-        
-        for segment in segments:
-            if not segment:
-                continue
-                
-            # Get coordinates for current segment
-            i_coords, j_coords = zip(*segment)
-            
-            # Get luma values for segment
-            segment_luma = luma[i_coords[0], j_coords]
-            
-            # Sort segment based on luma values
-            sorted_indices = np.argsort(segment_luma)
-            
-            # Apply sorting to all channels
-            for idx, sort_idx in enumerate(sorted_indices):
-                sorted_data[i_coords[0], j_coords[idx]] = image_data[i_coords[0], j_coords[sort_idx]]
-        
+        if len(segments) == 0:
+            return sorted_data
+
+        height, width, channels = image_data.shape
+        rows, starts, ends = (segments[:, k].astype(np.int64) for k in range(3))
+        lengths = ends - starts
+
+        # Flat pixel index of every pixel covered by a segment, plus its segment id
+        segment_ids = np.repeat(np.arange(len(segments)), lengths)
+        run_offsets = np.cumsum(lengths) - lengths
+        pixel_indices = np.repeat(rows * width + starts - run_offsets, lengths) + np.arange(lengths.sum())
+
+        # One stable sort by (segment, luma) orders every segment at once
+        order = np.lexsort((luma.reshape(-1)[pixel_indices], segment_ids))
+
+        # Apply sorting to all channels
+        flat_source = image_data.reshape(-1, channels)
+        sorted_data.reshape(-1, channels)[pixel_indices] = flat_source[pixel_indices[order]]
         return sorted_data
 
     def pixel_sort(self, images, threshold):
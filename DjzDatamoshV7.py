@@ -4,6 +4,8 @@ from PIL import Image
 from scipy.signal import convolve2d
 from typing import Callable
 
+from .utils.pixel_sort import sort_row_segments
+
 class DjzDatamoshV7:
     def __init__(self):
         self.type = "DjzDatamoshV7"
@@ -96,41 +98,6 @@ class DjzDatamoshV7:
         coefficients = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
         return np.dot(pixels[..., :3], coefficients)
 
-    def sort_interval(self, interval, interval_indices):
-        """Sort pixels within an interval"""
-        # Ensure stable sorting
-        return np.argsort(interval, kind='stable') + interval_indices
-
-    def process_row(self, row, row_values, edges, pixels):
-        """Process a single row of pixels"""
-        # Find indices where edges occur
-        interval_indices = np.flatnonzero(edges[row])
-        
-        # Handle empty intervals case
-        if len(interval_indices) == 0:
-            return pixels
-            
-        # Split row values at edge points
-        split_values = np.split(row_values, interval_indices)
-        
-        # Process intervals
-        for index, interval in enumerate(split_values[1:]):
-            if len(interval) > 0:  # Only process non-empty intervals
-                split_values[index + 1] = self.sort_interval(interval, interval_indices[index])
-        
-        # Handle first interval
-        if len(split_values[0]) > 0:
-            split_values[0] = np.arange(split_values[0].size, dtype=np.int32)
-            
-        # Merge sorted intervals
-        merged_order = np.concatenate(split_values)
-        
-        # Apply sorting to each channel
-        for channel in range(pixels.shape[-1]):
-            pixels[row, :, channel] = pixels[row, merged_order.astype(np.int32), channel]
-            
-        return pixels
-
     def apply_pixel_sorting(self, image, calculate_value_fn, threshold, rotation):
         """Apply pixel sorting effect to an image"""
         # Convert image to numpy array if it's a tensor
@@ -162,9 +129,8 @@ class DjzDatamoshV7:
         edges = np.zeros_like(mask)
         edges[:, 1:] = mask[:, 1:] != mask[:, :-1]  # Detect changes in mask
         
-        # Process each row
-        for row in range(rotated.shape[0]):
-            rotated = self.process_row(row, values[row], edges, rotated)
+        # Sort every segment of every row in a single pass
+        rotated = sort_row_segments(rotated, values, edges)
         
         # Rotate back
         result = np.rot90(rotated, -k_rotations)
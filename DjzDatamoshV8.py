@@ -1,9 +1,44 @@
 import torch
 import numpy as np
+from multiprocessing import shared_memory
 from PIL import Image
 from scipy.signal import convolve2d
 from typing import Callable
 
+from .utils.pixel_sort import sort_row_segments
+from .utils.process_pool import pool_map
+
+MULTI_PASS_MODES = ["luminance", "hue", "saturation", "laplacian"]
+
+
+def _sort_frame_worker(task):
+    """Process pool entry point: sort one frame of the shared batch into the shared output"""
+    input_name, output_name, mask_name, shape, mask_shape, idx, mode_names, threshold, rotation, seed = task
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    mask_shm = shared_memory.SharedMemory(name=mask_name) if mask_name else None
+    try:
+        images = np.ndarray(shape, dtype=np.float32, buffer=input_shm.buf)
+        output = np.ndarray(shape, dtype=np.float32, buffer=output_shm.buf)
+        masks = np.ndarray(mask_shape, dtype=np.float32, buffer=mask_shm.buf) if mask_shm else None
+
+        output[idx] = DjzDatamoshV8().sort_frame(
+            images[idx],
+            masks[idx] if masks is not None else None,
+            mode_names,
+            threshold,
+            rotation,
+            seed
+        )
+        # Views must be released before the shared blocks can be closed
+        del images, output, masks
+    finally:
+        input_shm.close()
+        output_shm.close()
+        if mask_shm is not None:
+            mask_shm.close()
+    return idx
+
 class DjzDatamoshV8:
     def __init__(self):
         self.type = "DjzDatamoshV8"
@@ -35,6 +70,14 @@ class DjzDatamoshV8:
                     "max": 0xFFFFFFFF,
                     "step": 1
                 }),
+            },
+            "optional": {
+                "workers": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 64,
+                    "step": 1
+                }),
             }
         }
     
@@ -97,46 +140,6 @@ class DjzDatamoshV8:
         coefficients = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
         return np.dot(pixels[..., :3], coefficients)
 
-    def sort_interval(self, interval, interval_indices):
-        """Sort pixels within an interval"""
-        # Ensure stable sorting
-        return np.argsort(interval, kind='stable') + interval_indices
-
-    def process_row(self, row, row_values, edges, pixels, row_mask=None):
-        """Process a single row of pixels with optional mask"""
-        # Find indices where edges occur
-        interval_indices = np.flatnonzero(edges[row])
-        
-        # Handle empty intervals case
-        if len(interval_indices) == 0:
-            return pixels
-            
-        # Split row values at edge points
-        split_values = np.split(row_values, interval_indices)
-        
-        # Process intervals
-        for index, interval in enumerate(split_values[1:]):
-            if len(interval) > 0:  # Only process non-empty intervals
-                # Apply mask if provided
-                if row_mask is not None:
-                    mask_interval = row_mask[interval_indices[index]:interval_indices[index] + len(interval)]
-                    if not np.any(mask_interval):  # Skip if entire interval is masked out
-                        continue
-                split_values[index + 1] = self.sort_interval(interval, interval_indices[index])
-        
-        # Handle first interval
-        if len(split_values[0]) > 0:
-            split_values[0] = np.arange(split_values[0].size, dtype=np.int32)
-            
-        # Merge sorted intervals
-        merged_order = np.concatenate(split_values)
-        
-        # Apply sorting to each channel
-        for channel in range(pixels.shape[-1]):
-            pixels[row, :, channel] = pixels[row, merged_order.astype(np.int32), channel]
-            
-        return pixels
-
     def apply_pixel_sorting(self, image, mask, calculate_value_fn, threshold, rotation):
         """Apply pixel sorting effect to an image with mask"""
         # Convert image and mask to numpy array if they're tensors
@@ -176,16 +179,77 @@ class DjzDatamoshV8:
         edges = np.zeros_like(threshold_mask)
         edges[:, 1:] = threshold_mask[:, 1:] != threshold_mask[:, :-1]  # Detect changes in mask
         
-        # Process each row
-        for row in range(rotated.shape[0]):
-            row_mask = rotated_mask[row] if rotated_mask is not None else None
-            rotated = self.process_row(row, values[row], edges, rotated, row_mask)
+        # Sort every segment of every row in a single pass, skipping fully masked segments
+        rotated = sort_row_segments(rotated, values, edges, rotated_mask)
         
         # Rotate back
         result = np.rot90(rotated, -k_rotations)
         return result
 
-    def pixel_sort(self, images, mask, sort_mode, threshold, rotation, multi_pass, seed):
+    def get_mode_functions(self):
+        """Returns the value calculation function for each sort mode"""
+        return {
+            "luminance": self.calculate_luminance,
+            "hue": self.calculate_hue,
+            "saturation": self.calculate_saturation,
+            "laplacian": self.calculate_laplacian
+        }
+
+    def sort_frame(self, image, mask, mode_names, threshold, rotation, seed):
+        """Apply one or more sorting passes to a single frame"""
+        # Seed per frame so results do not depend on which worker handles the frame
+        np.random.seed(seed % 0x100000000)
+
+        mode_functions = self.get_mode_functions()
+        for mode_name in mode_names:
+            image = self.apply_pixel_sorting(
+                image,
+                mask,
+                mode_functions[mode_name],
+                threshold,
+                rotation
+            )
+        return image
+
+    def sort_batch_parallel(self, image_batch, mask_batch, mode_names, threshold, rotation, seed, workers):
+        """Sort frames on a process pool, sharing input and output through shared memory"""
+        input_shm = shared_memory.SharedMemory(create=True, size=image_batch.nbytes)
+        output_shm = shared_memory.SharedMemory(create=True, size=image_batch.nbytes)
+        mask_shm = shared_memory.SharedMemory(create=True, size=mask_batch.nbytes) if mask_batch is not None else None
+        try:
+            np.ndarray(image_batch.shape, dtype=np.float32, buffer=input_shm.buf)[:] = image_batch
+            if mask_shm is not None:
+                np.ndarray(mask_batch.shape, dtype=np.float32, buffer=mask_shm.buf)[:] = mask_batch
+
+            tasks = [
+                (
+                    input_shm.name,
+                    output_shm.name,
+                    mask_shm.name if mask_shm is not None else None,
+                    image_batch.shape,
+                    mask_batch.shape if mask_batch is not None else None,
+                    idx,
+                    mode_names,
+                    threshold,
+                    rotation,
+                    seed + idx
+                )
+                for idx in range(len(image_batch))
+            ]
+
+            # Falls back to sorting here if worker processes cannot load this module (spawn-only hosts)
+            for _ in pool_map(_sort_frame_worker, tasks, workers):
+                pass
+
+            # Frames were written at their own index, so the batch is already in order
+            return np.ndarray(image_batch.shape, dtype=np.float32, buffer=output_shm.buf).copy()
+        finally:
+            for shm in (input_shm, output_shm, mask_shm):
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+    def pixel_sort(self, images, mask, sort_mode, threshold, rotation, multi_pass, seed, workers=1):
         """Main pixel sorting function with mask support
         
         Arguments:
@@ -195,59 +259,45 @@ class DjzDatamoshV8:
             threshold: Value between 0-1 controlling segment creation
             rotation: Angle to rotate sorting direction
             multi_pass: Whether to apply all sorting modes sequentially
+            seed: Base random seed, frame i uses seed + i
+            workers: Number of processes to sort frames in parallel (1 = in-process)
         """
         print(f"Starting DjzDatamoshV8 pixel sorting with mode: {sort_mode}")
         print(f"Input batch shape: {images.shape}")
         print(f"Using random seed: {seed}")
         
-        # Set random seed for reproducibility
-        np.random.seed(seed)
-        
         if len(images.shape) != 4:
             print("Warning: DjzDatamoshV8 requires batch of images in BHWC format")
             return (images,)
             
         try:
-            # Select value calculation function based on mode
-            mode_functions = {
-                "luminance": self.calculate_luminance,
-                "hue": self.calculate_hue,
-                "saturation": self.calculate_saturation,
-                "laplacian": self.calculate_laplacian
-            }
-            
-            calculate_value_fn = mode_functions[sort_mode]
-            
-            # Process each image in batch
-            batch_sorted = []
-            for idx in range(len(images)):
-                current_image = images[idx].cpu().numpy()
-                current_mask = mask[idx].cpu().numpy() if mask is not None else None
-                
-                if multi_pass:
-                    # Apply multiple sorting passes with different modes in fixed order
-                    for mode_name in ["luminance", "hue", "saturation", "laplacian"]:
-                        current_image = self.apply_pixel_sorting(
-                            current_image, 
-                            current_mask,
-                            mode_functions[mode_name],
-                            threshold,
-                            rotation
-                        )
-                else:
-                    # Single pass with selected mode
-                    current_image = self.apply_pixel_sorting(
-                        current_image,
-                        current_mask,
-                        calculate_value_fn,
+            # Apply multiple sorting passes with different modes in fixed order, or a single pass
+            mode_names = MULTI_PASS_MODES if multi_pass else [sort_mode]
+
+            image_batch = np.ascontiguousarray(images.cpu().numpy(), dtype=np.float32)
+            mask_batch = np.ascontiguousarray(mask.cpu().numpy(), dtype=np.float32) if mask is not None else None
+
+            workers = max(1, min(workers, len(image_batch)))
+            if workers > 1:
+                print(f"Sorting {len(image_batch)} frames on {workers} worker processes")
+                result = self.sort_batch_parallel(
+                    image_batch, mask_batch, mode_names, threshold, rotation, seed, workers
+                )
+            else:
+                result = np.stack([
+                    self.sort_frame(
+                        image_batch[idx],
+                        mask_batch[idx] if mask_batch is not None else None,
+                        mode_names,
                         threshold,
-                        rotation
+                        rotation,
+                        seed + idx
                     )
-                
-                batch_sorted.append(current_image)
+                    for idx in range(len(image_batch))
+                ])
             
             # Convert back to torch tensor
-            result = torch.from_numpy(np.stack(batch_sorted))
+            result = torch.from_numpy(result)
             
             print(f"Processing complete. Output shape: {result.shape}")
             return (result,)
@@ -7,6 +7,9 @@ import numpy as np
 from PIL import Image
 import torch
 
+from .utils.fractal_coloring import apply_color_lut
+from .utils.fractal_animation import EASING_MODES, iterate_with_interior_hint, render_zoom_animation
+
 class FractalGenerator:
     """A ComfyUI node that generates fractal art"""
     
@@ -23,6 +26,12 @@ class FractalGenerator:
             "optional": {
                 "x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001}),
                 "y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "animation_frames": ("INT", {"default": 1, "min": 1, "max": 1000}),
+                "end_x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "end_y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "end_zoom_level": ("FLOAT", {"default": 10.0, "min": 0.1, "max": 100.0, "step": 0.1}),
+                "easing": (EASING_MODES, {"default": "linear"}),
+                "adaptive_iterations": ("BOOLEAN", {"default": True}),
             }
         }
     
@@ -45,9 +54,11 @@ class FractalGenerator:
             return x, y, actual_zoom
         return None
 
-    def compute_fractal(self, width, height, x_min, x_max, y_min, y_max, max_iter, preset):
-        x = np.linspace(x_min, x_max, num=width).reshape((1, width))
-        y = np.linspace(y_min, y_max, num=height).reshape((height, 1))
+    def compute_fractal(self, width, height, x_min, x_max, y_min, y_max, max_iter, preset, interior_hint=None, axes=None):
+        if axes is None:
+            axes = (np.linspace(x_min, x_max, num=width), np.linspace(y_min, y_max, num=height))
+        x = axes[0].reshape((1, width))
+        y = axes[1].reshape((height, 1))
         C = np.tile(x, (height, 1)) + 1j * np.tile(y, (1, width))
         
         # Set initial conditions and parameters based on fractal type
@@ -88,46 +99,61 @@ class FractalGenerator:
                     converged_to_root = (np.abs(Z - root) < tolerance) & (M == max_iter)
                     M[converged_to_root] = i + j/len(roots)
         else:
-            # Standard escape-time fractals
-            for i in range(max_iter):
-                mask = np.abs(Z) <= escape_radius
-                
+            if interior_hint is not None:
+                # Animation frames: compacted loop that settles hinted interior points by periodicity
                 if preset == "Burning Ship":
-                    Z[mask] = (abs(Z[mask].real) + 1j * abs(Z[mask].imag)) ** power + C[mask]
+                    step = lambda z, c: (abs(z.real) + 1j * abs(z.imag)) ** power + c
                 elif preset == "Tricorn":
-                    Z[mask] = np.conj(Z[mask]) ** power + C[mask]
+                    step = lambda z, c: np.conj(z) ** power + c
                 else:  # Mandelbrot and Julia
-                    Z[mask] = Z[mask] ** power + C[mask]
-                
-                M[mask & (np.abs(Z) > escape_radius)] = i
+                    step = lambda z, c: z ** power + c
+                iterate_with_interior_hint(Z, C, M, max_iter, escape_radius, step, interior_hint)
+            else:
+                # Standard escape-time fractals
+                for i in range(max_iter):
+                    mask = np.abs(Z) <= escape_radius
+                    
+                    if preset == "Burning Ship":
+                        Z[mask] = (abs(Z[mask].real) + 1j * abs(Z[mask].imag)) ** power + C[mask]
+                    elif preset == "Tricorn":
+                        Z[mask] = np.conj(Z[mask]) ** power + C[mask]
+                    else:  # Mandelbrot and Julia
+                        Z[mask] = Z[mask] ** power + C[mask]
+                    
+                    M[mask & (np.abs(Z) > escape_radius)] = i
         
         return M / max_iter
 
     def apply_gradient(self, fractal, width, height):
-        image = Image.new("RGB", (width, height))
-        pixels = image.load()
+        # White-to-black gradient by iteration count, black inside the set, as one LUT lookup
+        rgb = apply_color_lut(fractal, "Classic White-Grey")
+        return Image.fromarray(rgb, "RGB")
 
-        color_inside = (0, 0, 0)  # Black for points inside the set
-        color_outside = (255, 255, 255)  # White for points outside
-
-        for y in range(height):
-            for x in range(width):
-                value = fractal[y, x]
-                if value == 1.0:  # Inside the set
-                    pixels[x, y] = color_inside
-                else:
-                    # Create a gradient based on iteration count
-                    intensity = int(255 * (1 - value))
-                    pixels[x, y] = (intensity, intensity, intensity)
-        return image
-
-    def generate_fractal(self, width, height, max_iterations, preset, zoom_level=1.0, x_center=None, y_center=None):
+    def generate_fractal(self, width, height, max_iterations, preset, zoom_level=1.0, x_center=None, y_center=None,
+                        animation_frames=1, end_x_center=None, end_y_center=None, end_zoom_level=10.0,
+                        easing="linear", adaptive_iterations=True):
+        start_zoom_level = zoom_level
         # Calculate viewing window
         if preset != "Custom" and x_center is None:
             x_center, y_center, zoom_level = self.get_preset_coordinates(preset, zoom_level)
         elif x_center is None:
             x_center, y_center = -0.75, 0.0
 
+        if animation_frames > 1:
+            # Presets scale the end zoom the same way as the start zoom
+            end_zoom = end_zoom_level * zoom_level / start_zoom_level
+            images = render_zoom_animation(
+                lambda view, window, axes, frame_iter, hint: self.compute_fractal(width, height, *window, frame_iter, preset,
+                                                                                  hint, axes),
+                "Classic White-Grey", width, height, animation_frames,
+                (x_center, y_center, zoom_level),
+                (x_center if end_x_center is None else end_x_center,
+                 y_center if end_y_center is None else end_y_center,
+                 end_zoom),
+                3.0, max_iterations, easing, adaptive_iterations
+            )
+            return (images,)
+
         window_size = 3.0 / zoom_level  # Reduced from 4.0 to 3.0 for better default zoom
         x_min = x_center - window_size/2
         x_max = x_center + window_size/2
@@ -3,11 +3,24 @@
 Fractal Generator V2 - An enhanced node that generates fractal art using various fractal types with advanced controls
 """
 
+import decimal
+import math
+
 import numpy as np
 from PIL import Image
 import torch
-import colorsys
-import math
+
+from .utils.fractal_coloring import get_color_function, apply_color_lut
+from .utils.fractal_animation import EASING_MODES, iterate_with_interior_hint, render_zoom_animation, scale_iterations
+from .utils.process_pool import pool_map
+
+# Pixel spacing, in float64 steps of the view coordinates, below which the standard renderer turns blocky
+FLOAT64_MIN_PIXEL_STEPS = 16
+
+def _render_tile_worker(task):
+    """Process pool entry point: render one band of rows with the named tile method"""
+    method_name, row_start, row_end, args = task
+    return row_start, getattr(FractalGeneratorV2(), method_name)(row_start, row_end, *args)
 
 class FractalGeneratorV2:
     """A ComfyUI node that generates fractal art with advanced controls"""
@@ -20,7 +33,7 @@ class FractalGeneratorV2:
                 "height": ("INT", {"default": 1024, "min": 64, "max": 4096}),
                 "max_iterations": ("INT", {"default": 500, "min": 50, "max": 2000}),
                 "preset": (["Custom", "Classic Mandelbrot", "Julia Set", "Burning Ship", "Tricorn", "Newton"], {"default": "Classic Mandelbrot"}),
-                "zoom_level": ("FLOAT", {"default": 1.0, "min": 0.1, "max": 100.0, "step": 0.1}),
+                "zoom_level": ("FLOAT", {"default": 1.0, "min": 0.1, "max": 1e12, "step": 0.1}),
                 "color_preset": ([
                     "Classic White-Grey", 
                     "Electric Blue", 
@@ -37,8 +50,17 @@ class FractalGeneratorV2:
                 "smooth_coloring": ("BOOLEAN", {"default": True}),
             },
             "optional": {
-                "x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001}),
-                "y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001, "round": False}),
+                "y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001, "round": False}),
+                "deep_zoom": ("BOOLEAN", {"default": False}),
+                "tile_size": ("INT", {"default": 256, "min": 16, "max": 4096}),
+                "workers": ("INT", {"default": 1, "min": 1, "max": 64}),
+                "animation_frames": ("INT", {"default": 1, "min": 1, "max": 1000}),
+                "end_x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001, "round": False}),
+                "end_y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001, "round": False}),
+                "end_zoom_level": ("FLOAT", {"default": 10.0, "min": 0.1, "max": 1e12, "step": 0.1}),
+                "easing": (EASING_MODES, {"default": "linear"}),
+                "adaptive_iterations": ("BOOLEAN", {"default": True}),
             }
         }
     
@@ -62,128 +84,22 @@ class FractalGeneratorV2:
         return None
 
     def get_color_function(self, preset):
-        def classic_white_grey(value):
-            grey = int(255 * (1 - value))
-            return (grey, grey, grey)
-
-        def electric_blue(value):
-            # Bright electric blue with white highlights
-            if value > 0.95:  # Bright highlights
-                return (255, 255, 255)
-            # Base color is electric blue (0, 128, 255)
-            blue = int(255 * (0.5 + 0.5 * value))  # Range from 128 to 255
-            green = int(128 * value)  # Some green for vibrancy
-            return (int(60 * value), green, blue)  # Less red for that electric feel
-
-        def fire(value):
-            # Fire gradient from deep red through orange to bright yellow
-            if value < 0.33:
-                # Deep red to red
-                return (int(255 * (0.5 + 1.5 * value)), 0, 0)
-            elif value < 0.66:
-                # Red to orange
-                v = (value - 0.33) * 3
-                return (255, int(255 * v), 0)
-            else:
-                # Orange to yellow
-                v = (value - 0.66) * 3
-                return (255, 255, int(255 * v))
-
-        def rainbow(value):
-            # Full spectrum rainbow with increased saturation and brightness
-            hue = value % 1.0
-            sat = 0.9  # High saturation
-            val = 0.9  # High brightness
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            return tuple(int(255 * x) for x in rgb)
-
-        def deep_space(value):
-            # Space theme with stars and nebula colors
-            if value > 0.95:  # Bright stars
-                return (255, 255, 255)
-            elif value > 0.90:  # Dimmer stars
-                star_bright = int(200 * (value - 0.90) * 10)
-                return (star_bright, star_bright, star_bright)
-            
-            # Nebula colors - purple to blue with some pink
-            hue = 0.75 + value * 0.15  # Range from purple to blue
-            sat = 0.8 + value * 0.2  # High saturation
-            val = 0.4 + value * 0.6  # Ensure visibility
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            r, g, b = [int(255 * x) for x in rgb]
-            # Add some pink tint to certain ranges
-            if 0.3 < value < 0.6:
-                r = min(255, r + int(100 * value))
-            return (r, g, b)
-
-        def ocean(value):
-            # Ocean colors from deep blue through turquoise to white foam
-            if value > 0.9:  # White foam/caps
-                foam = int(255 * (value - 0.9) * 10)
-                return (foam, foam, foam)
-            
-            if value < 0.5:  # Deep ocean blues
-                hue = 0.6 + value * 0.1  # Deep blue range
-                sat = 0.9 - value * 0.3
-                val = 0.3 + value * 0.7
-            else:  # Turquoise shallows
-                hue = 0.5 + value * 0.1  # Turquoise range
-                sat = 0.7
-                val = 0.6 + value * 0.4
-            
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            return tuple(int(255 * x) for x in rgb)
-
-        def forest(value):
-            # Forest colors from dark green through bright green to brown
-            if value < 0.4:  # Dark to medium green
-                hue = 0.25 + value * 0.1
-                sat = 0.9 - value * 0.2
-                val = 0.3 + value * 0.7
-            elif value < 0.7:  # Medium to bright green
-                hue = 0.28 + value * 0.05
-                sat = 0.8
-                val = 0.6 + value * 0.4
-            else:  # Brown highlights
-                hue = 0.08  # Brown
-                sat = 0.7 - (value - 0.7) * 0.5
-                val = 0.6 + (value - 0.7) * 0.4
-            
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            return tuple(int(255 * x) for x in rgb)
-
-        def psychedelic(value):
-            # Ultra-vibrant rainbow cycling with high saturation
-            hue = (value * 5) % 1.0  # Faster color cycling
-            sat = 1.0  # Maximum saturation
-            val = 0.9  # High brightness but not full to maintain some color definition
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            r, g, b = [int(255 * x) for x in rgb]
-            
-            # Add pulsing brightness
-            pulse = abs(math.sin(value * math.pi * 2))
-            r = min(255, r + int(50 * pulse))
-            g = min(255, g + int(50 * pulse))
-            b = min(255, b + int(50 * pulse))
-            return (r, g, b)
-
-        color_functions = {
-            "Classic White-Grey": classic_white_grey,
-            "Electric Blue": electric_blue,
-            "Fire": fire,
-            "Rainbow": rainbow,
-            "Deep Space": deep_space,
-            "Ocean": ocean,
-            "Forest": forest,
-            "Psychedelic": psychedelic
-        }
+        return get_color_function(preset)
 
-        return color_functions.get(preset, classic_white_grey)
+    def compute_fractal(self, width, height, x_min, x_max, y_min, y_max, max_iter, power, escape_radius, smooth, preset,
+                        tile_size=256, workers=1, interior_hint=None, axes=None):
+        args = (width, height, x_min, x_max, y_min, y_max, max_iter, power, escape_radius, smooth, preset, interior_hint,
+                axes)
+        return self.render_tiles("compute_tile", width, height, tile_size, workers, args)
 
-    def compute_fractal(self, width, height, x_min, x_max, y_min, y_max, max_iter, power, escape_radius, smooth, preset):
-        x = np.linspace(x_min, x_max, num=width).reshape((1, width))
-        y = np.linspace(y_min, y_max, num=height).reshape((height, 1))
-        C = np.tile(x, (height, 1)) + 1j * np.tile(y, (1, width))
+    def compute_tile(self, row_start, row_end, width, height, x_min, x_max, y_min, y_max, max_iter, power, escape_radius,
+                     smooth, preset, interior_hint=None, axes=None):
+        if axes is None:
+            axes = (np.linspace(x_min, x_max, num=width), np.linspace(y_min, y_max, num=height))
+        x = axes[0].reshape((1, width))
+        # Rows are sliced from the full-frame grid so tiles line up exactly
+        y = axes[1][row_start:row_end].reshape((-1, 1))
+        C = x + 1j * y
         
         if preset == "Julia Set":
             # Julia set with interesting parameter
@@ -201,6 +117,17 @@ class FractalGeneratorV2:
             Z = np.zeros(C.shape, dtype=complex)
 
         M = np.full(C.shape, max_iter)
+
+        if interior_hint is not None and preset != "Newton":
+            # Animation frames: compacted loop that settles hinted interior points by periodicity
+            if preset == "Burning Ship":
+                step = lambda z, c: (abs(z.real) + 1j * abs(z.imag)) ** power + c
+            elif preset == "Tricorn":
+                step = lambda z, c: (z.conjugate()) ** power + c
+            else:  # Mandelbrot and Julia
+                step = lambda z, c: z ** power + c
+            iterate_with_interior_hint(Z, C, M, max_iter, escape_radius, step, interior_hint[row_start:row_end])
+            return self.normalize_iterations(Z, M, max_iter, escape_radius, smooth)
         
         for i in range(max_iter):
             mask = np.abs(Z) <= escape_radius
@@ -221,7 +148,10 @@ class FractalGeneratorV2:
             if preset != "Newton":
                 M[mask & (np.abs(Z) > escape_radius)] = i
 
-        if smooth and preset != "Newton":
+        return self.normalize_iterations(Z, M, max_iter, escape_radius, smooth and preset != "Newton")
+
+    def normalize_iterations(self, Z, M, max_iter, escape_radius, smooth):
+        if smooth:
             abs_Z = np.abs(Z)
             outside_set = M < max_iter
             smooth_M = M.astype(np.float64)
@@ -241,23 +171,145 @@ class FractalGeneratorV2:
         else:
             return M / max_iter
 
-    def apply_coloring(self, fractal, width, height, color_function, color_cycles):
-        image = Image.new("RGB", (width, height))
-        pixels = image.load()
-
-        for y in range(height):
-            for x in range(width):
-                value = fractal[y, x]
-                if value == 1.0:  # Inside set
-                    pixels[x, y] = (0, 0, 0)
-                else:
-                    # Apply color cycling
-                    cycled_value = (value * color_cycles) % 1.0
-                    pixels[x, y] = color_function(cycled_value)
-        return image
+    def render_tiles(self, method_name, width, height, tile_size, workers, args):
+        """Render horizontal bands of rows with a tile method, streaming each band into one output buffer"""
+        output = np.empty((height, width), dtype=np.float64)
+        tiles = [
+            (method_name, row_start, min(row_start + tile_size, height), args)
+            for row_start in range(0, height, tile_size)
+        ]
+
+        # Bands render in this process when there is one worker, or when worker processes cannot start
+        for row_start, tile in pool_map(_render_tile_worker, tiles, workers):
+            output[row_start:row_start + len(tile)] = tile
+
+        return output
+
+    def compute_reference_orbit(self, x_center, y_center, zoom_level, max_iter, escape_radius):
+        """Iterate z^2 + c at the view centre in decimal arithmetic, returned as a complex128 orbit
+
+        The orbit runs from Z_0 = 0 until it escapes or reaches max_iter. Working
+        precision follows the zoom depth so the reference stays exact where
+        float64 pixel coordinates no longer can.
+        """
+        digits = max(30, int(math.log10(max(zoom_level, 1.0))) + 30)
+        with decimal.localcontext() as context:
+            context.prec = digits
+            c_real = decimal.Decimal(x_center)
+            c_imag = decimal.Decimal(y_center)
+            z_real = decimal.Decimal(0)
+            z_imag = decimal.Decimal(0)
+            radius_squared = decimal.Decimal(escape_radius) ** 2
+
+            orbit = [0j]
+            for _ in range(max_iter):
+                z_real, z_imag = z_real * z_real - z_imag * z_imag + c_real, 2 * z_real * z_imag + c_imag
+                orbit.append(complex(float(z_real), float(z_imag)))
+                if z_real * z_real + z_imag * z_imag > radius_squared:
+                    break
+
+        return np.array(orbit, dtype=np.complex128)
+
+    def compute_fractal_perturbation(self, width, height, x_center, y_center, zoom_level, max_iter, escape_radius, smooth,
+                                     tile_size=256, workers=1, reference=None):
+        """Deep-zoom Mandelbrot (z^2 + c) through perturbation around one reference orbit
+
+        ``reference`` is an optional ``(x, y, orbit)`` computed earlier, e.g. once
+        for a whole zoom animation; by default the orbit is taken at the view centre.
+        """
+        window_size = 4.0 / zoom_level
+        if reference is None:
+            reference = (x_center, y_center,
+                         self.compute_reference_orbit(x_center, y_center, zoom_level, max_iter, escape_radius))
+        reference_x, reference_y, reference_orbit = reference
+        # Offset of the view centre from the reference point, small near the reference
+        center_offset = complex(x_center - reference_x, y_center - reference_y)
+        args = (width, height, window_size, center_offset, reference_orbit, max_iter, escape_radius, smooth)
+        return self.render_tiles("compute_perturbation_tile", width, height, tile_size, workers, args)
+
+    def compute_perturbation_tile(self, row_start, row_end, width, height, window_size, center_offset, reference_orbit,
+                                  max_iter, escape_radius, smooth):
+        # Pixel offsets from the centre stay small, so float64 keeps full relative precision
+        dx = (np.arange(width) - (width - 1) / 2) * (window_size / (width - 1))
+        dy = (np.arange(row_start, row_end) - (height - 1) / 2) * (window_size / (height - 1))
+        delta_c = (center_offset + (dx.reshape((1, -1)) + 1j * dy.reshape((-1, 1)))).ravel()
+
+        M = np.full(delta_c.shape, max_iter)
+        Z = np.zeros(delta_c.shape, dtype=complex)
+
+        # Only still-active pixels are carried between iterations
+        active = np.arange(delta_c.size)
+        delta = np.zeros(delta_c.shape, dtype=complex)
+        reference_index = np.zeros(delta_c.shape, dtype=np.int64)
+        last_index = len(reference_orbit) - 1
+
+        for i in range(max_iter):
+            # delta_{n+1} = 2 Z_n delta_n + delta_n^2 + delta_c
+            delta = (2 * reference_orbit[reference_index] + delta) * delta + delta_c[active]
+            reference_index += 1
+            z = reference_orbit[reference_index] + delta
+            abs_z = np.abs(z)
+
+            escaped = abs_z > escape_radius
+            M[active[escaped]] = i
+            Z[active[escaped]] = z[escaped]
+
+            remaining = ~escaped
+            active = active[remaining]
+            if active.size == 0:
+                break
+            delta = delta[remaining]
+            reference_index = reference_index[remaining]
+            z = z[remaining]
+
+            # Rebase onto the start of the orbit when the pixel nears zero or the reference runs out
+            rebase = (abs_z[remaining] < np.abs(delta)) | (reference_index == last_index)
+            delta[rebase] = z[rebase]
+            reference_index[rebase] = 0
+
+        return self.normalize_iterations(Z.reshape((row_end - row_start, width)), M.reshape((row_end - row_start, width)),
+                                         max_iter, escape_radius, smooth)
+
+    def apply_coloring(self, fractal, width, height, color_preset, color_cycles):
+        # Single LUT lookup over the whole frame; inside-set points stay black
+        rgb = apply_color_lut(fractal, color_preset, color_cycles)
+        return Image.fromarray(rgb, "RGB")
+
+    def beyond_float64(self, width, height, x_center, y_center, zoom_level):
+        """Whether pixels of this view are too close together for float64 coordinates to tell apart"""
+        pixel_size = 4.0 / zoom_level / max(width, height)
+        return pixel_size < FLOAT64_MIN_PIXEL_STEPS * np.spacing(max(abs(x_center), abs(y_center), 1.0))
+
+    def generate_animation(self, width, height, max_iterations, preset, color_preset, power, escape_radius, color_cycles,
+                           smooth_coloring, deep_zoom, tile_size, workers, frames, start_view, end_view, easing,
+                           adaptive_iterations):
+        """Render a zoom from start_view to end_view as one IMAGE batch"""
+        if deep_zoom:
+            # One reference orbit at the deepest view serves every frame; it is computed with the
+            # precision and iteration budget of that frame, the largest of the animation
+            deepest_x, deepest_y, deepest_zoom = max(start_view, end_view, key=lambda view: view[2])
+            deepest_iter = max_iterations
+            if adaptive_iterations:
+                deepest_iter = scale_iterations(max_iterations, deepest_zoom, min(start_view[2], end_view[2]))
+            reference = (deepest_x, deepest_y,
+                         self.compute_reference_orbit(deepest_x, deepest_y, deepest_zoom, deepest_iter, escape_radius))
+
+            def render_frame(view, window, axes, frame_iter, hint):
+                return self.compute_fractal_perturbation(width, height, *view, frame_iter, escape_radius,
+                                                         smooth_coloring, tile_size, workers, reference)
+        else:
+            def render_frame(view, window, axes, frame_iter, hint):
+                return self.compute_fractal(width, height, *window, frame_iter, power, escape_radius,
+                                            smooth_coloring, preset, tile_size, workers, hint, axes)
+
+        return render_zoom_animation(render_frame, color_preset, width, height, frames, start_view,
+                                     end_view, 4.0, max_iterations, easing, adaptive_iterations, color_cycles)
 
     def generate_fractal(self, width, height, max_iterations, preset, zoom_level, color_preset, 
-                        power, escape_radius, color_cycles, smooth_coloring, x_center=None, y_center=None):
+                        power, escape_radius, color_cycles, smooth_coloring, x_center=None, y_center=None,
+                        deep_zoom=False, tile_size=256, workers=1, animation_frames=1, end_x_center=None,
+                        end_y_center=None, end_zoom_level=10.0, easing="linear", adaptive_iterations=True):
+        start_zoom_level = zoom_level
         # Calculate viewing window
         if preset != "Custom" and x_center is None:
             x_center, y_center, zoom_level = self.get_preset_coordinates(preset, zoom_level)
@@ -270,13 +322,39 @@ class FractalGeneratorV2:
         y_min = y_center - window_size/2
         y_max = y_center + window_size/2
 
+        views = [(x_center, y_center, zoom_level)]
+        if animation_frames > 1:
+            views.append((x_center if end_x_center is None else end_x_center,
+                          y_center if end_y_center is None else end_y_center,
+                          end_zoom_level * zoom_level / start_zoom_level))
+
+        deep_zoom_supported = preset in ("Custom", "Classic Mandelbrot") and power == 2.0
+        if deep_zoom and not deep_zoom_supported:
+            print(f"Deep zoom supports the z^2 + c Mandelbrot only, rendering {preset} at power {power} normally")
+            deep_zoom = False
+        elif not deep_zoom and any(self.beyond_float64(width, height, *view) for view in views):
+            if deep_zoom_supported:
+                print(f"Zoom {max(view[2] for view in views):g} is past float64 pixel precision, rendering with deep zoom")
+                deep_zoom = True
+            else:
+                print(f"Zoom {max(view[2] for view in views):g} is past float64 pixel precision, {preset} will look blocky")
+
+        if animation_frames > 1:
+            return (self.generate_animation(width, height, max_iterations, preset, color_preset, power, escape_radius,
+                                            color_cycles, smooth_coloring, deep_zoom, tile_size, workers, animation_frames,
+                                            views[0], views[1], easing, adaptive_iterations),)
+
         # Generate the fractal
-        fractal = self.compute_fractal(width, height, x_min, x_max, y_min, y_max, 
-                                     max_iterations, power, escape_radius, smooth_coloring, preset)
+        if deep_zoom:
+            fractal = self.compute_fractal_perturbation(width, height, x_center, y_center, zoom_level, max_iterations,
+                                                        escape_radius, smooth_coloring, tile_size, workers)
+        else:
+            fractal = self.compute_fractal(width, height, x_min, x_max, y_min, y_max, 
+                                         max_iterations, power, escape_radius, smooth_coloring, preset,
+                                         tile_size, workers)
 
-        # Get color function and apply coloring
-        color_function = self.get_color_function(color_preset)
-        image = self.apply_coloring(fractal, width, height, color_function, color_cycles)
+        # Apply coloring
+        image = self.apply_coloring(fractal, width, height, color_preset, color_cycles)
 
         # Convert PIL image to tensor in the format ComfyUI expects (B,H,W,C)
         if image.mode != 'RGB':
@@ -6,9 +6,11 @@ Fractal Generator V3 - A CUDA-accelerated node that generates fractal art using
 import numpy as np
 from PIL import Image
 import torch
-import colorsys
 import math
 
+from .utils.fractal_coloring import get_color_function, apply_color_lut
+from .utils.fractal_animation import EASING_MODES, PERIODICITY_TOLERANCE, render_zoom_animation
+
 class FractalGeneratorV3:
     """A ComfyUI node that generates fractal art with CUDA acceleration"""
     
@@ -39,6 +41,12 @@ class FractalGeneratorV3:
             "optional": {
                 "x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001}),
                 "y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "animation_frames": ("INT", {"default": 1, "min": 1, "max": 1000}),
+                "end_x_center": ("FLOAT", {"default": -0.75, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "end_y_center": ("FLOAT", {"default": 0.0, "min": -2.0, "max": 2.0, "step": 0.0001}),
+                "end_zoom_level": ("FLOAT", {"default": 10.0, "min": 0.1, "max": 100.0, "step": 0.1}),
+                "easing": (EASING_MODES, {"default": "linear"}),
+                "adaptive_iterations": ("BOOLEAN", {"default": True}),
             }
         }
     
@@ -62,115 +70,17 @@ class FractalGeneratorV3:
         return None
 
     def get_color_function(self, preset):
-        def classic_white_grey(value):
-            grey = int(255 * (1 - value))
-            return (grey, grey, grey)
-
-        def electric_blue(value):
-            if value > 0.95:
-                return (255, 255, 255)
-            blue = int(255 * (0.5 + 0.5 * value))
-            green = int(128 * value)
-            return (int(60 * value), green, blue)
-
-        def fire(value):
-            if value < 0.33:
-                return (int(255 * (0.5 + 1.5 * value)), 0, 0)
-            elif value < 0.66:
-                v = (value - 0.33) * 3
-                return (255, int(255 * v), 0)
-            else:
-                v = (value - 0.66) * 3
-                return (255, 255, int(255 * v))
-
-        def rainbow(value):
-            hue = value % 1.0
-            sat = 0.9
-            val = 0.9
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            return tuple(int(255 * x) for x in rgb)
-
-        def deep_space(value):
-            if value > 0.95:
-                return (255, 255, 255)
-            elif value > 0.90:
-                star_bright = int(200 * (value - 0.90) * 10)
-                return (star_bright, star_bright, star_bright)
-            
-            hue = 0.75 + value * 0.15
-            sat = 0.8 + value * 0.2
-            val = 0.4 + value * 0.6
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            r, g, b = [int(255 * x) for x in rgb]
-            if 0.3 < value < 0.6:
-                r = min(255, r + int(100 * value))
-            return (r, g, b)
+        return get_color_function(preset)
 
-        def ocean(value):
-            if value > 0.9:
-                foam = int(255 * (value - 0.9) * 10)
-                return (foam, foam, foam)
-            
-            if value < 0.5:
-                hue = 0.6 + value * 0.1
-                sat = 0.9 - value * 0.3
-                val = 0.3 + value * 0.7
-            else:
-                hue = 0.5 + value * 0.1
-                sat = 0.7
-                val = 0.6 + value * 0.4
-            
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            return tuple(int(255 * x) for x in rgb)
-
-        def forest(value):
-            if value < 0.4:
-                hue = 0.25 + value * 0.1
-                sat = 0.9 - value * 0.2
-                val = 0.3 + value * 0.7
-            elif value < 0.7:
-                hue = 0.28 + value * 0.05
-                sat = 0.8
-                val = 0.6 + value * 0.4
-            else:
-                hue = 0.08
-                sat = 0.7 - (value - 0.7) * 0.5
-                val = 0.6 + (value - 0.7) * 0.4
-            
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            return tuple(int(255 * x) for x in rgb)
-
-        def psychedelic(value):
-            hue = (value * 5) % 1.0
-            sat = 1.0
-            val = 0.9
-            rgb = colorsys.hsv_to_rgb(hue, sat, val)
-            r, g, b = [int(255 * x) for x in rgb]
-            
-            pulse = abs(math.sin(value * math.pi * 2))
-            r = min(255, r + int(50 * pulse))
-            g = min(255, g + int(50 * pulse))
-            b = min(255, b + int(50 * pulse))
-            return (r, g, b)
-
-        color_functions = {
-            "Classic White-Grey": classic_white_grey,
-            "Electric Blue": electric_blue,
-            "Fire": fire,
-            "Rainbow": rainbow,
-            "Deep Space": deep_space,
-            "Ocean": ocean,
-            "Forest": forest,
-            "Psychedelic": psychedelic
-        }
-
-        return color_functions.get(preset, classic_white_grey)
-
-    def compute_fractal(self, width, height, x_min, x_max, y_min, y_max, max_iter, power, escape_radius, smooth, preset):
+    def compute_fractal(self, width, height, x_min, x_max, y_min, y_max, max_iter, power, escape_radius, smooth, preset,
+                        interior_hint=None, axes=None):
         device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         
-        x = torch.linspace(x_min, x_max, width, device=device).view(1, width)
-        y = torch.linspace(y_min, y_max, height, device=device).view(height, 1)
+        # Coordinates are laid out in float64, as the animation shares them, then rounded once to float32
+        if axes is None:
+            axes = (np.linspace(x_min, x_max, num=width), np.linspace(y_min, y_max, num=height))
+        x = torch.as_tensor(axes[0], dtype=torch.float32, device=device).view(1, width)
+        y = torch.as_tensor(axes[1], dtype=torch.float32, device=device).view(height, 1)
         
         # Create complex plane using broadcasting
         real = x.expand(height, width)
@@ -192,25 +102,15 @@ class FractalGeneratorV3:
 
         M = torch.full((height, width), max_iter, device=device, dtype=torch.float32)
         
-        for i in range(max_iter):
-            mask = torch.abs(Z) <= escape_radius
-            
-            if preset == "Burning Ship":
-                Z[mask] = (torch.abs(Z[mask].real) + 1j * torch.abs(Z[mask].imag)) ** power + C[mask]
-            elif preset == "Tricorn":
-                Z[mask] = (Z[mask].conj()) ** power + C[mask]
-            elif preset == "Newton":
+        if preset == "Newton":
+            for i in range(max_iter):
                 mask_newton = torch.abs(Z ** 3 - 1) > 1e-6
                 Z[mask_newton] = Z[mask_newton] - (Z[mask_newton] ** 3 - 1) / (3 * Z[mask_newton] ** 2)
                 for j, root in enumerate(roots):
                     close_to_root = torch.abs(Z - root) < 1e-6
                     M[close_to_root & (M == max_iter)] = i + j/3
-            else:  # Mandelbrot and Julia
-                Z[mask] = Z[mask] ** power + C[mask]
-            
-            if preset != "Newton":
-                escaped = mask & (torch.abs(Z) > escape_radius)
-                M[escaped] = i
+        else:
+            Z, M = self.iterate_escape_time(Z, C, M, max_iter, power, escape_radius, preset, interior_hint=interior_hint)
 
         if smooth and preset != "Newton":
             abs_Z = torch.abs(Z)
@@ -232,27 +132,114 @@ class FractalGeneratorV3:
         else:
             return (M / max_iter).cpu().numpy()
 
-    def apply_coloring(self, fractal, width, height, color_function, color_cycles):
-        image = Image.new("RGB", (width, height))
-        pixels = image.load()
+    def iterate_escape_time(self, Z, C, M, max_iter, power, escape_radius, preset, compaction_interval=16,
+                            interior_hint=None):
+        """Escape-time iteration over a compacted set of still-active points
+
+        Only points with |Z| <= escape_radius are iterated. Points that escape are
+        frozen in place and dropped from the active index list every
+        compaction_interval iterations, so work shrinks as the plane escapes.
+        Points flagged in interior_hint (a boolean HxW array, e.g. the previous
+        animation frame's interior) stop early once their orbit cycles.
+        Returns the final Z and escape iteration M, matching full-plane masking.
+        """
+        Z_flat = Z.reshape(-1)
+        M_flat = M.reshape(-1)
+        C_flat = C.reshape(-1)
 
-        for y in range(height):
-            for x in range(width):
-                value = fractal[y, x]
-                if value == 1.0:  # Inside set
-                    pixels[x, y] = (0, 0, 0)
-                else:
-                    cycled_value = (value * color_cycles) % 1.0
-                    pixels[x, y] = color_function(cycled_value)
-        return image
+        # Points already outside the radius are never iterated and keep M = max_iter
+        active = torch.abs(Z_flat) <= escape_radius
+
+        # Main cardioid and period-2 bulb never escape for z^2 + c; with a radius below 2
+        # their orbits can still pass |z| > escape_radius, so they must be iterated then
+        if preset not in ("Julia Set", "Burning Ship", "Tricorn") and power == 2.0 and escape_radius >= 2.0:
+            x = C_flat.real
+            y = C_flat.imag
+            q = (x - 0.25) ** 2 + y ** 2
+            in_cardioid = q * (q + (x - 0.25)) <= 0.25 * y ** 2
+            in_bulb = (x + 1.0) ** 2 + y ** 2 <= 0.0625
+            active &= ~(in_cardioid | in_bulb)
+
+        indices = torch.nonzero(active).squeeze(1)
+        z = Z_flat[indices]
+        c = C_flat[indices]
+        m = M_flat[indices]
+        alive = torch.ones_like(indices, dtype=torch.bool)
+
+        if interior_hint is not None:
+            hinted = torch.from_numpy(interior_hint).to(indices.device).reshape(-1)[indices]
+            saved = z
+            # Float32 orbits only settle to within a few ulps of their cycle
+            tolerance = max(PERIODICITY_TOLERANCE, 2 * torch.finfo(z.real.dtype).eps)
+
+        for i in range(max_iter):
+            if preset == "Burning Ship":
+                z_next = (torch.abs(z.real) + 1j * torch.abs(z.imag)) ** power + c
+            elif preset == "Tricorn":
+                z_next = (z.conj()) ** power + c
+            else:  # Mandelbrot and Julia
+                z_next = z ** power + c
+            z = torch.where(alive, z_next, z)
+
+            escaped = alive & (torch.abs(z) > escape_radius)
+            m = torch.where(escaped, torch.full_like(m, i), m)
+            alive = alive & ~escaped
+
+            if interior_hint is not None:
+                # A cycle in a hinted orbit means it never escapes
+                alive = alive & ~(hinted & (torch.abs(z - saved) < tolerance))
+                # Brent-style: move the saved point forward at 2^k - 1 so any cycle length is caught
+                if i & (i + 1) == 0:
+                    saved = z
+
+            if (i + 1) % compaction_interval == 0 or i == max_iter - 1:
+                # Write back, then keep only points that are still iterating
+                Z_flat[indices] = z
+                M_flat[indices] = m
+                indices = indices[alive]
+                if indices.numel() == 0:
+                    break
+                z = z[alive]
+                c = c[alive]
+                m = m[alive]
+                if interior_hint is not None:
+                    hinted = hinted[alive]
+                    saved = saved[alive]
+                alive = alive[alive]
+
+        return Z_flat.view_as(Z), M_flat.view_as(M)
+
+    def apply_coloring(self, fractal, width, height, color_preset, color_cycles):
+        # Single LUT lookup over the whole frame; inside-set points stay black
+        rgb = apply_color_lut(fractal, color_preset, color_cycles)
+        return Image.fromarray(rgb, "RGB")
 
     def generate_fractal(self, width, height, max_iterations, preset, zoom_level, color_preset, 
-                        power, escape_radius, color_cycles, smooth_coloring, x_center=None, y_center=None):
+                        power, escape_radius, color_cycles, smooth_coloring, x_center=None, y_center=None,
+                        animation_frames=1, end_x_center=None, end_y_center=None, end_zoom_level=10.0,
+                        easing="linear", adaptive_iterations=True):
+        start_zoom_level = zoom_level
         if preset != "Custom" and x_center is None:
             x_center, y_center, zoom_level = self.get_preset_coordinates(preset, zoom_level)
         elif x_center is None:
             x_center, y_center = -0.75, 0.0
 
+        if animation_frames > 1:
+            # Presets scale the end zoom the same way as the start zoom
+            end_zoom = end_zoom_level * zoom_level / start_zoom_level
+            images = render_zoom_animation(
+                lambda view, window, axes, frame_iter, hint: self.compute_fractal(width, height, *window, frame_iter, power,
+                                                                                  escape_radius, smooth_coloring, preset,
+                                                                                  hint, axes),
+                color_preset, width, height, animation_frames,
+                (x_center, y_center, zoom_level),
+                (x_center if end_x_center is None else end_x_center,
+                 y_center if end_y_center is None else end_y_center,
+                 end_zoom),
+                4.0, max_iterations, easing, adaptive_iterations, color_cycles
+            )
+            return (images,)
+
         window_size = 4.0 / zoom_level
         x_min = x_center - window_size/2
         x_max = x_center + window_size/2
@@ -262,8 +249,7 @@ class FractalGeneratorV3:
         fractal = self.compute_fractal(width, height, x_min, x_max, y_min, y_max, 
                                      max_iterations, power, escape_radius, smooth_coloring, preset)
 
-        color_function = self.get_color_function(color_preset)
-        image = self.apply_coloring(fractal, width, height, color_function, color_cycles)
+        image = self.apply_coloring(fractal, width, height, color_preset, color_cycles)
 
         if image.mode != 'RGB':
             image = image.convert('RGB')
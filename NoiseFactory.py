@@ -7,7 +7,9 @@ import numpy as np
 from PIL import Image
 import torch
 import random
-from opensimplex import OpenSimplex
+
+from .utils.cellular_noise import cellular_noise
+from .utils.simplex_noise import SimplexNoise
 
 class NoiseFactory:
     """A ComfyUI node that generates various noise patterns"""
@@ -42,50 +44,52 @@ class NoiseFactory:
     FUNCTION = "generate_noise"
     CATEGORY = "DJZ-Nodes"
 
+    def pixel_grid(self, width, height):
+        """Pixel column and row indices, shaped to broadcast into an (H, W) grid"""
+        return np.arange(width).reshape(1, width), np.arange(height).reshape(height, 1)
+
     def generate_plasma(self, width, height, scale, octaves, persistence):
-        noise_generators = [OpenSimplex(seed=random.randint(0, 1000000)) for _ in range(3)]
-        result = np.zeros((height, width, 3))
+        noise_generators = [SimplexNoise(seed=random.randint(0, 1000000)) for _ in range(3)]
         
         # Parameters for plasma-like effect
         time_offset = random.random() * 1000
         plasma_scale = scale * 2.0  # Increased scale for more pronounced plasma effect
         
-        for y in range(height):
-            for x in range(width):
-                # Base coordinates
-                nx = x / width * plasma_scale
-                ny = y / height * plasma_scale
-                
-                # Generate three different noise fields that will interact
-                noise1 = noise2 = noise3 = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for o in range(octaves):
-                    # Add different frequencies with varying phase shifts
-                    phase1 = time_offset + nx * freq
-                    phase2 = time_offset + ny * freq
-                    phase3 = time_offset + (nx + ny) * freq * 0.5
-                    
-                    noise1 += noise_generators[0].noise2(phase1, ny * freq) * amplitude
-                    noise2 += noise_generators[1].noise2(nx * freq, phase2) * amplitude
-                    noise3 += noise_generators[2].noise2(phase3, phase3) * amplitude
-                    
-                    amplitude *= persistence
-                    freq *= 2.0
-                
-                # Combine noise fields with sine waves for plasma effect
-                r = np.sin(noise1 * np.pi) * 0.5 + 0.5
-                g = np.sin(noise2 * np.pi + 2.0944) * 0.5 + 0.5  # 2π/3 phase shift
-                b = np.sin(noise3 * np.pi + 4.1888) * 0.5 + 0.5  # 4π/3 phase shift
-                
-                # Add interference patterns
-                interference = np.sin((nx + ny) * 8.0) * 0.1
-                r = np.clip(r + interference, 0, 1)
-                g = np.clip(g + interference, 0, 1)
-                b = np.clip(b + interference, 0, 1)
-                
-                result[y, x] = [r, g, b]
+        # Base coordinates
+        x, y = self.pixel_grid(width, height)
+        nx = x / width * plasma_scale
+        ny = y / height * plasma_scale
+        
+        # Generate three different noise fields that will interact, one whole-grid octave at a time
+        noise1 = noise2 = noise3 = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        for o in range(octaves):
+            # Add different frequencies with varying phase shifts
+            phase1 = time_offset + nx * freq
+            phase2 = time_offset + ny * freq
+            phase3 = time_offset + (nx + ny) * freq * 0.5
+            
+            noise1 += noise_generators[0].noise2(phase1, ny * freq) * amplitude
+            noise2 += noise_generators[1].noise2(nx * freq, phase2) * amplitude
+            noise3 += noise_generators[2].noise2(phase3, phase3) * amplitude
+            
+            amplitude *= persistence
+            freq *= 2.0
+        
+        # Combine noise fields with sine waves for plasma effect
+        r = np.sin(noise1 * np.pi) * 0.5 + 0.5
+        g = np.sin(noise2 * np.pi + 2.0944) * 0.5 + 0.5  # 2π/3 phase shift
+        b = np.sin(noise3 * np.pi + 4.1888) * 0.5 + 0.5  # 4π/3 phase shift
+        
+        # Add interference patterns
+        interference = np.sin((nx + ny) * 8.0) * 0.1
+        r = np.clip(r + interference, 0, 1)
+        g = np.clip(g + interference, 0, 1)
+        b = np.clip(b + interference, 0, 1)
+        
+        result = np.stack([r, g, b], axis=-1)
         
         # Create 2D mask with correct dimensions
         x = np.linspace(0, np.pi * 2, width)
@@ -98,219 +102,168 @@ class NoiseFactory:
         return result
 
     def generate_perlin_rgb(self, width, height, scale, octaves, persistence):
-        noise_r = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_g = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_b = OpenSimplex(seed=random.randint(0, 1000000))
+        noise_r = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_g = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_b = SimplexNoise(seed=random.randint(0, 1000000))
         
-        result = np.zeros((height, width, 3))
+        x, y = self.pixel_grid(width, height)
+        nx = x / width * scale
+        ny = y / height * scale
         
-        for y in range(height):
-            for x in range(width):
-                nx = x / width * scale
-                ny = y / height * scale
-                
-                r = g = b = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for _ in range(octaves):
-                    r += noise_r.noise2(nx * freq, ny * freq) * amplitude
-                    g += noise_g.noise2(nx * freq, ny * freq) * amplitude
-                    b += noise_b.noise2(nx * freq, ny * freq) * amplitude
-                    amplitude *= persistence
-                    freq *= 2
-                
-                result[y, x] = [(r + 1) / 2, (g + 1) / 2, (b + 1) / 2]
+        r = g = b = 0
+        amplitude = 1.0
+        freq = 1.0
         
-        return result
+        for _ in range(octaves):
+            r += noise_r.noise2(nx * freq, ny * freq) * amplitude
+            g += noise_g.noise2(nx * freq, ny * freq) * amplitude
+            b += noise_b.noise2(nx * freq, ny * freq) * amplitude
+            amplitude *= persistence
+            freq *= 2
+        
+        return np.stack([(r + 1) / 2, (g + 1) / 2, (b + 1) / 2], axis=-1)
 
     def generate_hsv_noise(self, width, height, scale, octaves, persistence, saturation):
-        noise_h = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_s = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_v = OpenSimplex(seed=random.randint(0, 1000000))
+        noise_h = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_s = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_v = SimplexNoise(seed=random.randint(0, 1000000))
         
         def hsv_to_rgb(h, s, v):
             h = h % 1.0
             c = v * s
             x = c * (1 - abs((h * 6) % 2 - 1))
             m = v - c
+            zero = np.zeros_like(h)
             
-            if h < 1/6:
-                r, g, b = c, x, 0
-            elif h < 2/6:
-                r, g, b = x, c, 0
-            elif h < 3/6:
-                r, g, b = 0, c, x
-            elif h < 4/6:
-                r, g, b = 0, x, c
-            elif h < 5/6:
-                r, g, b = x, 0, c
-            else:
-                r, g, b = c, 0, x
+            sectors = [h < 1/6, h < 2/6, h < 3/6, h < 4/6, h < 5/6]
+            r = np.select(sectors, [c, x, zero, zero, x], c)
+            g = np.select(sectors, [x, c, c, x, zero], zero)
+            b = np.select(sectors, [zero, zero, x, c, c], x)
                 
-            return r + m, g + m, b + m
+            return np.stack([r + m, g + m, b + m], axis=-1)
         
-        result = np.zeros((height, width, 3))
+        x, y = self.pixel_grid(width, height)
+        nx = x / width * scale
+        ny = y / height * scale
         
-        for y in range(height):
-            for x in range(width):
-                nx = x / width * scale
-                ny = y / height * scale
-                
-                h = v = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for _ in range(octaves):
-                    h += noise_h.noise2(nx * freq, ny * freq) * amplitude
-                    v += noise_v.noise2(nx * freq, ny * freq) * amplitude
-                    amplitude *= persistence
-                    freq *= 2
-                
-                h = (h + 1) / 2
-                v = ((v + 1) / 2) * 0.8 + 0.2  # Ensure some minimum brightness
-                
-                result[y, x] = hsv_to_rgb(h, saturation, v)
+        h = v = 0
+        amplitude = 1.0
+        freq = 1.0
         
-        return result
+        for _ in range(octaves):
+            h += noise_h.noise2(nx * freq, ny * freq) * amplitude
+            v += noise_v.noise2(nx * freq, ny * freq) * amplitude
+            amplitude *= persistence
+            freq *= 2
+        
+        h = (h + 1) / 2
+        v = ((v + 1) / 2) * 0.8 + 0.2  # Ensure some minimum brightness
+        
+        return hsv_to_rgb(h, saturation, v)
 
     def generate_rgb_turbulence(self, width, height, scale, octaves, persistence):
         result = np.zeros((height, width, 3))
-        noise_generators = [OpenSimplex(seed=random.randint(0, 1000000)) for _ in range(6)]  # 2 per channel
+        noise_generators = [SimplexNoise(seed=random.randint(0, 1000000)) for _ in range(6)]  # 2 per channel
         
-        for y in range(height):
-            for x in range(width):
-                for c in range(3):  # RGB channels
-                    value = 0
-                    amplitude = 1.0
-                    freq = 1.0
-                    # Use two noise generators per channel for more turbulent effect
-                    for o in range(octaves):
-                        nx = x / width * scale * freq
-                        ny = y / height * scale * freq
-                        value += (noise_generators[c*2].noise2(nx, ny) * 
-                                noise_generators[c*2+1].noise2(ny, nx)) * amplitude
-                        amplitude *= persistence
-                        freq *= 2
-                    result[y, x, c] = (value + 1) / 2
+        x, y = self.pixel_grid(width, height)
+        for c in range(3):  # RGB channels
+            value = 0
+            amplitude = 1.0
+            freq = 1.0
+            # Use two noise generators per channel for more turbulent effect
+            for o in range(octaves):
+                nx = x / width * scale * freq
+                ny = y / height * scale * freq
+                value += (noise_generators[c*2].noise2(nx, ny) * 
+                        noise_generators[c*2+1].noise2(ny, nx)) * amplitude
+                amplitude *= persistence
+                freq *= 2
+            result[:, :, c] = (value + 1) / 2
         return result
 
     def generate_prismatic(self, width, height, scale, octaves, persistence):
-        base_noise = OpenSimplex(seed=random.randint(0, 1000000))
-        result = np.zeros((height, width, 3))
+        base_noise = SimplexNoise(seed=random.randint(0, 1000000))
         
-        for y in range(height):
-            for x in range(width):
-                value = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for o in range(octaves):
-                    nx = x / width * scale * freq
-                    ny = y / height * scale * freq
-                    value += base_noise.noise2(nx, ny) * amplitude
-                    amplitude *= persistence
-                    freq *= 2
-                
-                # Convert noise to spectral colors
-                hue = (value + 1) / 2  # Normalize to 0-1
-                # Convert spectral hue to RGB
-                h = hue * 6
-                if h < 1:
-                    result[y, x] = [1, h, 0]
-                elif h < 2:
-                    result[y, x] = [2-h, 1, 0]
-                elif h < 3:
-                    result[y, x] = [0, 1, h-2]
-                elif h < 4:
-                    result[y, x] = [0, 4-h, 1]
-                elif h < 5:
-                    result[y, x] = [h-4, 0, 1]
-                else:
-                    result[y, x] = [1, 0, 6-h]
-        return result
+        x, y = self.pixel_grid(width, height)
+        value = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        for o in range(octaves):
+            nx = x / width * scale * freq
+            ny = y / height * scale * freq
+            value += base_noise.noise2(nx, ny) * amplitude
+            amplitude *= persistence
+            freq *= 2
+        
+        # Convert noise to spectral colors
+        hue = (value + 1) / 2  # Normalize to 0-1
+        # Convert spectral hue to RGB
+        h = hue * 6
+        ones = np.ones_like(h)
+        zeros = np.zeros_like(h)
+        sectors = [h < 1, h < 2, h < 3, h < 4, h < 5]
+        r = np.select(sectors, [ones, 2-h, zeros, zeros, h-4], ones)
+        g = np.select(sectors, [h, ones, ones, 4-h, zeros], zeros)
+        b = np.select(sectors, [zeros, zeros, h-2, ones, ones], 6-h)
+        return np.stack([r, g, b], axis=-1)
 
     def generate_polychromatic_cellular(self, width, height, scale, octaves, persistence):
-        result = np.zeros((height, width, 3))
-        # Generate random points for cellular noise
-        num_points = 20 * scale
-        points = np.random.rand(int(num_points), 2)  # Random points in 0-1 space
-        colors = np.random.rand(int(num_points), 3)  # Random colors for each point
-        
-        for y in range(height):
-            for x in range(width):
-                px = x / width
-                py = y / height
-                # Find distances to all points
-                distances = np.sqrt(((points - [px, py]) ** 2).sum(axis=1))
-                # Get indices of two closest points
-                closest_idx = np.argpartition(distances, 2)[:2]
-                # Interpolate between colors of two closest points
-                d1, d2 = distances[closest_idx]
-                t = d1 / (d1 + d2)  # Interpolation factor
-                result[y, x] = colors[closest_idx[0]] * (1-t) + colors[closest_idx[1]] * t
-        return result
+        x, y = self.pixel_grid(width, height)
+        # Two nearest feature points per pixel, looked up for the whole grid at once
+        return cellular_noise(x / width, y / height, random.randint(0, 1000000), scale, octaves, persistence)
 
     def generate_rainbow_fractal(self, width, height, scale, octaves, persistence):
-        result = np.zeros((height, width, 3))
-        noise_gen = OpenSimplex(seed=random.randint(0, 1000000))
+        noise_gen = SimplexNoise(seed=random.randint(0, 1000000))
         
-        for y in range(height):
-            for x in range(width):
-                value = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for o in range(octaves):
-                    nx = x / width * scale * freq
-                    ny = y / height * scale * freq
-                    value += noise_gen.noise2(nx, ny) * amplitude
-                    amplitude *= persistence
-                    freq *= 2.5  # Use 2.5 for more interesting fractal patterns
-                
-                # Convert to rainbow colors using polar coordinates
-                angle = np.arctan2(value, amplitude) + np.pi
-                hue = (angle / (2 * np.pi) + value) % 1.0
-                
-                # Convert hue to RGB
-                h = hue * 6
-                x_val = 1 - abs(h % 2 - 1)
-                if h < 1:
-                    result[y, x] = [1, x_val, 0]
-                elif h < 2:
-                    result[y, x] = [x_val, 1, 0]
-                elif h < 3:
-                    result[y, x] = [0, 1, x_val]
-                elif h < 4:
-                    result[y, x] = [0, x_val, 1]
-                elif h < 5:
-                    result[y, x] = [x_val, 0, 1]
-                else:
-                    result[y, x] = [1, 0, x_val]
-        return result
+        x, y = self.pixel_grid(width, height)
+        value = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        for o in range(octaves):
+            nx = x / width * scale * freq
+            ny = y / height * scale * freq
+            value += noise_gen.noise2(nx, ny) * amplitude
+            amplitude *= persistence
+            freq *= 2.5  # Use 2.5 for more interesting fractal patterns
+        
+        # Convert to rainbow colors using polar coordinates
+        angle = np.arctan2(value, amplitude) + np.pi
+        hue = (angle / (2 * np.pi) + value) % 1.0
+        
+        # Convert hue to RGB
+        h = hue * 6
+        x_val = 1 - abs(h % 2 - 1)
+        ones = np.ones_like(h)
+        zeros = np.zeros_like(h)
+        sectors = [h < 1, h < 2, h < 3, h < 4, h < 5]
+        r = np.select(sectors, [ones, x_val, zeros, zeros, x_val], ones)
+        g = np.select(sectors, [x_val, ones, ones, x_val, zeros], zeros)
+        b = np.select(sectors, [zeros, zeros, x_val, ones, ones], x_val)
+        return np.stack([r, g, b], axis=-1)
 
     def generate_color_wavelet(self, width, height, scale, octaves, persistence):
         result = np.zeros((height, width, 3))
-        noise_gens = [OpenSimplex(seed=random.randint(0, 1000000)) for _ in range(3)]
+        noise_gens = [SimplexNoise(seed=random.randint(0, 1000000)) for _ in range(3)]
         
-        for y in range(height):
-            for x in range(width):
-                for c in range(3):
-                    value = 0
-                    amplitude = 1.0
-                    freq = 1.0
-                    phase = c * 2 * np.pi / 3  # Phase shift for each color channel
-                    
-                    for o in range(octaves):
-                        nx = x / width * scale * freq
-                        ny = y / height * scale * freq
-                        # Add wavelet-like behavior with phase shifts
-                        value += (noise_gens[c].noise2(nx, ny) * 
-                                np.sin(freq * phase + nx * 2 * np.pi)) * amplitude
-                        amplitude *= persistence
-                        freq *= 2
-                    
-                    result[y, x, c] = (value + 1) / 2
+        x, y = self.pixel_grid(width, height)
+        for c in range(3):
+            value = 0
+            amplitude = 1.0
+            freq = 1.0
+            phase = c * 2 * np.pi / 3  # Phase shift for each color channel
+            
+            for o in range(octaves):
+                nx = x / width * scale * freq
+                ny = y / height * scale * freq
+                # Add wavelet-like behavior with phase shifts
+                value += (noise_gens[c].noise2(nx, ny) * 
+                        np.sin(freq * phase + nx * 2 * np.pi)) * amplitude
+                amplitude *= persistence
+                freq *= 2
+            
+            result[:, :, c] = (value + 1) / 2
         return result
 
     def generate_noise(self, width, height, noise_type, scale=1.0, octaves=4, 
@@ -0,0 +1,29 @@
+"""Particle helpers for the ScreenGen presets, re-exported from ``utils/particles.py``.
+
+The ScreensaverGenerator nodes put this directory on ``sys.path`` before
+loading presets, so a ``.scg`` file can import it by name.
+
+Usage:
+    from screengen_particles import ParticleSystem, splat_discs
+"""
+
+import importlib.util
+import os
+import sys
+
+try:
+    from ..utils.particles import ParticleSystem, disc_offsets, splat_discs
+except ImportError:
+    # Imported by name from the presets directory, outside the package: load the shared module by path
+    _name = "djz_utils_particles"
+    if _name not in sys.modules:
+        _path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils", "particles.py")
+        _spec = importlib.util.spec_from_file_location(_name, _path)
+        _module = importlib.util.module_from_spec(_spec)
+        _spec.loader.exec_module(_module)
+        sys.modules[_name] = _module
+    ParticleSystem = sys.modules[_name].ParticleSystem
+    disc_offsets = sys.modules[_name].disc_offsets
+    splat_discs = sys.modules[_name].splat_discs
+
+__all__ = ["ParticleSystem", "disc_offsets", "splat_discs"]
@@ -7,9 +7,11 @@ import colorsys
 import cv2
 import os
 import sys
-import glob
 from torch import Tensor
 
+from .utils.frame_writer import FrameWriter, output_video_path
+from .utils.preset_registry import get_preset_registry
+
 # Custom exceptions for better error handling
 class ScreensaverError(Exception):
     """Base exception class for screensaver generator errors."""
@@ -78,9 +80,12 @@ class ScreensaverGeneratorV3:
         """
         Load all available screensaver presets from the ScreenGen directory.
         
-        This method scans the ScreenGen directory for .scg files containing
-        screensaver preset definitions. Each preset is loaded and validated
-        before being added to the available presets.
+        Preset modules come from a shared registry that executes each .scg
+        file once and re-executes it only when its modification time or size
+        changes, so creating the node (which INPUT_TYPES and VALIDATE_INPUTS
+        do on every call) no longer re-runs every preset script. Each preset
+        class is then instantiated and validated before being added to the
+        available presets.
         
         Raises:
             PresetLoadError: If there are issues loading or validating presets
@@ -93,35 +98,22 @@ class ScreensaverGeneratorV3:
         if preset_dir not in sys.path:
             sys.path.append(preset_dir)
             
-        # Get all .scg files
-        preset_files = glob.glob(os.path.join(preset_dir, "*.scg"))
-        if not preset_files:
+        registry = get_preset_registry(preset_dir, "*.scg")
+        modules = registry.modules()
+        if not modules and not registry.errors:
             raise PresetLoadError("No preset files (.scg) found in ScreenGen directory")
         
-        for preset_path in preset_files:
-            filename = os.path.basename(preset_path)
-            module_name = filename[:-4]  # Remove .scg extension
+        if registry.errors:
+            module_name, error = next(iter(registry.errors.items()))
+            raise PresetLoadError(f"Failed to load preset {module_name}.scg: {type(error).__name__}: {error}")
+        
+        for module_name, module in modules.items():
+            filename = f"{module_name}.scg"
             
             try:
-                # Load and validate the module content
-                with open(preset_path, 'r', encoding='utf-8') as f:
-                    module_content = f.read()
-                
-                if not module_content.strip():
-                    raise PresetLoadError(f"Empty preset file: {filename}")
-                
-                # Create namespace for the module
-                namespace: Dict[str, Any] = {}
-                
-                try:
-                    # Execute the module content in the namespace
-                    exec(module_content, namespace)
-                except Exception as e:
-                    raise PresetLoadError(f"Syntax error in preset {filename}: {str(e)}")
-                
                 # Find and validate the screensaver class
                 screensaver_class = None
-                for item_name, item in namespace.items():
+                for item_name, item in vars(module).items():
                     if isinstance(item, type) and item_name.endswith('Screensaver'):
                         screensaver_class = item
                         break
@@ -191,6 +183,13 @@ class ScreensaverGeneratorV3:
                     "max": 5.0,
                     "step": 0.1
                 })
+            },
+            "optional": {
+                "stream_to": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "placeholder": "e.g. renders/clip.mp4 (empty = keep frames in memory)"
+                })
             }
         }
         
@@ -296,48 +295,84 @@ class ScreensaverGeneratorV3:
             
         return preset_params
         
+    def _clear_regions(self, canvas: np.ndarray, dirty: Optional[List[Tuple[int, int, int, int]]]) -> None:
+        """
+        Erase the regions a preset reported as drawn, ready for its next frame.
+        
+        Args:
+            canvas: Reusable (H, W, 3) uint8 canvas
+            dirty: Sequence of (x0, y0, x1, y1) boxes (a list or an (N, 4) array),
+                or None to erase the whole canvas
+        """
+        # Past a few thousand bytes per box, one fill is cheaper than many slice writes
+        if dirty is None or len(dirty) * 4096 > canvas.size:
+            canvas.fill(0)
+            return
+            
+        height, width = canvas.shape[:2]
+        for x0, y0, x1, y1 in dirty:
+            x0, y0 = max(0, int(x0)), max(0, int(y0))
+            x1, y1 = min(width, int(x1)), min(height, int(y1))
+            if x0 < x1 and y0 < y1:
+                canvas[y0:y1, x0:x1] = 0
+        
     def _generate_frame(
         self,
         preset_instance: Any,
         frame_index: int,
-        width: int,
-        height: int,
+        canvas: np.ndarray,
+        output: np.ndarray,
         color_palette: List[Tuple[int, int, int]],
         speed: float,
         state: Optional[Any],
-        preset_params: Dict[str, Any]
-    ) -> Tuple[torch.Tensor, Any]:
+        preset_params: Dict[str, Any],
+        dirty: Optional[List[Tuple[int, int, int, int]]]
+    ) -> Tuple[Any, Optional[List[Tuple[int, int, int, int]]]]:
         """
-        Generate a single animation frame.
+        Generate a single animation frame into a slot of the output batch.
+        
+        Presets that implement ``render_into`` draw straight into the reusable
+        canvas, which keeps everything outside the previous frame's dirty
+        regions. Presets with only ``render`` return a fresh image instead.
         
         Args:
             preset_instance: The preset instance to use for rendering
             frame_index: Current frame number
-            width: Frame width in pixels
-            height: Frame height in pixels
+            canvas: Reusable (H, W, 3) uint8 canvas
+            output: (H, W, 3) uint8 slot of the output batch for this frame
             color_palette: List of RGB color tuples
             speed: Animation speed multiplier
             state: Current animation state
             preset_params: Preset-specific parameters
+            dirty: Regions drawn in the previous frame
             
         Returns:
-            Tuple of (frame tensor, new state)
+            Tuple of (new state, regions drawn in this frame)
             
         Raises:
             ScreensaverError: If frame generation fails
         """
         try:
-            # Render frame using the preset
+            if hasattr(preset_instance, 'render_into'):
+                # Erase only what the previous frame drew, then draw in place
+                self._clear_regions(canvas, dirty)
+                new_state, dirty = preset_instance.render_into(
+                    canvas, frame_index,
+                    color_palette, speed, state,
+                    preset_params
+                )
+                output[...] = canvas
+                return new_state, dirty
+            
+            # Legacy presets allocate and return their own frame
+            height, width = output.shape[:2]
             frame, new_state = preset_instance.render(
                 width, height, frame_index,
                 color_palette, speed, state,
                 preset_params
             )
-            
-            # Convert to tensor with proper normalization
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            
-            return frame_tensor, new_state
+            output[...] = frame
+            return new_state, None
             
         except Exception as e:
             raise ScreensaverError(f"Frame generation failed: {str(e)}")
@@ -351,6 +386,7 @@ class ScreensaverGeneratorV3:
         preset: str,
         color_scheme: str,
         speed: float,
+        stream_to: str = "",
         **kwargs: Any
     ) -> Tuple[torch.Tensor]:
         """
@@ -364,10 +400,13 @@ class ScreensaverGeneratorV3:
             preset: Name of the screensaver preset to use
             color_scheme: Color scheme name
             speed: Animation speed multiplier
+            stream_to: Video file (under the output directory) to encode the
+                frames into with ffmpeg instead of keeping them in memory
             **kwargs: Additional preset-specific parameters
             
         Returns:
-            Tuple containing a tensor of animation frames
+            Tuple containing a tensor of animation frames (only the last
+            frame when streaming to a file)
             
         Raises:
             ValidationError: If parameters are invalid
@@ -388,20 +427,23 @@ class ScreensaverGeneratorV3:
             except ValidationError as e:
                 raise ValidationError(f"Color scheme error: {str(e)}")
             
-            # Pre-allocate frame list with known size for better memory efficiency
-            frames = []
+            output_path = output_video_path(stream_to) if stream_to else None
+            canvas = np.zeros((height, width, 3), dtype=np.uint8)
+            frame = np.empty((height, width, 3), dtype=np.uint8)
             state = None
+            dirty = []
             
-            # Generate frames with proper error handling
-            for i in range(max_frames):
-                frame_tensor, state = self._generate_frame(
-                    preset_instance, i, width, height,
-                    color_palette, speed, state, preset_params
-                )
-                frames.append(frame_tensor)
+            # Generate frames with proper error handling; each one goes straight
+            # into the preallocated batch, or out to ffmpeg
+            with FrameWriter(max_frames, height, width, fps=fps, output_path=output_path) as writer:
+                for i in range(max_frames):
+                    state, dirty = self._generate_frame(
+                        preset_instance, i, canvas, frame,
+                        color_palette, speed, state, preset_params, dirty
+                    )
+                    writer.write(i, frame)
             
-            # Stack frames into batch efficiently
-            return (torch.stack(frames),)
+            return (writer.images,)
             
         except ValidationError:
             raise  # Re-raise validation errors as-is
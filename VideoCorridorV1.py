@@ -1,8 +1,8 @@
 import numpy as np
-import torch
 import cv2
 import colorsys
 from math import sin, cos, pi
+from .utils.frame_writer import FrameWriter, output_video_path
 
 class VideoCorridorV1:
     def __init__(self):
@@ -64,6 +64,13 @@ class VideoCorridorV1:
                     "max": 2.0,
                     "step": 0.1
                 })
+            },
+            "optional": {
+                "stream_to": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "placeholder": "e.g. renders/clip.mp4 (empty = keep frames in memory)"
+                })
             }
         }
 
@@ -206,9 +213,9 @@ class VideoCorridorV1:
         return img
 
     def generate(self, width, height, fps, max_frames, corridor_depth, movement_speed, 
-                color_scheme, wall_pattern, lighting_mode, perspective_strength):
+                color_scheme, wall_pattern, lighting_mode, perspective_strength, stream_to=""):
         """Generate video frames"""
-        frames = []
+        output_path = output_video_path(stream_to) if stream_to else None
         params = {
             "corridor_depth": corridor_depth,
             "movement_speed": movement_speed,
@@ -218,12 +225,12 @@ class VideoCorridorV1:
             "perspective_strength": perspective_strength
         }
         
-        for i in range(max_frames):
-            frame = self.create_corridor_frame(width, height, i, params)
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame_tensor)
+        # Frames go straight into the preallocated batch, or out to ffmpeg
+        with FrameWriter(max_frames, height, width, fps=fps, output_path=output_path) as writer:
+            for i in range(max_frames):
+                writer.write(i, self.create_corridor_frame(width, height, i, params))
         
-        return (torch.stack(frames),)
+        return (writer.images,)
 
     RETURN_TYPES = ("IMAGE",)
     RETURN_NAMES = ("images",)
@@ -1,9 +1,10 @@
 import numpy as np
 import torch
-import cv2
 import colorsys
 from math import sin, cos, pi
 
+from .utils.maze_raycast import QUALITY_SAMPLES, cast_columns, render_columns
+
 class VideoMazeV1:
     def __init__(self):
         self.type = "VideoMazeV1"
@@ -109,41 +110,20 @@ class VideoMazeV1:
         }
         return palettes.get(scheme, palettes["neon"])
 
-    def apply_wall_pattern(self, img, x, wall_top, wall_height, color, pattern, frame):
-        """Apply different wall patterns"""
-        if pattern == "solid":
-            cv2.line(img, (x, wall_top), (x, wall_top + wall_height), color, 1)
-        elif pattern == "gradient":
-            for y in range(wall_top, wall_top + wall_height):
-                blend = (y - wall_top) / wall_height
-                c = tuple(int(c1 + (c2 - c1) * blend) for c1, c2 in zip(color, (255, 255, 255)))
-                cv2.line(img, (x, y), (x, y+1), c, 1)
-        elif pattern == "brick":
-            brick_height = 20
-            for y in range(wall_top, wall_top + wall_height, brick_height):
-                offset = (x // brick_height + frame) % 2 * (brick_height // 2)
-                y_pos = y + offset
-                cv2.line(img, (x, y_pos), (x, min(y_pos + brick_height, wall_top + wall_height)), color, 1)
-        elif pattern == "circuit":
-            circuit_height = 30
-            y_offset = (frame * 2) % circuit_height
-            for y in range(wall_top, wall_top + wall_height, circuit_height):
-                y_pos = y + y_offset
-                cv2.line(img, (x, y_pos), (x, min(y_pos + circuit_height//2, wall_top + wall_height)), color, 1)
-
     def apply_lighting(self, color, mode, frame, dist):
-        """Apply different lighting effects"""
+        """Apply different lighting effects to (N, 3) column colours at distances dist"""
+        color = np.asarray(color, dtype=np.float64)
         if mode == "static":
             return color
         elif mode == "dynamic":
-            intensity = max(0.4, min(1.0, 1.0 - dist/20.0))
-            return tuple(int(c * intensity) for c in color)
+            intensity = np.clip(1.0 - np.asarray(dist)/20.0, 0.4, 1.0)
+            return np.trunc(color * intensity[..., None])
         elif mode == "pulsing":
             pulse = (sin(frame * 0.1) + 1) * 0.3 + 0.4
-            return tuple(int(c * pulse) for c in color)
+            return np.trunc(color * pulse)
         elif mode == "ambient":
             ambient = 0.3
-            return tuple(int(c * ambient + (255 - c) * 0.1) for c in color)
+            return np.trunc(color * ambient + (255 - color) * 0.1)
         return color
 
     def generate_enhanced_maze(self, size):
@@ -169,37 +149,8 @@ class VideoMazeV1:
         carve_path(1, 1)
         return maze
 
-    def cast_enhanced_ray(self, maze, pos_x, pos_y, angle, max_depth, quality):
-        """Enhanced ray casting with quality settings"""
-        ray_x = cos(angle)
-        ray_y = sin(angle)
-        
-        step_size = {"standard": 1.0, "high": 0.5, "ultra": 0.25}[quality]
-        max_steps = int(max_depth / step_size)
-        
-        dist = 0.0
-        for _ in range(max_steps):
-            check_x = pos_x + ray_x * dist
-            check_y = pos_y + ray_y * dist
-            
-            map_x = int(check_x)
-            map_y = int(check_y)
-            
-            if (map_x < 0 or map_x >= maze.shape[1] or 
-                map_y < 0 or map_y >= maze.shape[0]):
-                break
-                
-            if maze[map_y, map_x] == 1:
-                break
-                
-            dist += step_size
-            
-        return dist
-
     def render_frame(self, width, height, frame, state, params):
         """Render a single enhanced frame"""
-        img = np.zeros((height, width, 3), dtype=np.uint8)
-        
         # Initialize or update maze if needed
         if state['maze'] is None or state['maze_size'] != params['maze_size']:
             state['maze'] = self.generate_enhanced_maze(params['maze_size'])
@@ -228,52 +179,33 @@ class VideoMazeV1:
         state['pos_y'] = new_y
         state['angle'] += params['rotation_speed']
         
-        # Ray casting with enhanced quality
+        # Cast every column at once; higher quality casts extra rays per column and averages them
         fov = params['fov'] * pi / 180.0
-        for x in range(width):
-            ray_angle = (state['angle'] - fov/2.0) + (x / float(width)) * fov
-            dist = self.cast_enhanced_ray(state['maze'], 
-                                        state['pos_x'], 
-                                        state['pos_y'],
-                                        ray_angle,
-                                        20.0,
-                                        params['render_quality'])
-            
-            # Enhanced wall rendering
-            wall_height = min(int((height * params['wall_height']) / (dist + 0.0001)), height)
-            wall_top = (height - wall_height) // 2
-            
-            # Get base color
-            color_idx = int((dist / 20.0) * (len(colors) - 1))
-            color_idx = max(0, min(color_idx, len(colors) - 1))
-            base_color = colors[color_idx]
-            
-            # Apply lighting effects
-            final_color = self.apply_lighting(base_color, 
-                                           params['lighting_mode'],
-                                           frame,
-                                           dist)
-            
-            # Draw wall with pattern
-            self.apply_wall_pattern(img,
-                                  x,
-                                  wall_top,
-                                  wall_height,
-                                  final_color,
-                                  params['wall_pattern'],
-                                  frame)
-            
-            # Enhanced ceiling and floor
-            ceiling_color = (20, 20, 20)
-            floor_color = (40, 40, 40)
-            cv2.line(img, (x, 0), (x, wall_top), ceiling_color, 1)
-            cv2.line(img, (x, wall_top + wall_height), (x, height), floor_color, 1)
+        samples = QUALITY_SAMPLES[params['render_quality']]
+        dist = cast_columns(state['maze'], state['pos_x'], state['pos_y'], state['angle'], fov, width * samples, 20.0)
+        
+        # Enhanced wall rendering
+        wall_height = np.minimum((height * params['wall_height'] / (dist + 0.0001)).astype(np.int64), height)
+        wall_top = (height - wall_height) // 2
+        
+        # Get base color
+        color_idx = np.clip((dist / 20.0 * (len(colors) - 1)).astype(np.int64), 0, len(colors) - 1)
+        base_colors = np.array(colors)[color_idx]
+        
+        # Apply lighting effects
+        final_colors = self.apply_lighting(base_colors, params['lighting_mode'], frame, dist)
+        
+        # Draw walls with pattern, plus enhanced ceiling and floor
+        ceiling_color = (20, 20, 20)
+        floor_color = (40, 40, 40)
+        img = render_columns(height, wall_top, wall_height, final_colors, params['wall_pattern'], frame,
+                             ceiling_color, floor_color, samples=samples)
         
         return img, state
 
     def generate(self, width, height, fps, max_frames, **kwargs):
         """Generate video frames"""
-        frames = []
+        frames = np.empty((max_frames, height, width, 3), dtype=np.uint8)
         state = {
             'maze': None,
             'pos_x': 1.5,
@@ -283,11 +215,10 @@ class VideoMazeV1:
         }
         
         for i in range(max_frames):
-            frame, state = self.render_frame(width, height, i, state, kwargs)
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame_tensor)
+            frames[i], state = self.render_frame(width, height, i, state, kwargs)
         
-        return (torch.stack(frames),)
+        # One conversion for the whole batch instead of one float copy per frame
+        return (torch.from_numpy(frames).float().div_(255.0),)
 
     RETURN_TYPES = ("IMAGE",)
     RETURN_NAMES = ("images",)
@@ -1,9 +1,10 @@
 import numpy as np
-import torch
-import cv2
 import colorsys
 from math import sin, cos, pi, tan
 
+from .utils.maze_raycast import QUALITY_SAMPLES, cast_columns, render_columns
+from .utils.frame_writer import FrameWriter, output_video_path
+
 class VideoMazeV2:
     def __init__(self):
         self.type = "VideoMazeV2"
@@ -114,6 +115,13 @@ class VideoMazeV2:
                     "max": 45.0,
                     "step": 1.0
                 })
+            },
+            "optional": {
+                "stream_to": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "placeholder": "e.g. renders/clip.mp4 (empty = keep frames in memory)"
+                })
             }
         }
 
@@ -146,49 +154,28 @@ class VideoMazeV2:
         }
         return palettes.get(scheme, palettes["neon"])
 
-    def apply_wall_pattern(self, img, x, wall_top, wall_height, color, pattern, frame, thickness):
-        """Apply different wall patterns with customizable thickness"""
-        if pattern == "solid":
-            cv2.line(img, (int(x), int(wall_top)), (int(x), int(wall_top + wall_height)), color, thickness)
-        elif pattern == "gradient":
-            for y in range(wall_top, wall_top + wall_height):
-                blend = (y - wall_top) / wall_height
-                c = tuple(int(c1 + (c2 - c1) * blend) for c1, c2 in zip(color, (255, 255, 255)))
-                cv2.line(img, (int(x), int(y)), (int(x), int(y+1)), c, thickness)
-        elif pattern == "brick":
-            brick_height = 20
-            for y in range(wall_top, wall_top + wall_height, brick_height):
-                offset = (x // brick_height + frame) % 2 * (brick_height // 2)
-                y_pos = y + offset
-                cv2.line(img, (int(x), int(y_pos)), (int(x), int(min(y_pos + brick_height, wall_top + wall_height))), color, thickness)
-        elif pattern == "circuit":
-            circuit_height = 30
-            y_offset = (frame * 2) % circuit_height
-            for y in range(wall_top, wall_top + wall_height, circuit_height):
-                y_pos = y + y_offset
-                cv2.line(img, (int(x), int(y_pos)), (int(x), int(min(y_pos + circuit_height//2, wall_top + wall_height))), color, thickness)
-
     def apply_lighting(self, color, mode, frame, dist, fog_distance):
-        """Apply different lighting effects with fog"""
-        base_color = list(color)
+        """Apply different lighting effects with fog to (N, 3) column colours at distances dist"""
+        base_color = np.asarray(color, dtype=np.float64)
+        dist = np.asarray(dist, dtype=np.float64)[..., None]
         
         # Apply fog effect
-        fog_factor = min(1.0, dist / fog_distance)
-        fog_color = (128, 128, 128)  # Neutral gray fog
-        base_color = [int(c * (1 - fog_factor) + fog_color[i] * fog_factor) for i, c in enumerate(base_color)]
+        fog_factor = np.minimum(1.0, dist / fog_distance)
+        fog_color = np.array([128, 128, 128])  # Neutral gray fog
+        base_color = np.trunc(base_color * (1 - fog_factor) + fog_color * fog_factor)
         
         if mode == "static":
-            return tuple(base_color)
+            return base_color
         elif mode == "dynamic":
-            intensity = max(0.4, min(1.0, 1.0 - dist/20.0))
-            return tuple(int(c * intensity) for c in base_color)
+            intensity = np.clip(1.0 - dist/20.0, 0.4, 1.0)
+            return np.trunc(base_color * intensity)
         elif mode == "pulsing":
             pulse = (sin(frame * 0.1) + 1) * 0.3 + 0.4
-            return tuple(int(c * pulse) for c in base_color)
+            return np.trunc(base_color * pulse)
         elif mode == "ambient":
             ambient = 0.3
-            return tuple(int(c * ambient + (255 - c) * 0.1) for c in base_color)
-        return tuple(base_color)
+            return np.trunc(base_color * ambient + (255 - base_color) * 0.1)
+        return base_color
 
     def generate_enhanced_maze(self, size, seed):
         """Generate deterministic maze using seed"""
@@ -214,33 +201,6 @@ class VideoMazeV2:
         carve_path(1, 1)
         return maze
 
-    def cast_enhanced_ray(self, maze, pos_x, pos_y, angle, max_depth, quality):
-        """Enhanced ray casting with quality settings"""
-        ray_x = cos(angle)
-        ray_y = sin(angle)
-        
-        step_size = {"standard": 1.0, "high": 0.5, "ultra": 0.25}[quality]
-        max_steps = int(max_depth / step_size)
-        
-        dist = 0.0
-        for _ in range(max_steps):
-            check_x = pos_x + ray_x * dist
-            check_y = pos_y + ray_y * dist
-            
-            map_x = int(check_x)
-            map_y = int(check_y)
-            
-            if (map_x < 0 or map_x >= maze.shape[1] or 
-                map_y < 0 or map_y >= maze.shape[0]):
-                break
-                
-            if maze[map_y, map_x] == 1:
-                break
-                
-            dist += step_size
-            
-        return dist
-
     def hex_to_rgb(self, hex_color):
         """Convert hex color string to RGB tuple"""
         hex_color = hex_color.lstrip('#')
@@ -248,8 +208,6 @@ class VideoMazeV2:
 
     def render_frame(self, width, height, frame, state, params):
         """Render a single enhanced frame"""
-        img = np.zeros((height, width, 3), dtype=np.uint8)
-        
         # Initialize or update maze if needed
         if state['maze'] is None or state['maze_size'] != params['maze_size']:
             state['maze'] = self.generate_enhanced_maze(params['maze_size'], params['seed'])
@@ -277,68 +235,51 @@ class VideoMazeV2:
         state['pos_y'] = new_y
         state['angle'] += params['rotation_speed']
         
-        # Ray casting with enhanced quality
+        # Cast every column at once; higher quality casts extra rays per column and averages them
         fov = params['fov'] * pi / 180.0
-        for x in range(width):
-            ray_angle = (state['angle'] - fov/2.0) + (x / float(width)) * fov
-            dist = self.cast_enhanced_ray(state['maze'], 
-                                        state['pos_x'], 
-                                        state['pos_y'],
-                                        ray_angle,
-                                        params['fog_distance'],
-                                        params['render_quality'])
-            
-            # Enhanced wall rendering with camera height and pitch
-            pitch_angle = params['camera_pitch'] * pi / 180.0
-            
-            # Adjust wall height based on distance and pitch
-            wall_height_base = height * params['wall_height']
-            wall_height_adj = wall_height_base / (dist + 0.0001)
-            wall_height = min(int(wall_height_adj * cos(pitch_angle)), height)
-            
-            # Calculate wall position with proper perspective
-            camera_height_offset = height * params['camera_height']
-            pitch_offset = int(height * sin(pitch_angle) * 0.5)  # Pitch affects vertical position
-            perspective_offset = int(wall_height * tan(pitch_angle) * 0.25)  # Perspective correction
-            
-            # Combine all offsets for final wall position
-            wall_center = height // 2 + camera_height_offset
-            wall_top = wall_center - (wall_height // 2) + pitch_offset + perspective_offset
-            
-            # Get base color
-            color_idx = int((dist / params['fog_distance']) * (len(colors) - 1))
-            color_idx = max(0, min(color_idx, len(colors) - 1))
-            base_color = colors[color_idx]
-            
-            # Apply lighting and fog effects
-            final_color = self.apply_lighting(base_color, 
+        samples = QUALITY_SAMPLES[params['render_quality']]
+        dist = cast_columns(state['maze'], state['pos_x'], state['pos_y'], state['angle'], fov,
+                            width * samples, params['fog_distance'])
+        
+        # Enhanced wall rendering with camera height and pitch
+        pitch_angle = params['camera_pitch'] * pi / 180.0
+        
+        # Adjust wall height based on distance and pitch
+        wall_height_base = height * params['wall_height']
+        wall_height_adj = wall_height_base / (dist + 0.0001)
+        wall_height = np.minimum((wall_height_adj * cos(pitch_angle)).astype(np.int64), height)
+        
+        # Calculate wall position with proper perspective
+        camera_height_offset = height * params['camera_height']
+        pitch_offset = int(height * sin(pitch_angle) * 0.5)  # Pitch affects vertical position
+        perspective_offset = np.trunc(wall_height * tan(pitch_angle) * 0.25)  # Perspective correction
+        
+        # Combine all offsets for final wall position
+        wall_center = height // 2 + camera_height_offset
+        wall_top = np.trunc(wall_center - (wall_height // 2) + pitch_offset + perspective_offset).astype(np.int64)
+        
+        # Get base color
+        color_idx = np.clip((dist / params['fog_distance'] * (len(colors) - 1)).astype(np.int64), 0, len(colors) - 1)
+        base_colors = np.array(colors)[color_idx]
+        
+        # Apply lighting and fog effects
+        final_colors = self.apply_lighting(base_colors,
                                            params['lighting_mode'],
                                            frame,
                                            dist,
                                            params['fog_distance'])
-            
-            # Draw wall with pattern and thickness
-            self.apply_wall_pattern(img,
-                                  x,
-                                  wall_top,
-                                  wall_height,
-                                  final_color,
-                                  params['wall_pattern'],
-                                  frame,
-                                  params['wall_thickness'])
-            
-            # Use hex colors for ceiling and floor
-            ceiling_color = self.hex_to_rgb(params['ceiling_color'])
-            floor_color = self.hex_to_rgb(params['floor_color'])
-            
-            cv2.line(img, (int(x), 0), (int(x), int(wall_top)), ceiling_color, params['wall_thickness'])
-            cv2.line(img, (int(x), int(wall_top + wall_height)), (int(x), height), floor_color, params['wall_thickness'])
+        
+        # Draw walls with pattern and thickness, using hex colors for ceiling and floor
+        ceiling_color = self.hex_to_rgb(params['ceiling_color'])
+        floor_color = self.hex_to_rgb(params['floor_color'])
+        img = render_columns(height, wall_top, wall_height, final_colors, params['wall_pattern'], frame,
+                             ceiling_color, floor_color, thickness=params['wall_thickness'], samples=samples)
         
         return img, state
 
-    def generate(self, width, height, fps, max_frames, seed, **kwargs):
+    def generate(self, width, height, fps, max_frames, seed, stream_to="", **kwargs):
         """Generate video frames with seed control"""
-        frames = []
+        output_path = output_video_path(stream_to) if stream_to else None
         state = {
             'maze': None,
             'pos_x': 1.5,
@@ -350,12 +291,13 @@ class VideoMazeV2:
         # Set the seed for reproducibility
         np.random.seed(seed)
         
-        for i in range(max_frames):
-            frame, state = self.render_frame(width, height, i, state, {**kwargs, 'seed': seed})
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame_tensor)
+        # Frames go straight into the preallocated batch, or out to ffmpeg
+        with FrameWriter(max_frames, height, width, fps=fps, output_path=output_path) as writer:
+            for i in range(max_frames):
+                frame, state = self.render_frame(width, height, i, state, {**kwargs, 'seed': seed})
+                writer.write(i, frame)
         
-        return (torch.stack(frames),)
+        return (writer.images,)
 
     RETURN_TYPES = ("IMAGE",)
     RETURN_NAMES = ("images",)
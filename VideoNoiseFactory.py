@@ -7,11 +7,19 @@ import numpy as np
 import torch
 from PIL import Image
 import random
-from opensimplex import OpenSimplex
 import re
 import math
 from typing import Tuple
 
+from .utils.cellular_noise import cellular_noise
+from .utils.process_pool import pool_map
+from .utils.simplex_noise import SimplexNoise
+
+def _render_chunk_worker(task):
+    """Process pool entry point: render one chunk of temporally coherent frames"""
+    frame_start, frame_end, args = task
+    return frame_start, VideoNoiseFactory().render_coherent_chunk(frame_start, frame_end, *args)
+
 class VideoNoiseFactory:
     """A ComfyUI node that generates animated noise patterns with film grain effects"""
     
@@ -72,6 +80,13 @@ class VideoNoiseFactory:
                 # Seeds
                 "noise_seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffff}),
                 "grain_seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffff})
+            },
+            "optional": {
+                # Temporal coherence
+                "temporal_mode": (["independent", "coherent"], {"default": "independent"}),
+                "evolution_speed": ("FLOAT", {"default": 0.05, "min": 0.0, "max": 1.0, "step": 0.01}),
+                "frame_chunk": ("INT", {"default": 4, "min": 1, "max": 64}),
+                "workers": ("INT", {"default": 1, "min": 1, "max": 32})
             }
         }
 
@@ -89,115 +104,135 @@ class VideoNoiseFactory:
         'subtle': "0.08 * normal(0.5, 0.15) * (1 + 0.2 * sin(t/25))"
     }
 
-    def safe_eval(self, expr: str, t: float, rng: np.random.RandomState) -> float:
-        """Safely evaluate a mathematical expression with limited functions."""
+    def safe_eval(self, expr: str, t: np.ndarray, rng: np.random.RandomState) -> np.ndarray:
+        """Safely evaluate a mathematical expression with limited functions.
+
+        ``t`` is an array of frame times and the expression is evaluated once
+        over all of them; ``normal`` and ``uniform`` draw one sample per frame.
+        """
+        t = np.asarray(t, dtype=np.float64)
         safe_dict = {
-            'sin': math.sin,
-            'cos': math.cos,
-            'exp': math.exp,
-            'abs': abs,
-            'pow': pow,
+            'sin': np.sin,
+            'cos': np.cos,
+            'exp': np.exp,
+            'abs': np.abs,
+            'pow': np.power,
             't': t,
             'pi': math.pi,
             'e': math.e,
-            'normal': lambda mu, sigma: rng.normal(mu, sigma),
-            'uniform': lambda a, b: rng.uniform(a, b)
+            'normal': lambda mu, sigma: rng.normal(mu, sigma, t.shape),
+            'uniform': lambda a, b: rng.uniform(a, b, t.shape)
         }
         
         try:
             clean_expr = re.sub(r'[^0-9+\-*/%()., \t\nabcdefghijklmnopqrstuvwxyzπ_]', '', expr)
-            return float(eval(clean_expr, {"__builtins__": {}}, safe_dict))
+            # Expressions that do not depend on t or randomness still give one value per frame
+            return np.broadcast_to(np.asarray(eval(clean_expr, {"__builtins__": {}}, safe_dict), dtype=np.float64), t.shape)
         except Exception as e:
             print(f"Error evaluating expression: {e}")
-            return 0.0
+            return np.zeros(t.shape)
 
-    def apply_turbulence(self, value, nx, ny, turbulence, noise_gen):
+    def sample_noise(self, noise_gen, nx, ny, t=None):
+        """2-D noise for a single frame, or 3-D noise through time when frame times ``t`` are given"""
+        if t is None:
+            return noise_gen.noise2(nx, ny)
+        return noise_gen.noise3(nx, ny, t)
+
+    def apply_turbulence(self, value, nx, ny, turbulence, noise_gen, t=None):
         """Apply turbulence distortion to the noise value"""
         if turbulence <= 0:
             return value
         
-        turb = noise_gen.noise2(nx * 2, ny * 2) * turbulence
+        turb = self.sample_noise(noise_gen, nx * 2, ny * 2, t) * turbulence
         displaced_x = nx + turb
         displaced_y = ny + turb
-        turbulent_value = noise_gen.noise2(displaced_x, displaced_y)
+        turbulent_value = self.sample_noise(noise_gen, displaced_x, displaced_y, t)
         return value * (1 - turbulence) + turbulent_value * turbulence
 
-    def apply_grain_to_frame(
+    def grain_intensities(
         self,
-        image: np.ndarray,
-        frame_number: int,
+        num_frames: int,
         base_intensity: float,
-        grain_scale: float,
         time_scale: float,
         rng: np.random.RandomState,
         grain_preset: str,
         expression: str
     ) -> np.ndarray:
-        """Apply film grain to a single frame."""
-        t = frame_number * time_scale
+        """Grain intensity for every frame, from one evaluation of the grain expression."""
+        t = np.arange(num_frames) * time_scale
         
         if grain_preset == 'custom':
-            intensity = base_intensity * self.safe_eval(expression, t, rng)
-        else:
-            preset_expr = self.GRAIN_PRESETS.get(grain_preset, self.GRAIN_PRESETS['subtle'])
-            intensity = base_intensity * self.safe_eval(preset_expr, t, rng)
+            return base_intensity * self.safe_eval(expression, t, rng)
+        preset_expr = self.GRAIN_PRESETS.get(grain_preset, self.GRAIN_PRESETS['subtle'])
+        return base_intensity * self.safe_eval(preset_expr, t, rng)
+
+    def apply_grain_to_frames(
+        self,
+        frames: np.ndarray,
+        intensities: np.ndarray,
+        grain_scale: float,
+        rng: np.random.RandomState
+    ) -> np.ndarray:
+        """Apply film grain to a (F, H, W, 3) chunk of frames with one intensity per frame."""
+        noise = rng.normal(0, grain_scale, frames.shape)
+        grainy_frames = frames + intensities[:, None, None, None] * noise
+        return np.clip(grainy_frames, 0, 1)
 
-        noise = rng.normal(0, grain_scale, image.shape)
-        grainy_image = image + intensity * noise
-        return np.clip(grainy_image, 0, 1)
+    def pixel_grid(self, width, height):
+        """Pixel column and row indices, shaped to broadcast into an (H, W) grid"""
+        return np.arange(width).reshape(1, width), np.arange(height).reshape(height, 1)
 
-    def generate_plasma(self, width, height, scale, octaves, persistence, turbulence, frequency):
-        noise_generators = [OpenSimplex(seed=random.randint(0, 1000000)) for _ in range(3)]
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        result = np.zeros((height, width, 3))
+    def generate_plasma(self, width, height, scale, octaves, persistence, turbulence, frequency, t=None):
+        noise_generators = [SimplexNoise(seed=random.randint(0, 1000000)) for _ in range(3)]
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
         
         time_offset = random.random() * 1000
         plasma_scale = scale * 2.0
         
-        for y in range(height):
-            for x in range(width):
-                nx = x / width * plasma_scale * frequency
-                ny = y / height * plasma_scale * frequency
-                
-                noise1 = noise2 = noise3 = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for o in range(octaves):
-                    phase1 = time_offset + nx * freq
-                    phase2 = time_offset + ny * freq
-                    phase3 = time_offset + (nx + ny) * freq * 0.5
-                    
-                    n1 = self.apply_turbulence(
-                        noise_generators[0].noise2(phase1, ny * freq),
-                        phase1, ny * freq, turbulence, turb_gen
-                    )
-                    n2 = self.apply_turbulence(
-                        noise_generators[1].noise2(nx * freq, phase2),
-                        nx * freq, phase2, turbulence, turb_gen
-                    )
-                    n3 = self.apply_turbulence(
-                        noise_generators[2].noise2(phase3, phase3),
-                        phase3, phase3, turbulence, turb_gen
-                    )
-                    
-                    noise1 += n1 * amplitude
-                    noise2 += n2 * amplitude
-                    noise3 += n3 * amplitude
-                    
-                    amplitude *= persistence
-                    freq *= 2.0
-                
-                r = np.sin(noise1 * np.pi) * 0.5 + 0.5
-                g = np.sin(noise2 * np.pi + 2.0944) * 0.5 + 0.5
-                b = np.sin(noise3 * np.pi + 4.1888) * 0.5 + 0.5
-                
-                interference = np.sin((nx + ny) * 8.0) * 0.1
-                r = np.clip(r + interference, 0, 1)
-                g = np.clip(g + interference, 0, 1)
-                b = np.clip(b + interference, 0, 1)
-                
-                result[y, x] = [r, g, b]
+        x, y = self.pixel_grid(width, height)
+        nx = x / width * plasma_scale * frequency
+        ny = y / height * plasma_scale * frequency
+        
+        noise1 = noise2 = noise3 = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        # Each octave is evaluated over the whole grid at once
+        for o in range(octaves):
+            phase1 = time_offset + nx * freq
+            phase2 = time_offset + ny * freq
+            phase3 = time_offset + (nx + ny) * freq * 0.5
+            
+            n1 = self.apply_turbulence(
+                self.sample_noise(noise_generators[0], phase1, ny * freq, t),
+                phase1, ny * freq, turbulence, turb_gen, t
+            )
+            n2 = self.apply_turbulence(
+                self.sample_noise(noise_generators[1], nx * freq, phase2, t),
+                nx * freq, phase2, turbulence, turb_gen, t
+            )
+            n3 = self.apply_turbulence(
+                self.sample_noise(noise_generators[2], phase3, phase3, t),
+                phase3, phase3, turbulence, turb_gen, t
+            )
+            
+            noise1 += n1 * amplitude
+            noise2 += n2 * amplitude
+            noise3 += n3 * amplitude
+            
+            amplitude *= persistence
+            freq *= 2.0
+        
+        r = np.sin(noise1 * np.pi) * 0.5 + 0.5
+        g = np.sin(noise2 * np.pi + 2.0944) * 0.5 + 0.5
+        b = np.sin(noise3 * np.pi + 4.1888) * 0.5 + 0.5
+        
+        interference = np.sin((nx + ny) * 8.0) * 0.1
+        r = np.clip(r + interference, 0, 1)
+        g = np.clip(g + interference, 0, 1)
+        b = np.clip(b + interference, 0, 1)
+        
+        result = np.stack([r, g, b], axis=-1)
         
         x = np.linspace(0, np.pi * 2, width)
         y = np.linspace(0, np.pi * 2, height)
@@ -208,276 +243,276 @@ class VideoNoiseFactory:
         
         return result
 
-    def generate_rgb_turbulence(self, width, height, scale, octaves, persistence, turbulence, frequency):
-        result = np.zeros((height, width, 3))
-        noise_generators = [OpenSimplex(seed=random.randint(0, 1000000)) for _ in range(6)]
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        
-        for y in range(height):
-            for x in range(width):
-                for c in range(3):
-                    value = 0
-                    amplitude = 1.0
-                    freq = 1.0
-                    
-                    for o in range(octaves):
-                        nx = x / width * scale * freq * frequency
-                        ny = y / height * scale * freq * frequency
-                        
-                        base_noise = (noise_generators[c*2].noise2(nx, ny) * 
-                                    noise_generators[c*2+1].noise2(ny, nx))
-                        
-                        turbulent_value = self.apply_turbulence(
-                            base_noise, nx, ny, turbulence, turb_gen
-                        )
-                        
-                        value += turbulent_value * amplitude
-                        amplitude *= persistence
-                        freq *= 2
-                    
-                    result[y, x, c] = (value + 1) / 2
+    def generate_rgb_turbulence(self, width, height, scale, octaves, persistence, turbulence, frequency, t=None):
+        channels = []
+        noise_generators = [SimplexNoise(seed=random.randint(0, 1000000)) for _ in range(6)]
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
         
-        return result
-
-    def generate_perlin_rgb(self, width, height, scale, octaves, persistence, turbulence, frequency):
-        noise_r = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_g = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_b = OpenSimplex(seed=random.randint(0, 1000000))
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        
-        result = np.zeros((height, width, 3))
-        
-        for y in range(height):
-            for x in range(width):
-                nx = x / width * scale * frequency
-                ny = y / height * scale * frequency
+        x, y = self.pixel_grid(width, height)
+        for c in range(3):
+            value = 0
+            amplitude = 1.0
+            freq = 1.0
+            
+            for o in range(octaves):
+                nx = x / width * scale * freq * frequency
+                ny = y / height * scale * freq * frequency
                 
-                r = g = b = 0
-                amplitude = 1.0
-                freq = 1.0
+                base_noise = (self.sample_noise(noise_generators[c*2], nx, ny, t) * 
+                            self.sample_noise(noise_generators[c*2+1], ny, nx, t))
                 
-                for _ in range(octaves):
-                    r_val = self.apply_turbulence(
-                        noise_r.noise2(nx * freq, ny * freq),
-                        nx * freq, ny * freq, turbulence, turb_gen
-                    )
-                    g_val = self.apply_turbulence(
-                        noise_g.noise2(nx * freq, ny * freq),
-                        nx * freq, ny * freq, turbulence, turb_gen
-                    )
-                    b_val = self.apply_turbulence(
-                        noise_b.noise2(nx * freq, ny * freq),
-                        nx * freq, ny * freq, turbulence, turb_gen
-                    )
-                    
-                    r += r_val * amplitude
-                    g += g_val * amplitude
-                    b += b_val * amplitude
-                    
-                    amplitude *= persistence
-                    freq *= 2
+                turbulent_value = self.apply_turbulence(
+                    base_noise, nx, ny, turbulence, turb_gen, t
+                )
                 
-                result[y, x] = [(r + 1) / 2, (g + 1) / 2, (b + 1) / 2]
+                value += turbulent_value * amplitude
+                amplitude *= persistence
+                freq *= 2
+            
+            channels.append((value + 1) / 2)
         
-        return result
+        return np.stack(channels, axis=-1)
+
+    def generate_perlin_rgb(self, width, height, scale, octaves, persistence, turbulence, frequency, t=None):
+        noise_r = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_g = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_b = SimplexNoise(seed=random.randint(0, 1000000))
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
+        
+        x, y = self.pixel_grid(width, height)
+        nx = x / width * scale * frequency
+        ny = y / height * scale * frequency
+        
+        r = g = b = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        for _ in range(octaves):
+            r_val = self.apply_turbulence(
+                self.sample_noise(noise_r, nx * freq, ny * freq, t),
+                nx * freq, ny * freq, turbulence, turb_gen, t
+            )
+            g_val = self.apply_turbulence(
+                self.sample_noise(noise_g, nx * freq, ny * freq, t),
+                nx * freq, ny * freq, turbulence, turb_gen, t
+            )
+            b_val = self.apply_turbulence(
+                self.sample_noise(noise_b, nx * freq, ny * freq, t),
+                nx * freq, ny * freq, turbulence, turb_gen, t
+            )
+            
+            r += r_val * amplitude
+            g += g_val * amplitude
+            b += b_val * amplitude
+            
+            amplitude *= persistence
+            freq *= 2
+        
+        return np.stack([(r + 1) / 2, (g + 1) / 2, (b + 1) / 2], axis=-1)
 
-    def generate_hsv_noise(self, width, height, scale, octaves, persistence, turbulence, frequency, saturation):
-        noise_h = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_s = OpenSimplex(seed=random.randint(0, 1000000))
-        noise_v = OpenSimplex(seed=random.randint(0, 1000000))
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
+    def generate_hsv_noise(self, width, height, scale, octaves, persistence, turbulence, frequency, saturation, t=None):
+        noise_h = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_s = SimplexNoise(seed=random.randint(0, 1000000))
+        noise_v = SimplexNoise(seed=random.randint(0, 1000000))
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
         
         def hsv_to_rgb(h, s, v):
             h = h % 1.0
             c = v * s
             x = c * (1 - abs((h * 6) % 2 - 1))
             m = v - c
+            zero = np.zeros_like(h)
             
-            if h < 1/6:
-                r, g, b = c, x, 0
-            elif h < 2/6:
-                r, g, b = x, c, 0
-            elif h < 3/6:
-                r, g, b = 0, c, x
-            elif h < 4/6:
-                r, g, b = 0, x, c
-            elif h < 5/6:
-                r, g, b = x, 0, c
-            else:
-                r, g, b = c, 0, x
+            sectors = [h < 1/6, h < 2/6, h < 3/6, h < 4/6, h < 5/6]
+            r = np.select(sectors, [c, x, zero, zero, x], c)
+            g = np.select(sectors, [x, c, c, x, zero], zero)
+            b = np.select(sectors, [zero, zero, x, c, c], x)
                 
-            return r + m, g + m, b + m
+            return np.stack([r + m, g + m, b + m], axis=-1)
         
-        result = np.zeros((height, width, 3))
+        x, y = self.pixel_grid(width, height)
+        nx = x / width * scale * frequency
+        ny = y / height * scale * frequency
         
-        for y in range(height):
-            for x in range(width):
-                nx = x / width * scale * frequency
-                ny = y / height * scale * frequency
-                
-                h = v = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for _ in range(octaves):
-                    h_val = self.apply_turbulence(
-                        noise_h.noise2(nx * freq, ny * freq),
-                        nx * freq, ny * freq, turbulence, turb_gen
-                    )
-                    v_val = self.apply_turbulence(
-                        noise_v.noise2(nx * freq, ny * freq),
-                        nx * freq, ny * freq, turbulence, turb_gen
-                    )
-                    
-                    h += h_val * amplitude
-                    v += v_val * amplitude
-                    amplitude *= persistence
-                    freq *= 2
-                
-                h = (h + 1) / 2
-                v = ((v + 1) / 2) * 0.8 + 0.2
-                
-                result[y, x] = hsv_to_rgb(h, saturation, v)
+        h = v = 0
+        amplitude = 1.0
+        freq = 1.0
         
-        return result
+        for _ in range(octaves):
+            h_val = self.apply_turbulence(
+                self.sample_noise(noise_h, nx * freq, ny * freq, t),
+                nx * freq, ny * freq, turbulence, turb_gen, t
+            )
+            v_val = self.apply_turbulence(
+                self.sample_noise(noise_v, nx * freq, ny * freq, t),
+                nx * freq, ny * freq, turbulence, turb_gen, t
+            )
+            
+            h += h_val * amplitude
+            v += v_val * amplitude
+            amplitude *= persistence
+            freq *= 2
+        
+        h = (h + 1) / 2
+        v = ((v + 1) / 2) * 0.8 + 0.2
+        
+        return hsv_to_rgb(h, saturation, v)
 
-    def generate_prismatic(self, width, height, scale, octaves, persistence, turbulence, frequency):
-        base_noise = OpenSimplex(seed=random.randint(0, 1000000))
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        result = np.zeros((height, width, 3))
-        
-        for y in range(height):
-            for x in range(width):
-                value = 0
-                amplitude = 1.0
-                freq = 1.0
-                
-                for o in range(octaves):
-                    nx = x / width * scale * freq * frequency
-                    ny = y / height * scale * freq * frequency
-                    
-                    noise_val = self.apply_turbulence(
-                        base_noise.noise2(nx, ny),
-                        nx, ny, turbulence, turb_gen
-                    )
-                    value += noise_val * amplitude
-                    amplitude *= persistence
-                    freq *= 2
-                
-                hue = (value + 1) / 2
-                h = hue * 6
-                if h < 1:
-                    result[y, x] = [1, h, 0]
-                elif h < 2:
-                    result[y, x] = [2-h, 1, 0]
-                elif h < 3:
-                    result[y, x] = [0, 1, h-2]
-                elif h < 4:
-                    result[y, x] = [0, 4-h, 1]
-                elif h < 5:
-                    result[y, x] = [h-4, 0, 1]
-                else:
-                    result[y, x] = [1, 0, 6-h]
-        return result
+    def generate_prismatic(self, width, height, scale, octaves, persistence, turbulence, frequency, t=None):
+        base_noise = SimplexNoise(seed=random.randint(0, 1000000))
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
+        
+        x, y = self.pixel_grid(width, height)
+        value = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        for o in range(octaves):
+            nx = x / width * scale * freq * frequency
+            ny = y / height * scale * freq * frequency
+            
+            noise_val = self.apply_turbulence(
+                self.sample_noise(base_noise, nx, ny, t),
+                nx, ny, turbulence, turb_gen, t
+            )
+            value += noise_val * amplitude
+            amplitude *= persistence
+            freq *= 2
+        
+        hue = (value + 1) / 2
+        h = hue * 6
+        ones = np.ones_like(h)
+        zeros = np.zeros_like(h)
+        sectors = [h < 1, h < 2, h < 3, h < 4, h < 5]
+        r = np.select(sectors, [ones, 2-h, zeros, zeros, h-4], ones)
+        g = np.select(sectors, [h, ones, ones, 4-h, zeros], zeros)
+        b = np.select(sectors, [zeros, zeros, h-2, ones, ones], 6-h)
+        return np.stack([r, g, b], axis=-1)
 
-    def generate_polychromatic_cellular(self, width, height, scale, octaves, persistence, turbulence):
-        result = np.zeros((height, width, 3))
-        num_points = 20 * scale
-        points = np.random.rand(int(num_points), 2)
-        colors = np.random.rand(int(num_points), 3)
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        
-        for y in range(height):
-            for x in range(width):
-                px = x / width
-                py = y / height
-                
-                # Apply turbulence to sampling position
-                if turbulence > 0:
-                    turb_x = self.apply_turbulence(px, px * 2, py * 2, turbulence, turb_gen)
-                    turb_y = self.apply_turbulence(py, px * 2, py * 2, turbulence, turb_gen)
-                    px = turb_x
-                    py = turb_y
-                
-                distances = np.sqrt(((points - [px, py]) ** 2).sum(axis=1))
-                closest_idx = np.argpartition(distances, 2)[:2]
-                d1, d2 = distances[closest_idx]
-                t = d1 / (d1 + d2)
-                result[y, x] = colors[closest_idx[0]] * (1-t) + colors[closest_idx[1]] * t
-        return result
+    def generate_polychromatic_cellular(self, width, height, scale, octaves, persistence, turbulence, t=None):
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
+        
+        x, y = self.pixel_grid(width, height)
+        px = x / width
+        py = y / height
+        
+        # Apply turbulence to sampling positions over the whole grid (and every frame time)
+        if turbulence > 0:
+            px, py = (self.apply_turbulence(px, px * 2, py * 2, turbulence, turb_gen, t),
+                      self.apply_turbulence(py, px * 2, py * 2, turbulence, turb_gen, t))
+        
+        # Feature points are cached per seed, so only the displaced lookups are repeated per chunk
+        return cellular_noise(px, py, random.randint(0, 1000000), scale, octaves, persistence)
 
-    def generate_rainbow_fractal(self, width, height, scale, octaves, persistence, turbulence, frequency):
-        result = np.zeros((height, width, 3))
-        noise_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        
-        for y in range(height):
-            for x in range(width):
-                value = 0
-                amplitude = 1.0
-                freq = 1.0
+    def generate_rainbow_fractal(self, width, height, scale, octaves, persistence, turbulence, frequency, t=None):
+        noise_gen = SimplexNoise(seed=random.randint(0, 1000000))
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
+        
+        x, y = self.pixel_grid(width, height)
+        value = 0
+        amplitude = 1.0
+        freq = 1.0
+        
+        for o in range(octaves):
+            nx = x / width * scale * freq * frequency
+            ny = y / height * scale * freq * frequency
+            
+            noise_val = self.apply_turbulence(
+                self.sample_noise(noise_gen, nx, ny, t),
+                nx, ny, turbulence, turb_gen, t
+            )
+            value += noise_val * amplitude
+            amplitude *= persistence
+            freq *= 2.5
+        
+        angle = np.arctan2(value, amplitude) + np.pi
+        hue = (angle / (2 * np.pi) + value) % 1.0
+        
+        h = hue * 6
+        x_val = 1 - abs(h % 2 - 1)
+        ones = np.ones_like(h)
+        zeros = np.zeros_like(h)
+        sectors = [h < 1, h < 2, h < 3, h < 4, h < 5]
+        r = np.select(sectors, [ones, x_val, zeros, zeros, x_val], ones)
+        g = np.select(sectors, [x_val, ones, ones, x_val, zeros], zeros)
+        b = np.select(sectors, [zeros, zeros, x_val, ones, ones], x_val)
+        return np.stack([r, g, b], axis=-1)
+
+    def generate_color_wavelet(self, width, height, scale, octaves, persistence, turbulence, frequency, t=None):
+        channels = []
+        noise_gens = [SimplexNoise(seed=random.randint(0, 1000000)) for _ in range(3)]
+        turb_gen = SimplexNoise(seed=random.randint(0, 1000000))
+        
+        x, y = self.pixel_grid(width, height)
+        for c in range(3):
+            value = 0
+            amplitude = 1.0
+            freq = 1.0
+            phase = c * 2 * np.pi / 3
+            
+            for o in range(octaves):
+                nx = x / width * scale * freq * frequency
+                ny = y / height * scale * freq * frequency
                 
-                for o in range(octaves):
-                    nx = x / width * scale * freq * frequency
-                    ny = y / height * scale * freq * frequency
-                    
-                    noise_val = self.apply_turbulence(
-                        noise_gen.noise2(nx, ny),
-                        nx, ny, turbulence, turb_gen
-                    )
-                    value += noise_val * amplitude
-                    amplitude *= persistence
-                    freq *= 2.5
+                base_value = (self.sample_noise(noise_gens[c], nx, ny, t) * 
+                            np.sin(freq * phase + nx * 2 * np.pi))
                 
-                angle = np.arctan2(value, amplitude) + np.pi
-                hue = (angle / (2 * np.pi) + value) % 1.0
+                turbulent_value = self.apply_turbulence(
+                    base_value, nx, ny, turbulence, turb_gen, t
+                )
                 
-                h = hue * 6
-                x_val = 1 - abs(h % 2 - 1)
-                if h < 1:
-                    result[y, x] = [1, x_val, 0]
-                elif h < 2:
-                    result[y, x] = [x_val, 1, 0]
-                elif h < 3:
-                    result[y, x] = [0, 1, x_val]
-                elif h < 4:
-                    result[y, x] = [0, x_val, 1]
-                elif h < 5:
-                    result[y, x] = [x_val, 0, 1]
-                else:
-                    result[y, x] = [1, 0, x_val]
-        return result
+                value += turbulent_value * amplitude
+                amplitude *= persistence
+                freq *= 2
+            
+            channels.append((value + 1) / 2)
+        return np.stack(channels, axis=-1)
 
-    def generate_color_wavelet(self, width, height, scale, octaves, persistence, turbulence, frequency):
-        result = np.zeros((height, width, 3))
-        noise_gens = [OpenSimplex(seed=random.randint(0, 1000000)) for _ in range(3)]
-        turb_gen = OpenSimplex(seed=random.randint(0, 1000000))
-        
-        for y in range(height):
-            for x in range(width):
-                for c in range(3):
-                    value = 0
-                    amplitude = 1.0
-                    freq = 1.0
-                    phase = c * 2 * np.pi / 3
-                    
-                    for o in range(octaves):
-                        nx = x / width * scale * freq * frequency
-                        ny = y / height * scale * freq * frequency
-                        
-                        base_value = (noise_gens[c].noise2(nx, ny) * 
-                                    np.sin(freq * phase + nx * 2 * np.pi))
-                        
-                        turbulent_value = self.apply_turbulence(
-                            base_value, nx, ny, turbulence, turb_gen
-                        )
-                        
-                        value += turbulent_value * amplitude
-                        amplitude *= persistence
-                        freq *= 2
-                    
-                    result[y, x, c] = (value + 1) / 2
-        return result
+    def generate_frames(self, noise_type, width, height, scale, octaves, persistence, turbulence, frequency, saturation, t=None):
+        """Render one noise frame, or one frame per entry of ``t`` (shape (F, 1, 1)) as (F, H, W, 3)"""
+        if noise_type == "Plasma":
+            return self.generate_plasma(width, height, scale, octaves, persistence, turbulence, frequency, t)
+        elif noise_type == "RGB Turbulence":
+            return self.generate_rgb_turbulence(width, height, scale, octaves, persistence, turbulence, frequency, t)
+        elif noise_type == "Prismatic":
+            return self.generate_prismatic(width, height, scale, octaves, persistence, turbulence, frequency, t)
+        elif noise_type == "HSV Noise":
+            return self.generate_hsv_noise(width, height, scale, octaves, persistence, turbulence, frequency, saturation, t)
+        elif noise_type == "Perlin RGB":
+            return self.generate_perlin_rgb(width, height, scale, octaves, persistence, turbulence, frequency, t)
+        elif noise_type == "Polychromatic Cellular":
+            return self.generate_polychromatic_cellular(width, height, scale, octaves, persistence, turbulence, t)
+        elif noise_type == "Rainbow Fractal":
+            return self.generate_rainbow_fractal(width, height, scale, octaves, persistence, turbulence, frequency, t)
+        elif noise_type == "Color Wavelet":
+            return self.generate_color_wavelet(width, height, scale, octaves, persistence, turbulence, frequency, t)
+        else:
+            return self.generate_plasma(width, height, scale, octaves, persistence, turbulence, frequency, t)
+
+    def render_coherent_chunk(self, frame_start, frame_end, noise_type, width, height, scale, octaves, persistence,
+                              turbulence, frequency, saturation, noise_seed, evolution_speed):
+        """Render frames [frame_start, frame_end) by sampling 3-D noise at each frame's time"""
+        # Every chunk draws the same generator seeds, so chunks join seamlessly in any order
+        random.seed(noise_seed)
+        t = (np.arange(frame_start, frame_end) * evolution_speed).reshape(-1, 1, 1)
+        frames = self.generate_frames(noise_type, width, height, scale, octaves, persistence, turbulence, frequency,
+                                      saturation, t)
+        # Patterns that do not vary with t come back as a single frame
+        return np.broadcast_to(frames, (frame_end - frame_start, height, width, 3))
+
+    def iter_noise_chunks(self, chunks, temporal_mode, workers, noise_seed, evolution_speed, args):
+        """Yield (frame_start, frames) for each (frame_start, frame_end) chunk in order"""
+        if temporal_mode == "coherent":
+            tasks = [(frame_start, frame_end, args + (noise_seed, evolution_speed)) for frame_start, frame_end in chunks]
+            # Chunks render in this process when there is one worker, or when worker processes cannot start
+            yield from pool_map(_render_chunk_worker, tasks, workers)
+        else:
+            # Independent frames draw fresh generator seeds from one sequence, so they render in order
+            random.seed(noise_seed)
+            for frame_start, frame_end in chunks:
+                yield frame_start, np.stack([
+                    self.generate_frames(*args) for _ in range(frame_start, frame_end)
+                ])
 
     def generate_video_noise(
         self,
@@ -500,54 +535,43 @@ class VideoNoiseFactory:
         green_balance: float,
         blue_balance: float,
         noise_seed: int,
-        grain_seed: int
+        grain_seed: int,
+        temporal_mode: str = "independent",
+        evolution_speed: float = 0.05,
+        frame_chunk: int = 4,
+        workers: int = 1
     ) -> Tuple[torch.Tensor]:
         """Generate animated noise with film grain effects."""
         
         # Initialize random generators
-        noise_rng = np.random.RandomState(noise_seed)
         grain_rng = np.random.RandomState(grain_seed)
-        random.seed(noise_seed)  # For OpenSimplex noise
-        
-        # Prepare batch of frames
-        batch = np.zeros((num_frames, height, width, 3), dtype=np.float32)
-        
-        # Generate base noise frames
-        for frame in range(num_frames):
-            # Generate noise frame
-            if noise_type == "Plasma":
-                noise = self.generate_plasma(width, height, noise_scale, octaves, persistence, turbulence, frequency)
-            elif noise_type == "RGB Turbulence":
-                noise = self.generate_rgb_turbulence(width, height, noise_scale, octaves, persistence, turbulence, frequency)
-            elif noise_type == "Prismatic":
-                noise = self.generate_prismatic(width, height, noise_scale, octaves, persistence, turbulence, frequency)
-            elif noise_type == "HSV Noise":
-                noise = self.generate_hsv_noise(width, height, noise_scale, octaves, persistence, turbulence, frequency, saturation)
-            elif noise_type == "Perlin RGB":
-                noise = self.generate_perlin_rgb(width, height, noise_scale, octaves, persistence, turbulence, frequency)
-            elif noise_type == "Polychromatic Cellular":
-                noise = self.generate_polychromatic_cellular(width, height, noise_scale, octaves, persistence, turbulence)
-            elif noise_type == "Rainbow Fractal":
-                noise = self.generate_rainbow_fractal(width, height, noise_scale, octaves, persistence, turbulence, frequency)
-            elif noise_type == "Color Wavelet":
-                noise = self.generate_color_wavelet(width, height, noise_scale, octaves, persistence, turbulence, frequency)
-            else:
-                noise = self.generate_plasma(width, height, noise_scale, octaves, persistence, turbulence, frequency)
+        
+        # Frames are rendered chunk by chunk straight into the output batch
+        batch = np.empty((num_frames, height, width, 3), dtype=np.float32)
+        balance = np.array([red_balance, green_balance, blue_balance])
+        
+        # The grain expression is evaluated once for all frame times
+        intensities = self.grain_intensities(
+            num_frames, base_intensity, time_scale, grain_rng, grain_preset, grain_expression
+        )
+        
+        chunks = [
+            (frame_start, min(frame_start + frame_chunk, num_frames))
+            for frame_start in range(0, num_frames, frame_chunk)
+        ]
+        args = (noise_type, width, height, noise_scale, octaves, persistence, turbulence, frequency, saturation)
+        
+        for frame_start, noise in self.iter_noise_chunks(chunks, temporal_mode, workers, noise_seed, evolution_speed, args):
+            frame_end = frame_start + len(noise)
             
             # Apply color balance
-            noise[:,:,0] *= red_balance
-            noise[:,:,1] *= green_balance
-            noise[:,:,2] *= blue_balance
+            noise = noise * balance
             
             # Apply film grain
-            noise = self.apply_grain_to_frame(
-                noise, frame,
-                base_intensity, grain_scale,
-                time_scale, grain_rng,
-                grain_preset, grain_expression
+            batch[frame_start:frame_end] = self.apply_grain_to_frames(
+                noise, intensities[frame_start:frame_end], grain_scale, grain_rng
             )
-            
-            batch[frame] = noise
+            print(f"Rendered noise frames {frame_start + 1}-{frame_end}/{num_frames}")
 
         # Convert to tensor
         return (torch.from_numpy(batch),)
@@ -1,8 +1,7 @@
 import numpy as np
-import torch
-import cv2
-from math import sin, cos, pi
 import colorsys
+from .utils.frame_writer import FrameWriter, output_video_path
+from .utils.mesh_render import FRAME_BLOCK, draw_points, draw_solid, draw_wireframe, instance_grid, mesh_frames
 
 class VideoPyramidV1:
     def __init__(self):
@@ -82,6 +81,25 @@ class VideoPyramidV1:
                 "color_scheme": (["rainbow", "monochrome", "neon", "pastel", "cyberpunk"],),
                 "render_style": (["wireframe", "solid", "points"],),
                 "lighting_mode": (["basic", "ambient", "dynamic", "none"],)
+            },
+            "optional": {
+                "instances": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 64,
+                    "step": 1
+                }),
+                "instance_spacing": ("FLOAT", {
+                    "default": 1.5,
+                    "min": 1.0,
+                    "max": 5.0,
+                    "step": 0.1
+                }),
+                "stream_to": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "placeholder": "e.g. renders/clip.mp4 (empty = keep frames in memory)"
+                })
             }
         }
 
@@ -130,156 +148,60 @@ class VideoPyramidV1:
             [0, 1, 2, 3]  # Base
         ]
 
-    def rotate_points(self, points, angles):
-        """Apply 3D rotation to points"""
-        rx, ry, rz = angles
-        
-        # Rotation matrices
-        Rx = np.array([
-            [1, 0, 0],
-            [0, cos(rx), -sin(rx)],
-            [0, sin(rx), cos(rx)]
-        ])
-        
-        Ry = np.array([
-            [cos(ry), 0, sin(ry)],
-            [0, 1, 0],
-            [-sin(ry), 0, cos(ry)]
-        ])
-        
-        Rz = np.array([
-            [cos(rz), -sin(rz), 0],
-            [sin(rz), cos(rz), 0],
-            [0, 0, 1]
-        ])
-        
-        # Apply rotations
-        points = points @ Rx @ Ry @ Rz
-        return points
-
-    def project_points(self, points, width, height, fov, distance):
-        """Project 3D points to 2D screen space"""
-        f = 1.0 / np.tan(fov * pi / 360)
-        
-        # Move points away from camera
-        points = points + [0, 0, distance]
-        
-        # Perspective projection
-        projected = np.zeros((len(points), 2))
-        for i, (x, y, z) in enumerate(points):
-            if z != 0:
-                projected[i] = [x * f / z, y * f / z]
-        
-        # Scale to screen space
-        projected *= min(width, height) / 2
-        projected += [width/2, height/2]
-        
-        return projected
+    def create_pyramid_edges(self):
+        """Define pyramid edges for wireframe rendering"""
+        return [(0,1), (1,2), (2,3), (3,0),
+                (0,4), (1,4), (2,4), (3,4)]
 
-    def apply_lighting(self, color, mode, normal, light_dir):
-        """Apply lighting effects to faces"""
-        if mode == "none":
-            return color
-        
-        # Calculate basic diffuse lighting
-        intensity = max(0.2, min(1.0, np.dot(normal, light_dir) * 0.7 + 0.3))
-        
-        if mode == "basic":
-            return tuple(int(c * intensity) for c in color)
-        elif mode == "ambient":
-            ambient = 0.3
-            return tuple(int(c * (ambient + intensity * 0.7)) for c in color)
-        elif mode == "dynamic":
-            specular = pow(max(0, np.dot(normal, light_dir)), 8) * 0.3
-            return tuple(min(255, int(c * intensity + specular * 255)) for c in color)
-        
-        return color
+    def build_frames(self, width, height, frames, params):
+        """Project, light and depth-sort every pyramid in every one of ``frames`` at once"""
+        size = params['pyramid_size']
+        # Only the triangular sides are filled; the base stays open
+        faces = np.array([face for face in self.create_pyramid_faces() if len(face) == 3])
+        angles = np.asarray(frames, dtype=np.float64)[:, None] * [
+            params['rotation_x'], params['rotation_y'], params['rotation_z']
+        ]
+        # Instances sit on a grid, spaced in pyramid widths
+        offsets = instance_grid(params.get('instances', 1), params.get('instance_spacing', 1.5) * 2 * size)
+        return mesh_frames(
+            self.create_pyramid_vertices(size), faces, angles, offsets,
+            width, height, params['fov'], params['distance'],
+            self.get_color_palette(params['color_scheme']), params['lighting_mode']
+        )
 
-    def render_frame(self, width, height, frame, params):
-        """Render a single frame of the pyramid animation"""
+    def draw_frame(self, width, height, scene, index, params):
+        """Draw frame ``index`` of a scene from build_frames"""
         img = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        # Create pyramid vertices
-        vertices = self.create_pyramid_vertices(params['pyramid_size'])
-        faces = self.create_pyramid_faces()
         colors = self.get_color_palette(params['color_scheme'])
         
-        # Calculate rotation angles for this frame
-        angles = [
-            frame * params['rotation_x'],
-            frame * params['rotation_y'],
-            frame * params['rotation_z']
-        ]
-        
-        # Rotate vertices
-        rotated = self.rotate_points(vertices, angles)
-        
-        # Project to 2D
-        projected = self.project_points(
-            rotated, width, height, 
-            params['fov'], params['distance']
-        )
-        
-        # Define light direction (pointing slightly down and to the right)
-        light_dir = np.array([0.5, -0.5, -1.0])
-        light_dir = light_dir / np.linalg.norm(light_dir)
-        
         if params['render_style'] == 'wireframe':
-            # Draw edges
-            edges = [(0,1), (1,2), (2,3), (3,0),
-                    (0,4), (1,4), (2,4), (3,4)]
-            
-            for edge in edges:
-                pt1 = tuple(map(int, projected[edge[0]]))
-                pt2 = tuple(map(int, projected[edge[1]]))
-                cv2.line(img, pt1, pt2, colors[0], 2)
-        
+            draw_wireframe(img, scene['points'][index], self.create_pyramid_edges(), colors[0], 2)
         elif params['render_style'] == 'solid':
-            # Calculate face depths for sorting
-            face_depths = []
-            for i, face in enumerate(faces):
-                if len(face) == 3:
-                    z_depth = np.mean(rotated[face][:, 2])
-                    face_depths.append((z_depth, i))
-            
-            # Sort faces by depth (painter's algorithm)
-            for _, face_idx in sorted(face_depths, reverse=True):
-                face = faces[face_idx]
-                if len(face) == 3:
-                    pts = np.array([projected[i] for i in face], np.int32)
-                    
-                    # Calculate face normal for lighting
-                    v1 = rotated[face[1]] - rotated[face[0]]
-                    v2 = rotated[face[2]] - rotated[face[0]]
-                    normal = np.cross(v1, v2)
-                    normal = normal / np.linalg.norm(normal)
-                    
-                    # Apply lighting to face color
-                    color = self.apply_lighting(
-                        colors[face_idx % len(colors)],
-                        params['lighting_mode'],
-                        normal,
-                        light_dir
-                    )
-                    
-                    cv2.fillPoly(img, [pts], color)
-        
+            # Faces come back to front (painter's algorithm)
+            draw_solid(img, scene['polygons'][index], scene['face_colors'][index])
         else:  # points
-            for i, pt in enumerate(projected):
-                cv2.circle(img, tuple(map(int, pt)), 4, colors[i % len(colors)], -1)
+            draw_points(img, scene['points'][index], colors, 4)
         
         return img
 
-    def generate(self, width, height, fps, max_frames, **kwargs):
+    def render_frame(self, width, height, frame, params):
+        """Render a single frame of the pyramid animation"""
+        return self.draw_frame(width, height, self.build_frames(width, height, [frame], params), 0, params)
+
+    def generate(self, width, height, fps, max_frames, stream_to="", **kwargs):
         """Generate video frames"""
-        frames = []
-        
-        for i in range(max_frames):
-            frame = self.render_frame(width, height, i, kwargs)
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame_tensor)
-        
-        return (torch.stack(frames),)
+        output_path = output_video_path(stream_to) if stream_to else None
+        
+        # Frames go straight into the preallocated batch, or out to ffmpeg
+        with FrameWriter(max_frames, height, width, fps=fps, output_path=output_path) as writer:
+            # Lay out the geometry of a whole block of frames at once, then only draw per frame
+            for start in range(0, max_frames, FRAME_BLOCK):
+                frames = range(start, min(start + FRAME_BLOCK, max_frames))
+                scene = self.build_frames(width, height, frames, kwargs)
+                for j, i in enumerate(frames):
+                    writer.write(i, self.draw_frame(width, height, scene, j, kwargs))
+        
+        return (writer.images,)
 
     RETURN_TYPES = ("IMAGE",)
     RETURN_NAMES = ("images",)
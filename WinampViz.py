@@ -1,10 +1,38 @@
 import numpy as np
 import torch
 from PIL import Image
-import scipy.fft
 import colorsys
 import json
 import cv2
+from functools import lru_cache
+
+from .utils.particles import ParticleSystem
+from .utils.audio_features import DEFAULT_SAMPLE_RATE, audio_features, extract_audio, frame_features, smooth_features
+
+@lru_cache(maxsize=8)
+def plasma_grid(width, height):
+    """Per-resolution plasma phases: x / 30 per column, y / 20 per row, (x + y) / 40 per value of x + y, and x + y per pixel.
+
+    Phases are single precision, as adding them to the float32 audio features always made them.
+    """
+    x = np.arange(width)
+    y = np.arange(height)
+    diagonal = np.arange(width + height - 1) / 40.0
+    return ((x / 30.0).astype(np.float32), (y / 20.0).astype(np.float32)[:, None],
+            diagonal.astype(np.float32), (x[None, :] + y[:, None]).astype(np.int32))
+
+def hsv_to_rgb(h, s, v):
+    """Vectorized colorsys.hsv_to_rgb for an array of hues, returning an (N, 3) float array"""
+    i = (h * 6.0).astype(np.int64)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    v = np.full_like(f, v)
+    p = np.full_like(f, p)
+    sectors = [(v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q)]
+    i %= 6
+    return np.stack([np.choose(i, [sector[c] for sector in sectors]) for c in range(3)], axis=-1)
 
 class WinampViz:
     def __init__(self):
@@ -18,7 +46,7 @@ class WinampViz:
         self.description = "Generates Winamp-style visualizations from audio input"
         self.default_preset = None
         self.current_frame = 0
-        self.particle_systems = []
+        self.particle_systems = self.new_particle_pool()
         self.color_offset = 0.0
         
     @classmethod
@@ -117,71 +145,12 @@ class WinampViz:
             }
         }
 
-    def process_audio_chunk(self, audio_data, sample_rate):
-        # Handle dictionary input recursively
-        def extract_audio_data(data):
-            if isinstance(data, dict):
-                # Try common keys
-                for key in ['samples', 'audio', 'data', 'tensor', 'array']:
-                    if key in data:
-                        return extract_audio_data(data[key])
-                # If no common keys found, try the first value that's not a dict
-                for value in data.values():
-                    if not isinstance(value, dict):
-                        return extract_audio_data(value)
-            elif isinstance(data, torch.Tensor):
-                return data.numpy()
-            elif isinstance(data, (list, tuple, np.ndarray)):
-                return np.asarray(data, dtype=np.float32)
-            return data
-
-        # Extract and convert audio data
-        audio_data = extract_audio_data(audio_data)
-        if audio_data is None:
-            raise ValueError("Could not extract valid audio data from input")
-            
-        # Ensure we have a 1D numpy array
-        audio_data = np.asarray(audio_data, dtype=np.float32).flatten()
-        
-        # Process a chunk of audio data to extract features
-        chunk_size = int(sample_rate / self.fps)
-        
-        # Pre-process the entire audio data to ensure it's a numpy array
-        if isinstance(audio_data, (list, tuple)):
-            audio_data = np.array(audio_data, dtype=np.float32)
-        
-        # Create chunks using numpy array operations
-        num_chunks = (len(audio_data) + chunk_size - 1) // chunk_size
-        chunks = []
-        for i in range(num_chunks):
-            start = i * chunk_size
-            end = start + chunk_size
-            chunk = audio_data[start:end]
-            if len(chunk) < chunk_size:
-                # Pad last chunk if needed
-                chunk = np.pad(chunk, (0, chunk_size - len(chunk)), mode='constant')
-            chunks.append(chunk)
-        
-        features = []
-        for chunk in chunks:
-                
-            # Compute FFT
-            fft_data = np.abs(scipy.fft.fft(chunk)[:chunk_size//2])
-            
-            # Normalize
-            fft_data = fft_data / np.max(fft_data) if np.max(fft_data) > 0 else fft_data
-            
-            # Extract features
-            feature_dict = {
-                'spectrum': fft_data,
-                'waveform': chunk,
-                'bass': np.mean(fft_data[:int(len(fft_data)*0.1)]),
-                'mids': np.mean(fft_data[int(len(fft_data)*0.1):int(len(fft_data)*0.5)]),
-                'highs': np.mean(fft_data[int(len(fft_data)*0.5):])
-            }
-            features.append(feature_dict)
-            
-        return features
+    def process_audio_chunk(self, audio_data, sample_rate=None, max_frames=0):
+        """Features for every frame as batched arrays (one row per frame)"""
+        samples, input_rate = extract_audio(audio_data)
+        # The AUDIO input's own rate decides how many samples make up a frame
+        sample_rate = sample_rate or input_rate or DEFAULT_SAMPLE_RATE
+        return audio_features(samples, sample_rate, self.fps, max_frames=max_frames)
 
     def get_color_palette(self, scheme):
         palettes = {
@@ -197,27 +166,16 @@ class WinampViz:
         color_palette = self.get_color_palette(color_scheme)
         
         waveform = features['waveform']
-        points = []
-        for x in range(width):
-            sample_idx = int(x * len(waveform) / width)
-            y = int(height/2 + waveform[sample_idx] * height/2)
-            y = max(0, min(y, height-1))  # Clamp y value
-            points.append((x, y))
+        x = np.arange(width)
+        sample_idx = x * len(waveform) // width
+        y = (height/2 + waveform[sample_idx] * height/2).astype(np.int32)
+        y = np.clip(y, 0, height-1)  # Clamp y values
         
-        # Draw the waveform using numpy operations
-        points = np.array(points)
-        for i in range(len(points)-1):
-            color = color_palette[i % len(color_palette)]
-            p1 = tuple(points[i])
-            p2 = tuple(points[i+1])
-            # Draw line using numpy slicing
-            x1, y1 = p1
-            x2, y2 = p2
-            if x1 == x2:  # Vertical line
-                y_start, y_end = sorted([y1, y2])
-                image[y_start:y_end+1, x1] = color
-            else:  # Use cv2.line for non-vertical lines
-                cv2.line(image, p1, p2, color, 2)
+        # Segment i keeps palette colour i, so every colour's segments go out in one polylines call
+        points = np.column_stack((x, y)).astype(np.int32)
+        segments = np.stack((points[:-1], points[1:]), axis=1)
+        for c, color in enumerate(color_palette):
+            cv2.polylines(image, segments[c::len(color_palette)], False, color, 2)
             
         return image
 
@@ -246,47 +204,45 @@ class WinampViz:
             
         return image
 
+    @staticmethod
+    def new_particle_pool():
+        empty = np.zeros(0)
+        return ParticleSystem(x=empty, y=empty, vx=empty, vy=empty,
+                              size=np.zeros(0, dtype=np.float32), life=empty)
+
     def update_particle_system(self, features):
         # Update particle positions and properties based on audio features
-        for particle in self.particle_systems[:]:
-            particle['life'] -= 1.0 / self.fps
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            
-            # Remove dead particles
-            if particle['life'] <= 0:
-                self.particle_systems.remove(particle)
+        particles = self.particle_systems
+        particles.life -= 1.0 / self.fps
+        particles.x += particles.vx
+        particles.y += particles.vy
+        
+        # Remove dead particles
+        particles.cull(particles.life > 0)
                 
         # Add new particles based on audio intensity
         intensity = (features['bass'] + features['mids'] + features['highs']) / 3
         if intensity > 0.1:
-            for _ in range(int(intensity * 10)):
-                angle = np.random.rand() * 2 * np.pi
-                speed = 2 + intensity * 5
-                self.particle_systems.append({
-                    'x': self.width // 2,
-                    'y': self.height // 2,
-                    'vx': np.cos(angle) * speed,
-                    'vy': np.sin(angle) * speed,
-                    'size': 3 + intensity * 10,
-                    'life': 1.0,
-                    'color': self.color_offset
-                })
+            count = int(intensity * 10)
+            angle = np.random.rand(count) * 2 * np.pi
+            speed = 2 + intensity * 5
+            particles.spawn(x=self.width // 2, y=self.height // 2,
+                            vx=np.cos(angle) * speed, vy=np.sin(angle) * speed,
+                            size=3 + intensity * 10, life=1.0)
 
     def render_particle_storm(self, features, width, height, color_scheme):
         image = np.zeros((height, width, 3), dtype=np.uint8)
         self.update_particle_system(features)
+        particles = self.particle_systems
         
-        for particle in self.particle_systems:
-            hue = (self.color_offset + particle['life']) % 1.0
-            rgb = colorsys.hsv_to_rgb(hue, 0.8, 1.0)
-            color = tuple(int(x * 255) for x in rgb)
-            
-            cv2.circle(image,
-                      (int(particle['x']), int(particle['y'])),
-                      int(particle['size'] * particle['life']),
-                      color,
-                      -1)
+        hue = (self.color_offset + particles.life) % 1.0
+        colors = (hsv_to_rgb(hue, 0.8, 1.0) * 255).astype(np.int64).tolist()
+        centers_x = particles.x.astype(np.int64).tolist()
+        centers_y = particles.y.astype(np.int64).tolist()
+        # Sizes are single precision, so the shrinking radius is too
+        radii = (particles.size * particles.life.astype(np.float32)).astype(np.int64).tolist()
+        for cx, cy, radius, color in zip(centers_x, centers_y, radii, colors):
+            cv2.circle(image, (cx, cy), radius, color, -1)
             
         self.color_offset += 0.01
         return image
@@ -296,15 +252,15 @@ class WinampViz:
         color_palette = self.get_color_palette(color_scheme)
         
         # Create plasma effect using sine waves modulated by audio features
-        for y in range(height):
-            for x in range(width):
-                v = np.sin(x/30.0 + features['bass'] * 10)
-                v += np.sin(y/20.0 + features['mids'] * 10)
-                v += np.sin((x+y)/40.0 + features['highs'] * 10)
-                v = (v + 3) / 6.0
-                
-                color_idx = int(v * (len(color_palette)-1))
-                image[y,x] = color_palette[color_idx]
+        x_phase, y_phase, diagonal_phase, diagonal = plasma_grid(width, height)
+        v = np.sin(x_phase + features['bass'] * 10)[None, :]
+        v = v + np.sin(y_phase + features['mids'] * 10)
+        # x + y only takes width + height - 1 values, so the diagonal wave is a lookup
+        v += np.sin(diagonal_phase + features['highs'] * 10)[diagonal]
+        v = (v + 3) / 6.0
+        
+        color_idx = (v * (len(color_palette)-1)).astype(np.int64)
+        image[...] = np.asarray(color_palette, dtype=np.uint8)[color_idx]
                 
         return image
 
@@ -395,21 +351,19 @@ class WinampViz:
         
         # Create tunnel effect modulated by audio
         bass_intensity = features['bass'] * 2
-        for radius in range(0, min(width, height) // 2, 10):
-            # Modulate radius with bass
-            radius_mod = int(radius * (1 + bass_intensity * np.sin(radius * 0.1)))
-            
-            # Calculate color based on radius and audio features
-            color_idx = int((radius / (min(width, height) // 2) + features['mids']) * len(color_palette)) % len(color_palette)
-            color = color_palette[color_idx]
-            
-            # Draw modulated circle
-            thickness = max(1, int(3 + features['highs'] * 5))
-            cv2.circle(image, (center_x, center_y), radius_mod, color, thickness)
-            
-            # Add beat-reactive glow
-            if features['bass'] > 0.6:
-                cv2.GaussianBlur(image, (5, 5), features['bass'] * 3)
+        half = min(width, height) // 2
+        radii = np.arange(0, half, 10)
+        # Modulate radius with bass; strong bass can fold a ring inwards past the centre
+        radius_mod = np.maximum((radii * (1 + bass_intensity * np.sin(radii * 0.1))).astype(np.int64), 0)
+        
+        # Calculate colors based on radius and audio features (single precision, like the features)
+        color_idx = ((radii / half).astype(np.float32) + features['mids']) * len(color_palette)
+        colors = np.asarray(color_palette)[color_idx.astype(np.int64) % len(color_palette)].tolist()
+        
+        # Draw modulated circles
+        thickness = max(1, int(3 + features['highs'] * 5))
+        for radius, color in zip(radius_mod.tolist(), colors):
+            cv2.circle(image, (center_x, center_y), radius, color, thickness)
                 
         return image
 
@@ -419,10 +373,8 @@ class WinampViz:
         self.fps = fps
         
         # Process audio into features
-        audio_features = self.process_audio_chunk(audio, sample_rate=44100)
+        features = self.process_audio_chunk(audio, max_frames=max_frames)
         
-        # Generate frames
-        frames = []
         render_funcs = {
             "oscilloscope": self.render_oscilloscope,
             "spectrum": self.render_spectrum,
@@ -434,31 +386,21 @@ class WinampViz:
             "tunnel_beat": self.render_tunnel_beat
         }
         
-        frame_count = len(audio_features)
-        if max_frames > 0:
-            frame_count = min(frame_count, max_frames)
-            
+        frame_count = len(features['bass'])
         render_func = render_funcs[viz_type]
         
+        # Smooth every feature across frames, then apply sensitivity, all in one pass per array
+        smooth_features(features, smoothing)
+        for key in features:
+            features[key] *= sensitivity
+        
+        frames = np.empty((frame_count, height, width, 3), dtype=np.uint8)
         for i in range(frame_count):
-            # Apply smoothing to features
-            if i > 0:
-                for key in audio_features[i].keys():
-                    audio_features[i][key] = (audio_features[i][key] * (1-smoothing) + 
-                                            audio_features[i-1][key] * smoothing)
-            
-            # Apply sensitivity
-            features = {k: v * sensitivity for k, v in audio_features[i].items()}
-            
-            # Render frame
-            frame = render_func(features, width, height, color_scheme)
-            
-            # Convert to tensor
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame_tensor)
+            # Renderers get this frame's rows of the batched arrays
+            frames[i] = render_func(frame_features(features, i), width, height, color_scheme)
         
         # Stack frames into batch
-        return (torch.stack(frames),)
+        return (torch.from_numpy(frames).float().div_(255.0),)
 
 NODE_CLASS_MAPPINGS = {
     "WinampViz": WinampViz
@@ -1,42 +1,16 @@
-import numpy as np
-import torch
 from PIL import Image
-import scipy.fft
 import colorsys
 import json
 import cv2
 import os
-import glob
 import importlib.util
 import sys
-import types
 
-class VizLoader:
-    @staticmethod
-    def load_viz_file(file_path):
-        """Load a .viz file as a Python module"""
-        try:
-            # Get module name from filename
-            module_name = os.path.splitext(os.path.basename(file_path))[0]
-            
-            # Create module
-            module = types.ModuleType(module_name)
-            
-            # Read the file content
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            # Compile the code
-            code = compile(content, file_path, 'exec')
-            
-            # Execute the code in module's namespace
-            exec(code, module.__dict__)
-            
-            return module
-            
-        except Exception as e:
-            print(f"Error loading visualization {file_path}: {str(e)}")
-            return None
+from .utils.audio_features import DEFAULT_SAMPLE_RATE, audio_features, extract_audio, frame_features, smooth_features
+from .utils.frame_writer import FrameWriter, output_video_path
+from .utils.preset_registry import get_preset_registry
+
+VIZ_DIR = os.path.join(os.path.dirname(__file__), 'VIZ')
 
 class WinampVizV2:
     def __init__(self):
@@ -54,36 +28,18 @@ class WinampVizV2:
         self.load_visualizations()
         
     def load_visualizations(self):
-        """Load all .viz files from the VIZ directory"""
-        viz_dir = os.path.join(os.path.dirname(__file__), 'VIZ')
-        viz_files = glob.glob(os.path.join(viz_dir, '*.viz'))
-        
-        for viz_file in viz_files:
-            try:
-                module = VizLoader.load_viz_file(viz_file)
-                if module is not None and hasattr(module, 'render'):
-                    module_name = os.path.splitext(os.path.basename(viz_file))[0]
-                    self.viz_modules[module_name] = module
+        """Load all .viz files from the VIZ directory, re-executing only new or changed files"""
+        for module_name, module in get_preset_registry(VIZ_DIR, '*.viz').modules().items():
+            if hasattr(module, 'render'):
+                if self.viz_modules.get(module_name) is not module:
                     print(f"Successfully loaded visualization: {module_name}")
-            except Exception as e:
-                print(f"Error loading visualization {viz_file}: {str(e)}")
+                self.viz_modules[module_name] = module
         
     @classmethod
     def INPUT_TYPES(cls):
         """Dynamically get list of available visualizations from VIZ directory"""
-        viz_dir = os.path.join(os.path.dirname(__file__), 'VIZ')
-        viz_files = glob.glob(os.path.join(viz_dir, '*.viz'))
-        viz_names = []
-        
-        # Only include visualizations that can be successfully loaded
-        for viz_file in viz_files:
-            try:
-                module = VizLoader.load_viz_file(viz_file)
-                if module is not None and hasattr(module, 'render'):
-                    name = os.path.splitext(os.path.basename(viz_file))[0]
-                    viz_names.append(name)
-            except Exception:
-                continue
+        # Only include visualizations that define render, read from the source without running it
+        viz_names = get_preset_registry(VIZ_DIR, '*.viz').names(required=('render',))
         
         if not viz_names:
             viz_names = ["none"]
@@ -129,6 +85,13 @@ class WinampVizV2:
                     "max": 0.99,
                     "step": 0.01
                 })
+            },
+            "optional": {
+                "stream_to": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "placeholder": "e.g. renders/clip.mp4 (empty = keep frames in memory)"
+                })
             }
         }
 
@@ -148,76 +111,18 @@ class WinampVizV2:
         }
         return palettes.get(scheme, palettes["classic"])
 
-    def process_audio_chunk(self, audio_data, sample_rate):
-        """Process audio data into features"""
-        # Handle dictionary input recursively
-        def extract_audio_data(data):
-            if isinstance(data, dict):
-                # Try common keys
-                for key in ['samples', 'audio', 'data', 'tensor', 'array']:
-                    if key in data:
-                        return extract_audio_data(data[key])
-                # If no common keys found, try the first value that's not a dict
-                for value in data.values():
-                    if not isinstance(value, dict):
-                        return extract_audio_data(value)
-            elif isinstance(data, torch.Tensor):
-                return data.numpy()
-            elif isinstance(data, (list, tuple, np.ndarray)):
-                return np.asarray(data, dtype=np.float32)
-            return data
-
-        # Extract and convert audio data
-        audio_data = extract_audio_data(audio_data)
-        if audio_data is None:
-            raise ValueError("Could not extract valid audio data from input")
-            
-        # Ensure we have a 1D numpy array
-        audio_data = np.asarray(audio_data, dtype=np.float32).flatten()
-        
-        # Process a chunk of audio data to extract features
-        chunk_size = int(sample_rate / self.fps)
-        
-        # Pre-process the entire audio data to ensure it's a numpy array
-        if isinstance(audio_data, (list, tuple)):
-            audio_data = np.array(audio_data, dtype=np.float32)
-        
-        # Create chunks using numpy array operations
-        num_chunks = (len(audio_data) + chunk_size - 1) // chunk_size
-        chunks = []
-        for i in range(num_chunks):
-            start = i * chunk_size
-            end = start + chunk_size
-            chunk = audio_data[start:end]
-            if len(chunk) < chunk_size:
-                # Pad last chunk if needed
-                chunk = np.pad(chunk, (0, chunk_size - len(chunk)), mode='constant')
-            chunks.append(chunk)
-        
-        features = []
-        for chunk in chunks:
-            # Compute FFT
-            fft_data = np.abs(scipy.fft.fft(chunk)[:chunk_size//2])
-            
-            # Normalize
-            fft_data = fft_data / np.max(fft_data) if np.max(fft_data) > 0 else fft_data
-            
-            # Extract features
-            feature_dict = {
-                'spectrum': fft_data,
-                'waveform': chunk,
-                'bass': np.mean(fft_data[:int(len(fft_data)*0.1)]),
-                'mids': np.mean(fft_data[int(len(fft_data)*0.1):int(len(fft_data)*0.5)]),
-                'highs': np.mean(fft_data[int(len(fft_data)*0.5):])
-            }
-            features.append(feature_dict)
-            
-        return features
+    def process_audio_chunk(self, audio_data, sample_rate=None, max_frames=0):
+        """Process audio data into features, batched with one row per frame"""
+        samples, input_rate = extract_audio(audio_data)
+        # The AUDIO input's own rate decides how many samples make up a frame
+        sample_rate = sample_rate or input_rate or DEFAULT_SAMPLE_RATE
+        return audio_features(samples, sample_rate, self.fps, max_frames=max_frames)
 
-    def generate(self, audio, width, height, fps, max_frames, visualization, color_scheme, sensitivity, smoothing):
+    def generate(self, audio, width, height, fps, max_frames, visualization, color_scheme, sensitivity, smoothing,
+                 stream_to=""):
         self.fps = fps
         
-        # Reload visualizations to ensure we have the latest versions
+        # Pick up new or edited visualizations; unchanged files are not re-executed
         self.load_visualizations()
         
         # Check if visualization exists
@@ -228,49 +133,42 @@ class WinampVizV2:
         viz_module = self.viz_modules[visualization]
         
         # Process audio into features
-        audio_features = self.process_audio_chunk(audio, sample_rate=44100)
+        features = self.process_audio_chunk(audio, max_frames=max_frames)
         
         # Get color palette
         color_palette = self.get_color_palette(color_scheme)
         
-        # Generate frames
-        frames = []
-        frame_count = len(audio_features)
-        if max_frames > 0:
-            frame_count = min(frame_count, max_frames)
+        # Smooth the band levels across frames (raw waveform and spectrum stay as they are)
+        smooth_features(features, smoothing, keys=('bass', 'mids', 'highs'))
+        for key in ['bass', 'mids', 'highs']:
+            features[key] *= sensitivity
         
-        for i in range(frame_count):
-            # Apply smoothing to features
-            if i > 0:
-                for key in audio_features[i].keys():
-                    if key not in ['waveform', 'spectrum']:  # Don't smooth raw data
-                        audio_features[i][key] = (audio_features[i][key] * (1-smoothing) + 
-                                                audio_features[i-1][key] * smoothing)
-            
-            # Apply sensitivity to features
-            features = audio_features[i].copy()
-            for key in ['bass', 'mids', 'highs']:
-                features[key] *= sensitivity
-            
-            # Render frame
-            if visualization in self.viz_states:
-                frame, state = viz_module.render(features, width, height, color_palette, 
-                                               self.viz_states[visualization])
-                self.viz_states[visualization] = state
-            else:
-                result = viz_module.render(features, width, height, color_palette)
-                if isinstance(result, tuple):
-                    frame, state = result
+        # Generate frames
+        frame_count = len(features['bass'])
+        output_path = output_video_path(stream_to) if stream_to else None
+        
+        # Frames go straight into the preallocated batch, or out to ffmpeg
+        with FrameWriter(frame_count, height, width, fps=fps, output_path=output_path) as writer:
+            for i in range(frame_count):
+                # Visualizations get this frame's rows of the batched arrays
+                frame_data = frame_features(features, i)
+                
+                # Render frame
+                if visualization in self.viz_states:
+                    frame, state = viz_module.render(frame_data, width, height, color_palette, 
+                                                   self.viz_states[visualization])
                     self.viz_states[visualization] = state
                 else:
-                    frame = result
-            
-            # Convert to tensor
-            frame_tensor = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame_tensor)
-        
-        # Stack frames into batch
-        return (torch.stack(frames),)
+                    result = viz_module.render(frame_data, width, height, color_palette)
+                    if isinstance(result, tuple):
+                        frame, state = result
+                        self.viz_states[visualization] = state
+                    else:
+                        frame = result
+                
+                writer.write(i, frame)
+        
+        return (writer.images,)
 
 NODE_CLASS_MAPPINGS = {
     "WinampVizV2": WinampVizV2
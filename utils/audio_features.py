@@ -0,0 +1,149 @@
+"""Batched audio feature extraction shared by the DJZ Winamp visualizers.
+
+The waveform is cut into one chunk per video frame as a ``(frames, chunk)``
+reshape, every chunk is windowed and transformed in a single ``rfft`` call,
+and the bass/mids/highs band averages come out of one matrix multiply with
+a band-weight matrix. Frame-to-frame smoothing is the one-pole IIR filter
+``y[i] = (1 - s) * x[i] + s * y[i - 1]`` run over the frame axis with
+``scipy.signal.lfilter`` instead of a Python loop.
+
+Usage:
+    from utils.audio_features import extract_audio, audio_features, smooth_features, frame_features
+
+    samples, sample_rate = extract_audio(audio)  # mono float32, rate from the AUDIO dict
+    features = audio_features(samples, sample_rate, fps=30)  # {"spectrum": (F, bins), "bass": (F,), ...}
+    smooth_features(features, 0.5, keys=("bass", "mids", "highs"))
+    render(frame_features(features, i), width, height, palette)  # per-frame views, no copies
+"""
+
+import numpy as np
+import scipy.fft
+import torch
+from scipy.signal import get_window, lfilter
+
+__all__ = [
+    "DEFAULT_SAMPLE_RATE",
+    "BANDS",
+    "extract_audio",
+    "band_matrix",
+    "audio_features",
+    "smooth_features",
+    "frame_features",
+]
+
+# Used when the input carries no sample rate of its own
+DEFAULT_SAMPLE_RATE = 44100
+
+# Band edges as fractions of the kept spectrum bins
+BANDS = {"bass": (0.0, 0.1), "mids": (0.1, 0.5), "highs": (0.5, 1.0)}
+
+
+def extract_audio(audio_data):
+    """Mono float32 samples and the sample rate (or None) from an AUDIO input.
+
+    A ComfyUI AUDIO dict (``waveform`` of shape ``(batch, channels, samples)``
+    plus ``sample_rate``) is mixed down over its channels. Other dicts are
+    searched for the common sample keys, and tensors, arrays and lists are
+    flattened as they are.
+    """
+    sample_rate = None
+    if isinstance(audio_data, dict) and "waveform" in audio_data:
+        sample_rate = audio_data.get("sample_rate")
+        waveform = audio_data["waveform"]
+        if isinstance(waveform, torch.Tensor):
+            waveform = waveform.detach().cpu().numpy()
+        waveform = np.asarray(waveform, dtype=np.float32)
+        if waveform.ndim >= 2:
+            # Channels sit on the second-to-last axis; average them and keep batches back to back
+            waveform = waveform.mean(axis=-2)
+        return waveform.reshape(-1), sample_rate
+
+    # Handle dictionary input recursively
+    def extract_audio_data(data):
+        if isinstance(data, dict):
+            # Try common keys
+            for key in ['samples', 'audio', 'data', 'tensor', 'array']:
+                if key in data:
+                    return extract_audio_data(data[key])
+            # If no common keys found, try the first value that's not a dict
+            for value in data.values():
+                if not isinstance(value, dict):
+                    return extract_audio_data(value)
+        elif isinstance(data, torch.Tensor):
+            return data.detach().cpu().numpy()
+        elif isinstance(data, (list, tuple, np.ndarray)):
+            return np.asarray(data, dtype=np.float32)
+        return data
+
+    if isinstance(audio_data, dict):
+        sample_rate = audio_data.get("sample_rate")
+    samples = extract_audio_data(audio_data)
+    if samples is None:
+        raise ValueError("Could not extract valid audio data from input")
+    return np.asarray(samples, dtype=np.float32).reshape(-1), sample_rate
+
+
+def band_matrix(bins):
+    """``(bins, len(BANDS))`` weights whose product with a spectrum gives each band's mean"""
+    weights = np.zeros((bins, len(BANDS)), dtype=np.float32)
+    for column, (low, high) in enumerate(BANDS.values()):
+        start, stop = int(bins * low), int(bins * high)
+        if stop > start:
+            weights[start:stop, column] = 1.0 / (stop - start)
+    return weights
+
+
+def audio_features(samples, sample_rate, fps, max_frames=0, window="hann"):
+    """Per-frame features for ``samples`` cut into ``sample_rate / fps``-sample chunks.
+
+    Returns a dict of arrays with one row per frame: ``waveform``
+    ``(F, chunk)`` (the last chunk zero-padded), ``spectrum`` ``(F, chunk // 2)``
+    (FFT magnitudes of the windowed chunk, each frame normalized to a peak
+    of 1) and ``bass``, ``mids`` and ``highs`` ``(F,)`` band means of the
+    spectrum. Only the first ``max_frames`` chunks are analysed when it is
+    positive. ``window`` is any ``scipy.signal.get_window`` name, or None.
+    """
+    chunk_size = max(2, int(sample_rate / fps))
+    num_chunks = max(1, -(-len(samples) // chunk_size))
+    if max_frames > 0:
+        num_chunks = min(num_chunks, max_frames)
+        samples = samples[:num_chunks * chunk_size]
+    padded = np.zeros(num_chunks * chunk_size, dtype=np.float32)
+    padded[:len(samples)] = samples
+    waveform = padded.reshape(num_chunks, chunk_size)
+
+    windowed = waveform
+    if window is not None:
+        windowed = waveform * get_window(window, chunk_size).astype(np.float32)
+    spectrum = np.abs(scipy.fft.rfft(windowed, axis=1)[:, :chunk_size // 2])
+
+    # Normalize every frame to its own peak, leaving silent frames at zero
+    peak = spectrum.max(axis=1, keepdims=True)
+    spectrum /= np.where(peak > 0, peak, 1)
+
+    bands = spectrum @ band_matrix(spectrum.shape[1])
+    features = {"spectrum": spectrum, "waveform": waveform}
+    for column, name in enumerate(BANDS):
+        features[name] = bands[:, column]
+    return features
+
+
+def smooth_features(features, smoothing, keys=None):
+    """Smooth ``features`` (all keys, or just ``keys``) in place along the frame axis.
+
+    Matches carrying ``smoothing`` of each smoothed frame into the next:
+    the first frame is unchanged.
+    """
+    if smoothing <= 0:
+        return features
+    for key in (features if keys is None else keys):
+        values = features[key]
+        # Initial state chosen so the first output equals the first input
+        smoothed, _ = lfilter([1.0 - smoothing], [1.0, -smoothing], values, axis=0, zi=smoothing * values[:1])
+        features[key] = smoothed.astype(values.dtype, copy=False)
+    return features
+
+
+def frame_features(features, index):
+    """The features of one frame, as views into the batched arrays"""
+    return {key: values[index] for key, values in features.items()}
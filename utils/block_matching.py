@@ -0,0 +1,112 @@
+"""Block-matching motion search shared by the DJZ datamosh nodes.
+
+Instead of comparing every block against every candidate shift one at a
+time, each candidate shift is a strided view of a wrap-padded copy of the
+previous frame, and the sum of absolute differences (SAD) for all blocks is
+reduced from one ``cv2.absdiff`` with two reshaped sums.
+Shifts are applied with one ``cv2.remap`` built from the per-block flow.
+
+Usage:
+    from utils.block_matching import find_block_shifts, apply_block_shifts
+
+    shifts = find_block_shifts(prev_frame, curr_frame, block_size=16, max_shift=8, shift_range=2)
+    moshed = apply_block_shifts(prev_frame, shifts, block_size=16)
+"""
+
+import cv2
+import numpy as np
+import torch
+
+__all__ = ["find_block_shifts", "apply_block_shifts"]
+
+
+def find_block_shifts(prev_frame, curr_frame, block_size, max_shift, shift_range):
+    """Find the best (dx, dy) per block of ``curr_frame`` within ``prev_frame``.
+
+    Frames are ``(1, H, W, C)`` tensors in 0-1 range. Only full blocks are
+    searched. A candidate is valid when its source block fits inside the
+    frame after wrapping the block origin, and the first candidate (dy-major
+    order) with the lowest SAD wins. Returns an ``(H // block_size,
+    W // block_size, 2)`` float tensor of ``(dx, dy)``.
+    """
+    # Same 8-bit quantization as the original per-block search
+    prev = (prev_frame[0] * 255).byte().cpu().numpy()
+    curr = (curr_frame[0] * 255).byte().cpu().numpy()
+
+    height, width, channels = prev.shape
+    h_blocks = height // block_size
+    w_blocks = width // block_size
+
+    best_shifts = np.zeros((h_blocks, w_blocks, 2), dtype=np.float32)
+    if h_blocks == 0 or w_blocks == 0:
+        return torch.from_numpy(best_shifts).to(prev_frame.device)
+
+    crop_h = h_blocks * block_size
+    crop_w = w_blocks * block_size
+    curr = np.ascontiguousarray(curr[:crop_h, :crop_w])
+
+    # Wrap-padded frame, so every candidate shift is a view rather than a copy
+    padded = np.pad(prev, ((max_shift, max_shift), (max_shift, max_shift), (0, 0)), mode='wrap')
+
+    block_y = np.arange(h_blocks) * block_size
+    block_x = np.arange(w_blocks) * block_size
+
+    best_sad = np.full((h_blocks, w_blocks), np.iinfo(np.int64).max, dtype=np.int64)
+    shift_values = list(range(-max_shift, max_shift + 1, shift_range))
+
+    for dy in shift_values:
+        # Source rows must not run off the bottom once the origin is wrapped
+        valid_y = (block_y + dy) % height + block_size <= height
+        if not valid_y.any():
+            continue
+        for dx in shift_values:
+            valid_x = (block_x + dx) % width + block_size <= width
+            if not valid_x.any():
+                continue
+
+            # For valid blocks this view equals the unwrapped source block
+            shifted = padded[max_shift + dy:max_shift + dy + crop_h, max_shift + dx:max_shift + dx + crop_w]
+            diff = cv2.absdiff(shifted, curr)
+
+            # Sum block rows first, then the columns and channels of each block
+            sad = diff.reshape(h_blocks, block_size, crop_w * channels).sum(axis=1, dtype=np.int64)
+            sad = sad.reshape(h_blocks, w_blocks, block_size * channels).sum(axis=2)
+
+            better = (sad < best_sad) & valid_y[:, None] & valid_x[None, :]
+            best_sad[better] = sad[better]
+            best_shifts[better] = (dx, dy)
+
+    return torch.from_numpy(best_shifts).to(prev_frame.device)
+
+
+def apply_block_shifts(frame, shifts, block_size):
+    """Copy every full block from its shifted source position in one remap.
+
+    ``frame`` is a ``(1, H, W, C)`` tensor, ``shifts`` the output of
+    :func:`find_block_shifts`. Pixels outside the full-block grid are left
+    unchanged.
+    """
+    image = frame[0].cpu().numpy()
+    height, width = image.shape[:2]
+    h_blocks, w_blocks = shifts.shape[:2]
+    crop_h = h_blocks * block_size
+    crop_w = w_blocks * block_size
+
+    map_y, map_x = np.mgrid[0:height, 0:width].astype(np.float32)
+    if h_blocks > 0 and w_blocks > 0:
+        block_shifts = shifts.cpu().numpy().astype(np.int64)
+        # Per-pixel flow: each pixel takes its block's shift
+        flow_x = np.repeat(np.repeat(block_shifts[..., 0], block_size, axis=0), block_size, axis=1)
+        flow_y = np.repeat(np.repeat(block_shifts[..., 1], block_size, axis=0), block_size, axis=1)
+
+        ys, xs = np.mgrid[0:crop_h, 0:crop_w]
+        origin_y = ys - ys % block_size
+        origin_x = xs - xs % block_size
+        # Wrap the block origin, then offset within the block, as the per-block copy did
+        map_y[:crop_h, :crop_w] = (origin_y + flow_y) % height + (ys - origin_y)
+        map_x[:crop_h, :crop_w] = (origin_x + flow_x) % width + (xs - origin_x)
+
+    output = cv2.remap(image, map_x, map_y, interpolation=cv2.INTER_NEAREST)
+    if output.ndim == 2:
+        output = output[..., None]
+    return torch.from_numpy(output).to(frame.device).unsqueeze(0)
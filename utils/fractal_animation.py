@@ -0,0 +1,222 @@
+"""Zoom-animation helpers shared by the DJZ fractal generators.
+
+A zoom animation is rendered as one IMAGE batch: keyframes are eased between
+a start and end view (zoom interpolated geometrically so the zoom speed looks
+constant), ``max_iter`` grows with zoom depth, one pixel grid is built up front
+and scaled onto each frame's window, every frame is coloured into a single
+preallocated batch through one cached colour LUT, and the interior of the
+previous frame is carried over as a hint so interior points can be settled by
+periodicity checking instead of running to ``max_iter``.
+
+Usage:
+    from utils.fractal_animation import render_zoom_animation
+
+    def render_frame(view, window, axes, max_iter, interior_hint):
+        return compute(*window, max_iter, axes=axes, interior_hint=interior_hint)  # normalized, 1.0 inside
+
+    batch = render_zoom_animation(render_frame, "Fire", width, height, frames=48,
+                                  start_view=(-0.75, 0.0, 1.0), end_view=(-0.745, 0.113, 1000.0),
+                                  window_scale=4.0, max_iter=500)  # (48, H, W, 3) float32 tensor
+"""
+
+import math
+
+import numpy as np
+import torch
+
+from .fractal_coloring import apply_color_lut
+
+__all__ = [
+    "EASING_MODES",
+    "PERIODICITY_TOLERANCE",
+    "ease",
+    "zoom_keyframes",
+    "scale_iterations",
+    "view_window",
+    "pixel_grid",
+    "window_axes",
+    "interior_hint",
+    "iterate_with_interior_hint",
+    "render_zoom_animation",
+]
+
+EASING_MODES = ["linear", "ease_in", "ease_out", "ease_in_out"]
+
+# Distance below which a revisited orbit point counts as a cycle
+PERIODICITY_TOLERANCE = 1e-12
+
+
+def ease(t, mode):
+    """Map linear progress ``t`` in 0-1 through an easing curve"""
+    if mode == "ease_in":
+        return t * t
+    if mode == "ease_out":
+        return 1 - (1 - t) * (1 - t)
+    if mode == "ease_in_out":
+        return t * t * (3 - 2 * t)
+    return t
+
+
+def zoom_keyframes(start_view, end_view, frames, easing="linear"):
+    """Interpolate ``(x_center, y_center, zoom)`` views for every frame.
+
+    Centres move linearly and zoom moves geometrically in eased time, so a
+    constant-speed zoom magnifies by the same factor every frame.
+    """
+    start_x, start_y, start_zoom = start_view
+    end_x, end_y, end_zoom = end_view
+    keyframes = []
+    for frame in range(frames):
+        t = ease(frame / (frames - 1), easing) if frames > 1 else 0.0
+        x_center = start_x + (end_x - start_x) * t
+        y_center = start_y + (end_y - start_y) * t
+        zoom = start_zoom * (end_zoom / start_zoom) ** t
+        keyframes.append((x_center, y_center, zoom))
+    return keyframes
+
+
+def scale_iterations(max_iter, zoom, base_zoom, growth=0.5):
+    """Iteration budget for a frame: ``growth`` times ``max_iter`` more per decade of zoom past ``base_zoom``"""
+    decades = max(0.0, math.log10(zoom / base_zoom))
+    return int(round(max_iter * (1 + growth * decades)))
+
+
+def view_window(x_center, y_center, zoom, window_scale):
+    """``(x_min, x_max, y_min, y_max)`` of a square view, as the single-frame nodes compute it"""
+    window_size = window_scale / zoom
+    return (x_center - window_size/2, x_center + window_size/2,
+            y_center - window_size/2, y_center + window_size/2)
+
+
+def pixel_grid(width, height):
+    """Column and row indices of a frame, built once and shared by every frame of an animation"""
+    return np.arange(width, dtype=np.float64), np.arange(height, dtype=np.float64)
+
+
+def window_axes(grid, window):
+    """``(x, y)`` pixel coordinates of ``window``, scaled and offset from a shared ``pixel_grid``.
+
+    The arithmetic is the one ``np.linspace`` uses, so the axes are identical
+    to ``np.linspace(x_min, x_max, num=width)`` and its y counterpart.
+    """
+    columns, rows = grid
+    x_min, x_max, y_min, y_max = window
+    x = columns * ((x_max - x_min) / (len(columns) - 1)) + x_min
+    y = rows * ((y_max - y_min) / (len(rows) - 1)) + y_min
+    # linspace pins the last sample to the window edge
+    x[-1] = x_max
+    y[-1] = y_max
+    return x, y
+
+
+def interior_hint(previous, previous_window, axes):
+    """Predict interior pixels of a new view from the previous frame.
+
+    ``previous`` is the previous normalized frame (1.0 inside the set) and
+    ``axes`` the new frame's ``window_axes``. The previous interior is eroded
+    by one pixel so hints stay clear of the boundary, then sampled at the new
+    pixel centres; pixels outside the overlap are False.
+    """
+    interior = previous >= 1.0
+    eroded = interior.copy()
+    eroded[1:, :] &= interior[:-1, :]
+    eroded[:-1, :] &= interior[1:, :]
+    eroded[:, 1:] &= interior[:, :-1]
+    eroded[:, :-1] &= interior[:, 1:]
+
+    height, width = previous.shape
+    prev_x_min, prev_x_max, prev_y_min, prev_y_max = previous_window
+    x, y = axes
+    columns = np.rint((x - prev_x_min) / (prev_x_max - prev_x_min) * (width - 1))
+    rows = np.rint((y - prev_y_min) / (prev_y_max - prev_y_min) * (height - 1))
+    valid_columns = (columns >= 0) & (columns <= width - 1)
+    valid_rows = (rows >= 0) & (rows <= height - 1)
+
+    columns = np.clip(columns, 0, width - 1).astype(np.int64)
+    rows = np.clip(rows, 0, height - 1).astype(np.int64)
+    hint = eroded[rows[:, None], columns[None, :]]
+    hint &= valid_rows[:, None] & valid_columns[None, :]
+    return hint
+
+
+def iterate_with_interior_hint(Z, C, M, max_iter, escape_radius, step, interior_hint):
+    """Escape-time iteration over a compacted active set, settling hinted points by periodicity.
+
+    ``step(z, c)`` advances the orbit. ``Z`` and ``M`` (contiguous ``(H, W)``
+    arrays) are updated in place with the same escape iterations as the
+    full-plane masked loop. Hinted points whose orbit returns within
+    ``PERIODICITY_TOLERANCE`` of a saved point are dropped early and keep
+    ``M = max_iter``; unhinted points are never checked.
+    """
+    Z_flat = Z.reshape(-1)
+    M_flat = M.reshape(-1)
+
+    # Points already outside the radius are never iterated and keep M = max_iter
+    active = np.flatnonzero(np.abs(Z_flat) <= escape_radius)
+    z = Z_flat[active]
+    c = C.reshape(-1)[active]
+    hinted = interior_hint.reshape(-1)[active]
+    saved = z.copy()
+
+    for i in range(max_iter):
+        z = step(z, c)
+        abs_z = np.abs(z)
+
+        escaped = abs_z > escape_radius
+        M_flat[active[escaped]] = i
+        # A cycle in a hinted orbit means it never escapes
+        finished = escaped | (hinted & (np.abs(z - saved) < PERIODICITY_TOLERANCE))
+        Z_flat[active[finished]] = z[finished]
+
+        # Brent-style: move the saved point forward at 2^k - 1 so any cycle length is caught
+        if i & (i + 1) == 0:
+            saved = z
+
+        remaining = ~finished
+        active = active[remaining]
+        if active.size == 0:
+            break
+        z = z[remaining]
+        c = c[remaining]
+        hinted = hinted[remaining]
+        saved = saved[remaining]
+
+    Z_flat[active] = z
+
+
+def render_zoom_animation(render_frame, color_preset, width, height, frames, start_view, end_view, window_scale, max_iter,
+                          easing="linear", adaptive_iterations=True, color_cycles=1.0):
+    """Render a zoom as one ``(frames, H, W, 3)`` float32 IMAGE batch.
+
+    ``render_frame(view, window, axes, max_iter, interior_hint)`` receives the
+    ``(x_center, y_center, zoom)`` view, its ``(x_min, x_max, y_min, y_max)``
+    window and the window's ``(x, y)`` pixel coordinates, and returns a
+    normalized ``(H, W)`` frame. ``interior_hint`` is a boolean ``(H, W)``
+    array, all False for the first frame. Frames are coloured with the
+    ``color_preset`` LUT.
+    """
+    keyframes = zoom_keyframes(start_view, end_view, frames, easing)
+    base_zoom = min(start_view[2], end_view[2])
+    output = np.empty((frames, height, width, 3), dtype=np.float32)
+    grid = pixel_grid(width, height)
+
+    previous = None
+    previous_window = None
+    for index, (x_center, y_center, zoom) in enumerate(keyframes):
+        window = view_window(x_center, y_center, zoom, window_scale)
+        axes = window_axes(grid, window)
+        frame_iter = scale_iterations(max_iter, zoom, base_zoom) if adaptive_iterations else max_iter
+        if previous is None:
+            hint = np.zeros((height, width), dtype=bool)
+        else:
+            hint = interior_hint(previous, previous_window, axes)
+
+        fractal = render_frame((x_center, y_center, zoom), window, axes, frame_iter, hint)
+        output[index] = apply_color_lut(fractal, color_preset, color_cycles)
+        output[index] /= 255.0
+
+        previous = fractal
+        previous_window = window
+        print(f"Rendered zoom frame {index + 1}/{frames} (zoom {zoom:.4g}, {frame_iter} iterations)")
+
+    return torch.from_numpy(output)
@@ -0,0 +1,227 @@
+"""Lookup-table colouring shared by the DJZ fractal generators.
+
+Each colour preset is evaluated once per LUT entry and cached, so colouring
+a frame is a single vectorized ``take`` on the normalized iteration array
+instead of one Python colour-function call per pixel. LUT bins whose edges
+are more than 1/255 away from their centre sample (a preset's hard
+thresholds, or its steepest gradients) are flagged once per preset, and
+the few pixels that land in them are coloured by the scalar function, so
+every pixel stays within 1/255 of the per-pixel result.
+
+Usage:
+    from utils.fractal_coloring import apply_color_lut
+
+    rgb = apply_color_lut(fractal, "Fire", color_cycles=1.0)  # (H, W, 3) uint8
+"""
+
+import colorsys
+import math
+from functools import lru_cache
+
+import numpy as np
+
+__all__ = [
+    "COLOR_FUNCTIONS",
+    "LUT_SIZE",
+    "LUT_SIZES",
+    "get_color_function",
+    "get_color_lut",
+    "get_exact_bins",
+    "apply_color_lut",
+]
+
+# LUT entries per preset; powers of two, so pixel values map onto bins without rounding
+LUT_SIZE = 4096
+# Psychedelic cycles its hue five times over the range and needs finer bins to stay within 1/255
+LUT_SIZES = {"Psychedelic": 65536}
+
+
+def classic_white_grey(value):
+    grey = int(255 * (1 - value))
+    return (grey, grey, grey)
+
+
+def electric_blue(value):
+    # Bright electric blue with white highlights
+    if value > 0.95:  # Bright highlights
+        return (255, 255, 255)
+    # Base color is electric blue (0, 128, 255)
+    blue = int(255 * (0.5 + 0.5 * value))  # Range from 128 to 255
+    green = int(128 * value)  # Some green for vibrancy
+    return (int(60 * value), green, blue)  # Less red for that electric feel
+
+
+def fire(value):
+    # Fire gradient from deep red through orange to bright yellow
+    if value < 0.33:
+        # Deep red to red
+        return (int(255 * (0.5 + 1.5 * value)), 0, 0)
+    elif value < 0.66:
+        # Red to orange
+        v = (value - 0.33) * 3
+        return (255, int(255 * v), 0)
+    else:
+        # Orange to yellow
+        v = (value - 0.66) * 3
+        return (255, 255, int(255 * v))
+
+
+def rainbow(value):
+    # Full spectrum rainbow with increased saturation and brightness
+    hue = value % 1.0
+    sat = 0.9  # High saturation
+    val = 0.9  # High brightness
+    rgb = colorsys.hsv_to_rgb(hue, sat, val)
+    return tuple(int(255 * x) for x in rgb)
+
+
+def deep_space(value):
+    # Space theme with stars and nebula colors
+    if value > 0.95:  # Bright stars
+        return (255, 255, 255)
+    elif value > 0.90:  # Dimmer stars
+        star_bright = int(200 * (value - 0.90) * 10)
+        return (star_bright, star_bright, star_bright)
+
+    # Nebula colors - purple to blue with some pink
+    hue = 0.75 + value * 0.15  # Range from purple to blue
+    sat = 0.8 + value * 0.2  # High saturation
+    val = 0.4 + value * 0.6  # Ensure visibility
+    rgb = colorsys.hsv_to_rgb(hue, sat, val)
+    r, g, b = [int(255 * x) for x in rgb]
+    # Add some pink tint to certain ranges
+    if 0.3 < value < 0.6:
+        r = min(255, r + int(100 * value))
+    return (r, g, b)
+
+
+def ocean(value):
+    # Ocean colors from deep blue through turquoise to white foam
+    if value > 0.9:  # White foam/caps
+        foam = int(255 * (value - 0.9) * 10)
+        return (foam, foam, foam)
+
+    if value < 0.5:  # Deep ocean blues
+        hue = 0.6 + value * 0.1  # Deep blue range
+        sat = 0.9 - value * 0.3
+        val = 0.3 + value * 0.7
+    else:  # Turquoise shallows
+        hue = 0.5 + value * 0.1  # Turquoise range
+        sat = 0.7
+        val = 0.6 + value * 0.4
+
+    rgb = colorsys.hsv_to_rgb(hue, sat, val)
+    return tuple(int(255 * x) for x in rgb)
+
+
+def forest(value):
+    # Forest colors from dark green through bright green to brown
+    if value < 0.4:  # Dark to medium green
+        hue = 0.25 + value * 0.1
+        sat = 0.9 - value * 0.2
+        val = 0.3 + value * 0.7
+    elif value < 0.7:  # Medium to bright green
+        hue = 0.28 + value * 0.05
+        sat = 0.8
+        val = 0.6 + value * 0.4
+    else:  # Brown highlights
+        hue = 0.08  # Brown
+        sat = 0.7 - (value - 0.7) * 0.5
+        val = 0.6 + (value - 0.7) * 0.4
+
+    rgb = colorsys.hsv_to_rgb(hue, sat, val)
+    return tuple(int(255 * x) for x in rgb)
+
+
+def psychedelic(value):
+    # Ultra-vibrant rainbow cycling with high saturation
+    hue = (value * 5) % 1.0  # Faster color cycling
+    sat = 1.0  # Maximum saturation
+    val = 0.9  # High brightness but not full to maintain some color definition
+    rgb = colorsys.hsv_to_rgb(hue, sat, val)
+    r, g, b = [int(255 * x) for x in rgb]
+
+    # Add pulsing brightness
+    pulse = abs(math.sin(value * math.pi * 2))
+    r = min(255, r + int(50 * pulse))
+    g = min(255, g + int(50 * pulse))
+    b = min(255, b + int(50 * pulse))
+    return (r, g, b)
+
+
+COLOR_FUNCTIONS = {
+    "Classic White-Grey": classic_white_grey,
+    "Electric Blue": electric_blue,
+    "Fire": fire,
+    "Rainbow": rainbow,
+    "Deep Space": deep_space,
+    "Ocean": ocean,
+    "Forest": forest,
+    "Psychedelic": psychedelic
+}
+
+
+def get_color_function(preset):
+    """Scalar colour function for a preset, falling back to Classic White-Grey"""
+    return COLOR_FUNCTIONS.get(preset, classic_white_grey)
+
+
+def _evaluate_colors(color_function, values):
+    """``(N, 3)`` uint8 colours of a scalar colour function, clamped like PIL pixel writes did"""
+    colors = np.array([color_function(value) for value in values], dtype=np.float64).reshape(-1, 3)
+    return np.clip(colors, 0, 255).astype(np.uint8)
+
+
+def _lut_size(preset):
+    """LUT entries used for a preset"""
+    return LUT_SIZES.get(preset, LUT_SIZE)
+
+
+@lru_cache(maxsize=None)
+def get_color_lut(preset):
+    """Bake a preset into a read-only ``(size, 3)`` uint8 LUT, cached per preset"""
+    size = _lut_size(preset)
+    # Sample each entry at the centre of its bin to halve the quantization error
+    lut = _evaluate_colors(get_color_function(preset), (np.arange(size) + 0.5) / size)
+    lut.setflags(write=False)
+    return lut
+
+
+@lru_cache(maxsize=None)
+def get_exact_bins(preset):
+    """Read-only boolean mask of the LUT bins whose pixels are coloured by the scalar function.
+
+    A bin is flagged when the colour at its left edge or just below its
+    right edge differs from its centre sample by more than 1 in any channel.
+    """
+    color_function = get_color_function(preset)
+    size = _lut_size(preset)
+    centre = get_color_lut(preset).astype(np.int64)
+    left = _evaluate_colors(color_function, np.arange(size) / size).astype(np.int64)
+    right = _evaluate_colors(color_function, np.nextafter(np.arange(1, size + 1) / size, 0)).astype(np.int64)
+    exact = (np.abs(left - centre).max(axis=1) > 1) | (np.abs(right - centre).max(axis=1) > 1)
+    exact.setflags(write=False)
+    return exact
+
+
+def apply_color_lut(fractal, preset, color_cycles=1.0, inside_color=(0, 0, 0)):
+    """Colour a normalized iteration array with a preset's LUT.
+
+    ``fractal`` values of exactly 1.0 are inside the set and get
+    ``inside_color``; everything else is cycled ``color_cycles`` times and
+    looked up. Returns an (H, W, 3) uint8 array.
+    """
+    lut = get_color_lut(preset)
+    size = len(lut)
+    cycled = (fractal * color_cycles) % 1.0
+    indices = np.clip((cycled * size).astype(np.int64), 0, size - 1)
+    rgb = np.take(lut, indices, axis=0)
+
+    # Pixels in bins the LUT cannot represent within 1/255 get the exact colour, once per distinct value
+    exact = get_exact_bins(preset)[indices]
+    if exact.any():
+        values, inverse = np.unique(cycled[exact], return_inverse=True)
+        rgb[exact] = _evaluate_colors(get_color_function(preset), values)[inverse.reshape(-1)]
+
+    rgb[fractal == 1.0] = inside_color
+    return rgb
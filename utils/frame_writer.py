@@ -0,0 +1,193 @@
+"""Frame output for the DJZ procedural video nodes: in place in memory, or streamed to ffmpeg.
+
+Generators used to append one float tensor per frame and ``torch.stack``
+them at the end, which holds every frame twice. ``FrameWriter`` instead
+preallocates the ``(N, H, W, 3)`` float32 IMAGE batch once and converts
+each rendered uint8 frame straight into its slot. For clips too long to
+keep in RAM it can stream instead: frames are gathered into a small uint8
+chunk and piped to an ``ffmpeg`` process that encodes them to a file, so
+memory use no longer grows with the clip length.
+
+Usage:
+    from utils.frame_writer import FrameWriter, output_video_path
+
+    path = output_video_path(stream_to) if stream_to else None
+    with FrameWriter(max_frames, height, width, fps=fps, output_path=path) as writer:
+        for i in range(max_frames):
+            writer.write(i, render_frame(i))  # (H, W, 3) integers in 0-255, or floats in 0-1
+    images = writer.images  # the (N, H, W, 3) batch, or just the last frame when streaming
+"""
+
+import os
+import subprocess
+
+import numpy as np
+import torch
+
+from .secure_paths import validate_safe_path
+
+__all__ = ["STREAM_CHUNK_FRAMES", "FrameWriter", "ffmpeg_command", "output_video_path"]
+
+# Frames gathered in the uint8 staging chunk before each write to ffmpeg
+STREAM_CHUNK_FRAMES = 16
+
+
+def output_video_path(filename):
+    """Resolve a node's ``stream_to`` filename inside ComfyUI's output directory.
+
+    Outside ComfyUI the current directory is used. Raises ``ValueError`` if
+    the name escapes the directory.
+    """
+    try:
+        import folder_paths
+        base_directory = folder_paths.get_output_directory()
+    except ImportError:
+        base_directory = os.getcwd()
+    path = validate_safe_path(filename, base_directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def ffmpeg_command(output_path, width, height, fps):
+    """ffmpeg arguments that encode raw RGB frames from stdin into ``output_path``"""
+    return [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+        '-i', '-',
+        # yuv420p needs even dimensions
+        '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+        output_path,
+    ]
+
+
+def _to_uint8(frame):
+    """An ``(H, W, 3)`` uint8 array from an integer array or tensor in 0-255, or a float one in 0-1"""
+    if isinstance(frame, torch.Tensor):
+        frame = frame.detach().cpu().numpy()
+    frame = np.asarray(frame)
+    if frame.dtype == np.uint8:
+        return frame
+    if not np.issubdtype(frame.dtype, np.floating):
+        return np.clip(frame, 0, 255).astype(np.uint8)
+    return (np.clip(frame, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+class FrameWriter:
+    """Receives ``num_frames`` frames of ``height`` x ``width`` RGB, by index, in order.
+
+    Without ``output_path`` the frames land in ``images``, a preallocated
+    float32 IMAGE batch. With it they are encoded to that file by ffmpeg as
+    they arrive, and ``images`` ends up holding just the last frame as a
+    one-frame preview.
+    """
+
+    def __init__(self, num_frames, height, width, fps=30, output_path=None, chunk_frames=STREAM_CHUNK_FRAMES):
+        self.num_frames = num_frames
+        self.height = height
+        self.width = width
+        self.fps = fps
+        self.output_path = output_path
+        self.count = 0
+        self._process = None
+
+        if output_path is None:
+            self._images = torch.empty((num_frames, height, width, 3), dtype=torch.float32)
+            self._staging = None
+        else:
+            self._images = None
+            self._staging = np.empty((max(1, chunk_frames), height, width, 3), dtype=np.uint8)
+            self._staged = 0
+            try:
+                self._process = subprocess.Popen(
+                    ffmpeg_command(output_path, width, height, fps),
+                    stdin=subprocess.PIPE, stderr=subprocess.PIPE
+                )
+            except FileNotFoundError:
+                raise RuntimeError("Streaming frames to a video file needs ffmpeg on the PATH")
+
+    @property
+    def streaming(self):
+        return self.output_path is not None
+
+    def write(self, index, frame):
+        """Store frame ``index``: an ``(H, W, 3)`` integer array or tensor in 0-255, or a float one in 0-1"""
+        if index != self.count:
+            raise ValueError(f"Frames must be written in order: expected frame {self.count}, got {index}")
+        if index >= self.num_frames:
+            raise IndexError(f"Frame {index} is past the {self.num_frames} frames this writer holds")
+
+        if self.streaming:
+            self._staging[self._staged] = _to_uint8(frame)
+            self._staged += 1
+            if self._staged == len(self._staging):
+                self._flush()
+        else:
+            frame = torch.as_tensor(frame)
+            if frame.is_floating_point():
+                self._images[index].copy_(frame)
+            else:
+                # Same result as frame.float() / 255.0, without the intermediate copy
+                torch.div(frame, 255.0, out=self._images[index])
+        self.count += 1
+
+    def _flush(self):
+        """Pipe the staged chunk to ffmpeg"""
+        if self._staged:
+            try:
+                self._process.stdin.write(memoryview(self._staging[:self._staged]).cast('B'))
+            except BrokenPipeError:
+                # ffmpeg exited early; report its error
+                self._wait()
+                raise RuntimeError(f"ffmpeg stopped reading frames for {self.output_path}")
+            self._last = self._staging[self._staged - 1].copy()
+            self._staged = 0
+
+    def _wait(self):
+        """Close ffmpeg's input and wait for the encode, raising its own error message if it failed"""
+        process, self._process = self._process, None
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        error = process.stderr.read().decode(errors='replace').strip()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while writing {self.output_path}: {error}")
+
+    def close(self):
+        """Finish the output: encode what is left when streaming, or trim the batch to the frames written"""
+        if not self.streaming:
+            if self.count < self.num_frames:
+                self._images = self._images[:self.count]
+            return
+        if self._process is None:
+            return
+        self._flush()
+        self._wait()
+        if self.count:
+            self._images = torch.from_numpy(self._last[None]).float().div_(255.0)
+        else:
+            self._images = torch.zeros((1, self.height, self.width, 3), dtype=torch.float32)
+        print(f"Wrote {self.count} frames to {self.output_path}")
+
+    def abort(self):
+        """Stop an unfinished stream without waiting for the encode"""
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+
+    @property
+    def images(self):
+        """The IMAGE batch: every frame, or the last frame alone when streaming"""
+        return self._images
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
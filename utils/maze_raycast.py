@@ -0,0 +1,254 @@
+"""Grid raycasting and column rendering shared by the DJZ maze nodes.
+
+Rays for every screen column are cast at once with a digital differential
+analyser (DDA): each ray steps from one grid line to the next, so it stops
+on the exact wall face instead of marching in fixed increments, and the
+distance is corrected to the camera plane to avoid fisheye bending. Columns
+are then composited as one frame: per-column wall spans are compared
+against a row index, and wall patterns are looked up per pixel from the
+offset into the wall instead of drawing one ``cv2.line`` per segment.
+
+Usage:
+    from utils.maze_raycast import cast_columns, render_columns
+
+    dist = cast_columns(maze, pos_x, pos_y, angle, fov, width, max_depth=20.0)
+    wall_height = np.minimum((height * 1.2 / (dist + 0.0001)).astype(np.int64), height)
+    wall_top = (height - wall_height) // 2
+    img = render_columns(height, wall_top, wall_height, wall_colors, "brick", frame,
+                         ceiling_color=(20, 20, 20), floor_color=(40, 40, 40))
+"""
+
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+__all__ = ["QUALITY_SAMPLES", "cast_rays", "cast_columns", "pattern_mask", "line_caps", "render_columns"]
+
+# Rays per screen column for each render quality, averaged down to one column
+QUALITY_SAMPLES = {"standard": 1, "high": 2, "ultra": 4}
+
+# Pattern periods in pixels, as the per-segment drawing used them
+BRICK_HEIGHT = 20
+CIRCUIT_HEIGHT = 30
+
+# Pixels are composited as one 32-bit word each, bytes in RGBA order
+PACKED = np.dtype("<u4")
+
+# Circuit traces light the first half of each period, both ends included
+CIRCUIT_LUT = np.arange(CIRCUIT_HEIGHT) <= CIRCUIT_HEIGHT // 2
+
+
+def cast_rays(maze, pos_x, pos_y, angles, max_depth):
+    """Distance along each ray to the first wall cell (``maze == 1``) or the grid edge.
+
+    ``angles`` is an array of ray directions in radians. Rays that start in a
+    wall return 0 and rays that find nothing within ``max_depth`` return
+    ``max_depth``.
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    dir_x = np.cos(angles)
+    dir_y = np.sin(angles)
+    rows, cols = maze.shape
+
+    map_x = np.full(angles.shape, int(np.floor(pos_x)), dtype=np.int64)
+    map_y = np.full(angles.shape, int(np.floor(pos_y)), dtype=np.int64)
+    with np.errstate(divide="ignore"):
+        delta_x = np.abs(1.0 / dir_x)
+        delta_y = np.abs(1.0 / dir_y)
+    step_x = np.where(dir_x < 0, -1, 1)
+    step_y = np.where(dir_y < 0, -1, 1)
+    # Distance along the ray to the first vertical and horizontal grid line
+    with np.errstate(invalid="ignore"):
+        side_x = np.where(dir_x < 0, pos_x - map_x, map_x + 1 - pos_x) * delta_x
+        side_y = np.where(dir_y < 0, pos_y - map_y, map_y + 1 - pos_y) * delta_y
+    side_x[~np.isfinite(side_x)] = np.inf
+    side_y[~np.isfinite(side_y)] = np.inf
+
+    dist = np.full(angles.shape, float(max_depth))
+    if not (0 <= map_x.flat[0] < cols and 0 <= map_y.flat[0] < rows) or maze[map_y.flat[0], map_x.flat[0]] == 1:
+        dist[...] = 0.0
+        return dist
+
+    # Step every unfinished ray across one grid line per iteration
+    active = np.arange(angles.size)
+    map_x, map_y = map_x.ravel(), map_y.ravel()
+    side_x, side_y = side_x.ravel(), side_y.ravel()
+    delta_x, delta_y = delta_x.ravel(), delta_y.ravel()
+    step_x, step_y = step_x.ravel(), step_y.ravel()
+    flat_dist = dist.reshape(-1)
+    while active.size:
+        use_x = side_x < side_y
+        travelled = np.where(use_x, side_x, side_y)
+        map_x = map_x + np.where(use_x, step_x, 0)
+        map_y = map_y + np.where(use_x, 0, step_y)
+        side_x = side_x + np.where(use_x, delta_x, 0)
+        side_y = side_y + np.where(use_x, 0, delta_y)
+
+        too_far = travelled >= max_depth
+        outside = (map_x < 0) | (map_x >= cols) | (map_y < 0) | (map_y >= rows)
+        wall = np.zeros(active.size, dtype=bool)
+        inside = ~outside & ~too_far
+        wall[inside] = maze[map_y[inside], map_x[inside]] == 1
+
+        hit = (outside | wall) & ~too_far
+        flat_dist[active[hit]] = travelled[hit]
+        remaining = ~(hit | too_far)
+        active = active[remaining]
+        map_x, map_y = map_x[remaining], map_y[remaining]
+        side_x, side_y = side_x[remaining], side_y[remaining]
+        delta_x, delta_y = delta_x[remaining], delta_y[remaining]
+        step_x, step_y = step_x[remaining], step_y[remaining]
+
+    return dist
+
+
+def cast_columns(maze, pos_x, pos_y, angle, fov, width, max_depth):
+    """Perpendicular wall distance for ``width`` columns spread over ``fov`` radians.
+
+    Column ``x`` looks along ``angle - fov / 2 + x / width * fov``, as the maze
+    nodes always spread their rays. The distance is measured to the camera
+    plane rather than along the ray, so straight walls render straight.
+    """
+    offsets = -fov / 2.0 + np.arange(width) / float(width) * fov
+    dist = cast_rays(maze, pos_x, pos_y, angle + offsets, max_depth)
+    return dist * np.cos(offsets)
+
+
+def pattern_mask(pattern, offset, x, frame):
+    """Which wall pixels a pattern paints, from each pixel's row ``offset`` below the wall top.
+
+    ``offset`` is ``(H, W)`` and ``x`` broadcasts as the screen column.
+    Reproduces the segments the per-column drawing painted: brick leaves
+    half a brick unpainted at the top of every other column band, and
+    circuit paints the first half (inclusive) of every period, scrolling
+    with ``frame``. Returns None for patterns that paint the whole wall.
+    """
+    if pattern == "brick":
+        start = (x // BRICK_HEIGHT + frame) % 2 * (BRICK_HEIGHT // 2)
+        return offset >= start
+    if pattern == "circuit":
+        phase = offset - (frame * 2) % CIRCUIT_HEIGHT
+        return (phase >= 0) & CIRCUIT_LUT[phase % CIRCUIT_HEIGHT]
+    return None
+
+
+@lru_cache(maxsize=None)
+def line_caps(thickness, distance):
+    """Rows a vertical ``cv2.line`` of ``thickness`` reaches above its start and below its end.
+
+    Measured ``distance`` columns from the line's centre, from a line drawn
+    by cv2 itself so the round caps match. Returns None where the line does
+    not reach that column.
+    """
+    size = 4 * thickness + 8
+    start, end = size, 2 * size
+    stamp = np.zeros((3 * size, size), dtype=np.uint8)
+    cv2.line(stamp, (size // 2, start), (size // 2, end), 1, thickness)
+    covered = np.flatnonzero(stamp[:, size // 2 + distance]) if distance < size // 2 else []
+    if len(covered) == 0:
+        return None
+    return start - covered[0], covered[-1] - end
+
+
+def _dilate_rows(mask, above, below):
+    """Grow a boolean ``(rows, W)`` mask so each set row also covers ``above`` rows up and ``below`` rows down"""
+    if not above and not below:
+        return mask
+    grown = mask.copy()
+    for shift in range(1, below + 1):
+        grown[shift:] |= mask[:-shift]
+    for shift in range(1, above + 1):
+        grown[:-shift] |= mask[shift:]
+    return grown
+
+
+def _pack(rgb):
+    """Pack ``(..., 3)`` integer colours into one little-endian ``uint32`` (RGBA bytes) per pixel"""
+    rgb = np.asarray(rgb).astype(PACKED)
+    return rgb[..., 0] | (rgb[..., 1] << 8) | (rgb[..., 2] << 16)
+
+
+def render_columns(height, wall_top, wall_height, wall_colors, pattern, frame, ceiling_color, floor_color,
+                   thickness=1, samples=1):
+    """Composite ceiling, patterned walls and floor for every column into an ``(H, W, 3)`` uint8 frame.
+
+    ``wall_top`` and ``wall_height`` are integer arrays and ``wall_colors`` a
+    ``(W * samples, 3)`` array, one entry per cast ray. Each column is drawn
+    as the per-column ``cv2.line`` calls drew it: wall segments from
+    ``wall_top`` to ``wall_top + wall_height``, then the ceiling line from row
+    0 to ``wall_top`` and the floor line from the wall bottom down. Lines
+    thicker than one pixel spill into neighbouring columns (with cv2's round
+    caps) and columns further right land on top. ``samples`` rays per output
+    column are averaged down.
+    """
+    wall_top = np.asarray(wall_top).astype(np.int32)
+    wall_height = np.asarray(wall_height).astype(np.int32)
+    wall_colors = np.trunc(np.asarray(wall_colors)).astype(np.int32)
+    columns = wall_top.size
+    screen_x = np.arange(columns) // samples
+    ceiling = _pack(ceiling_color)
+    floor = _pack(floor_color)
+
+    # Thick lines work on a few rows past each edge so caps of strokes just outside the frame still reach in
+    pad = thickness + 1 if thickness > 1 else 0
+    rows = np.arange(-pad, height + pad, dtype=np.int32)[:, None]
+    packed = np.zeros((height, columns), dtype=PACKED)
+
+    reach = (thickness + 1) // 2 if thickness > 1 else 0
+    # Columns to the right are drawn later, so they are composited last
+    for shift in range(-reach, reach + 1):
+        caps = line_caps(thickness, abs(shift))
+        if caps is None:
+            continue
+        above, below = caps
+        source_offset = shift * samples
+        lo, hi = max(0, -source_offset), min(columns, columns - source_offset)
+        if lo >= hi:
+            continue
+        source = slice(lo + source_offset, hi + source_offset)
+        top = wall_top[source][None, :]
+        span = wall_height[source][None, :]
+        bottom = top + span
+        colors = wall_colors[source]
+        crop = slice(pad, pad + height)
+
+        # Wall segments, then ceiling and floor lines over them
+        offset = rows - top if pattern != "solid" else None
+        wall = pattern_mask(pattern, offset, screen_x[source][None, :], frame)
+        if pad:
+            # Caps of thick segments reach past the wall ends, so the segment ends matter
+            segments = (rows >= top) & (rows <= bottom) & (span > 0)
+            if wall is not None:
+                segments &= wall
+            wall = _dilate_rows(segments, above, below)[crop]
+            is_ceiling = ((rows >= np.minimum(top, 0) - above) & (rows <= np.maximum(top, 0) + below))[crop]
+            is_floor = ((rows >= np.minimum(bottom, height) - above) & (rows <= np.maximum(bottom, height) + below))[crop]
+        else:
+            # One-pixel lines: everything outside the wall span is ceiling or floor anyway
+            is_ceiling = rows <= np.maximum(top, 0)
+            is_floor = rows >= np.minimum(bottom, height)
+
+        if pattern == "gradient":
+            # One-row lines drawn top to bottom: the last one covering a pixel sets its colour
+            line = np.clip(offset[crop] + above, 0, np.maximum(span - 1, 0))
+            blend = line / np.maximum(span, 1)
+            # Truncated per channel, like the per-row colour tuples, and packed channel by channel
+            wall_value = np.zeros(blend.shape, dtype=PACKED)
+            for channel, c in enumerate(colors.T):
+                shade = blend * (255 - c)[None, :]
+                shade += c[None, :]
+                wall_value |= shade.astype(PACKED) << (8 * channel)
+        else:
+            wall_value = _pack(colors)[None, :]
+
+        view = packed[:, lo:hi]
+        layer = np.where(wall, wall_value, view) if wall is not None else wall_value
+        layer = np.where(is_ceiling, ceiling, layer)
+        view[...] = np.where(is_floor, floor, layer)
+
+    img = cv2.cvtColor(packed.view(np.uint8).reshape(height, columns, 4), cv2.COLOR_RGBA2RGB)
+    if samples > 1:
+        # Area resampling averages each run of samples back into one column
+        img = cv2.resize(img, (columns // samples, height), interpolation=cv2.INTER_AREA)
+    return img
@@ -0,0 +1,149 @@
+"""Struct-of-arrays particle systems shared by the ScreenGen presets and the DJZ visualizers.
+
+Particles (stars, pipes, shapes) are kept as one NumPy array per attribute
+instead of a list of dicts, updated with batched array operations, culled
+and respawned with boolean masks, and rasterized as filled discs for every
+particle in one scatter pass.
+
+Presets load this through ``ScreenGen/screengen_particles.py``, which
+re-exports it under a name they can import from the presets directory.
+
+Usage:
+    from utils.particles import ParticleSystem, splat_discs
+
+    stars = ParticleSystem(x=np.random.uniform(0, width, 1000), z=np.random.uniform(1, 100, 1000))
+    stars.z -= speed
+    expired = stars.z <= 0
+    stars.respawn(expired, x=np.random.uniform(0, width, expired.sum()), z=100)
+    splat_discs(img, stars.x.astype(int), y, radius, colors)  # colors: (N, 3) uint8
+"""
+
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+__all__ = ["ParticleSystem", "disc_offsets", "splat_discs"]
+
+
+class ParticleSystem:
+    """Particles stored as parallel NumPy arrays, one row per particle.
+
+    Every keyword passed to the constructor becomes an attribute array; all
+    arrays share the same first dimension.
+    """
+
+    def __init__(self, **fields):
+        self._names = list(fields)
+        for name, values in fields.items():
+            setattr(self, name, np.asarray(values))
+
+    def __len__(self):
+        return len(getattr(self, self._names[0])) if self._names else 0
+
+    def spawn(self, **values):
+        """Append particles; every field must be given, as arrays of equal length or scalars"""
+        count = max((len(v) for v in values.values() if np.ndim(v) > 0), default=1)
+        for name in self._names:
+            current = getattr(self, name)
+            new = np.broadcast_to(np.asarray(values[name], dtype=current.dtype), (count,) + current.shape[1:])
+            setattr(self, name, np.concatenate([current, new]))
+
+    def cull(self, keep):
+        """Drop every particle where ``keep`` is False"""
+        for name in self._names:
+            setattr(self, name, getattr(self, name)[keep])
+
+    def respawn(self, mask, **values):
+        """Overwrite the fields of particles selected by ``mask`` (arrays sized to ``mask.sum()`` or scalars)"""
+        for name, value in values.items():
+            getattr(self, name)[mask] = value
+
+    def reflect(self, position, velocity, lower, upper, damping=1.0):
+        """Bounce ``position`` back inside ``[lower, upper]`` per axis, reversing and damping ``velocity``.
+
+        ``position`` and ``velocity`` name ``(N, D)`` fields; ``lower`` and
+        ``upper`` broadcast against them, so per-particle extents can be
+        folded in. The lower wall wins when both are crossed.
+        """
+        pos = getattr(self, position)
+        vel = getattr(self, velocity)
+        lower = np.broadcast_to(lower, pos.shape)
+        upper = np.broadcast_to(upper, pos.shape)
+
+        below = pos < lower
+        above = ~below & (pos > upper)
+        pos[below] = lower[below]
+        vel[below] = np.abs(vel[below]) * damping
+        pos[above] = upper[above]
+        vel[above] = -np.abs(vel[above]) * damping
+
+
+@lru_cache(maxsize=None)
+def disc_offsets(radius):
+    """``(dy, dx)`` offsets of the pixels ``cv2.circle`` fills for ``radius``, row-major"""
+    size = 2 * radius + 1
+    stamp = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(stamp, (radius, radius), radius, 1, -1)
+    dy, dx = np.nonzero(stamp)
+    return dy - radius, dx - radius
+
+
+@lru_cache(maxsize=None)
+def _disc_table(max_radius, width):
+    """Offsets for radii 0..max_radius concatenated, with flat ``dy * width + dx`` offsets, starts and pixel counts"""
+    offsets = [disc_offsets(radius) for radius in range(max_radius + 1)]
+    counts = np.array([len(dy) for dy, _ in offsets])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    dy = np.concatenate([dy for dy, _ in offsets])
+    dx = np.concatenate([dx for _, dx in offsets])
+    return dy, dx, dy * width + dx, starts, counts
+
+
+def splat_discs(img, x, y, radius, colors):
+    """Draw filled discs for every particle into ``img`` in one scatter.
+
+    ``x``, ``y`` and ``radius`` are integer arrays and ``colors`` is an
+    ``(N, C)`` array (or one colour for all). Discs cover exactly the pixels
+    ``cv2.circle(..., -1)`` would, and later particles are drawn over earlier
+    ones, so the result matches drawing them one by one.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    radius = np.asarray(radius, dtype=np.int64)
+    if x.size == 0:
+        return img
+
+    height, width = img.shape[:2]
+    table_dy, table_dx, table_flat, starts, counts = _disc_table(int(radius.max()), width)
+
+    # Ragged expansion in particle order: each particle owns counts[radius] consecutive rows
+    areas = counts[radius]
+    owner = np.repeat(np.arange(len(x)), areas)
+    first = np.cumsum(areas) - areas
+    table_index = np.arange(owner.size) - np.repeat(first - starts[radius], areas)
+    pixels = (y * width + x)[owner] + table_flat[table_index]
+
+    # Only discs that touch a border need their pixels clipped
+    clipped = (x < radius) | (x + radius >= width) | (y < radius) | (y + radius >= height)
+    if clipped.any():
+        check = np.flatnonzero(clipped[owner])
+        py = y[owner[check]] + table_dy[table_index[check]]
+        px = x[owner[check]] + table_dx[table_index[check]]
+        outside = check[(py < 0) | (py >= height) | (px < 0) | (px >= width)]
+        keep = np.ones(owner.size, dtype=bool)
+        keep[outside] = False
+        pixels = pixels[keep]
+        owner = owner[keep]
+
+    colors = np.asarray(colors, dtype=img.dtype)
+    if not img.flags.c_contiguous:
+        values = colors[owner] if colors.ndim > 1 else colors
+        img[pixels // width, pixels % width] = values
+        return img
+    # Scatter whole pixels as opaque records; repeated pixels keep the last (topmost) particle's colour
+    channels = img.shape[2] if img.ndim == 3 else 1
+    canvas = img.reshape(height * width, channels).view(np.dtype((np.void, channels * img.itemsize))).reshape(-1)
+    records = np.ascontiguousarray(colors.reshape(-1, channels)).view(canvas.dtype).reshape(-1)
+    canvas[pixels] = records[owner] if len(records) > 1 else records[0]
+    return img
@@ -0,0 +1,139 @@
+"""Cached loading of script presets (ScreenGen ``.scg``, VIZ ``.viz``) for DJZ-Nodes.
+
+Each preset file is compiled and executed once into its own module and the
+module is cached under the file's path, modification time and size. Later
+calls only ``stat`` the directory and re-execute files that were added or
+changed, so nodes can ask for their presets from ``INPUT_TYPES`` or every
+``generate`` without re-running every script. ``names`` lists presets from
+the filenames and a parse of each file (also cached), without executing any
+preset code.
+
+Usage:
+    from utils.preset_registry import get_preset_registry
+
+    registry = get_preset_registry(os.path.join(os.path.dirname(__file__), "VIZ"), "*.viz")
+    names = registry.names(required=("render",))  # no preset code runs
+    modules = registry.modules()                   # {name: module}, only changed files re-executed
+    failed = registry.errors                       # {name: exception} from the last modules() call
+"""
+
+import ast
+import glob
+import os
+import threading
+import types
+from functools import lru_cache
+
+__all__ = ["PresetRegistry", "get_preset_registry"]
+
+
+def _top_level_names(tree):
+    """Names a module binds at top level: functions, classes, assignments and imports"""
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+    return frozenset(names)
+
+
+class PresetRegistry:
+    """Preset scripts matching ``pattern`` in ``directory``, compiled once per file version"""
+
+    def __init__(self, directory, pattern):
+        self.directory = directory
+        self.pattern = pattern
+        self.errors = {}
+        self._modules = {}  # path -> (key, module or exception)
+        self._parsed = {}  # path -> (key, top-level names or None)
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        """``{path: (mtime_ns, size)}`` for every preset file, sorted by path"""
+        files = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, self.pattern))):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed between glob and stat
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    @staticmethod
+    def _name(path):
+        return os.path.splitext(os.path.basename(path))[0]
+
+    @staticmethod
+    def _read(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _execute(self, path):
+        """Compile and run one preset file in a fresh module"""
+        module = types.ModuleType(self._name(path))
+        module.__file__ = path
+        exec(compile(self._read(path), path, "exec"), module.__dict__)
+        return module
+
+    def names(self, required=()):
+        """Preset names, without executing any preset code.
+
+        Files that fail to parse, or do not bind every name in ``required`` at
+        top level, are left out.
+        """
+        with self._lock:
+            files = self._scan()
+            self._parsed = {path: entry for path, entry in self._parsed.items() if path in files}
+            names = []
+            for path, key in files.items():
+                cached = self._parsed.get(path)
+                if cached is None or cached[0] != key:
+                    try:
+                        defined = _top_level_names(ast.parse(self._read(path), path))
+                    except (OSError, SyntaxError, ValueError):
+                        defined = None
+                    cached = self._parsed[path] = (key, defined)
+                if cached[1] is not None and cached[1].issuperset(required):
+                    names.append(self._name(path))
+            return names
+
+    def modules(self):
+        """``{name: module}`` for every preset that ran, re-executing only new or changed files.
+
+        Files that raise are left out and their exception is kept in
+        ``self.errors`` until the file changes again.
+        """
+        with self._lock:
+            files = self._scan()
+            self._modules = {path: entry for path, entry in self._modules.items() if path in files}
+            for path, key in files.items():
+                cached = self._modules.get(path)
+                if cached is not None and cached[0] == key:
+                    continue
+                try:
+                    loaded = self._execute(path)
+                except Exception as e:
+                    print(f"Error loading preset {path}: {str(e)}")
+                    loaded = e
+                self._modules[path] = (key, loaded)
+
+            modules = {}
+            errors = {}
+            for path, (_, loaded) in self._modules.items():
+                if isinstance(loaded, Exception):
+                    errors[self._name(path)] = loaded
+                else:
+                    modules[self._name(path)] = loaded
+            self.errors = errors
+            return modules
+
+
+@lru_cache(maxsize=None)
+def get_preset_registry(directory, pattern):
+    """The process-wide registry for ``pattern`` in ``directory``, shared by every node instance"""
+    return PresetRegistry(os.path.abspath(directory), pattern)
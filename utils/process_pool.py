@@ -0,0 +1,54 @@
+"""Process-pool map with an in-process fallback for the DJZ nodes that render in parallel.
+
+Workers are forked where the platform supports it, so they inherit the
+already-imported node package. Where only spawn is available (Windows),
+a fresh worker has to import the task function by its module path, and
+ComfyUI loads custom nodes from a file path that a new interpreter cannot
+import. Rather than failing the whole render, ``pool_map`` then finishes
+the remaining tasks in the calling process.
+
+Usage:
+    from utils.process_pool import pool_map
+
+    for row_start, tile in pool_map(_render_tile_worker, tasks, workers):
+        output[row_start:row_start + len(tile)] = tile
+"""
+
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+__all__ = ["pool_context", "pool_map"]
+
+
+def pool_context():
+    """The fork context where available, else None for the platform default"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def pool_map(worker, tasks, workers):
+    """Yield ``worker(task)`` for every task, in order, on up to ``workers`` processes.
+
+    ``worker`` must be a module-level function. With one worker or one task
+    everything runs in this process. If the pool breaks or the task cannot
+    be pickled, a warning is printed and the tasks without a result yet are
+    run here instead; errors raised by ``worker`` itself propagate.
+    """
+    tasks = list(tasks)
+    done = 0
+    if workers > 1 and len(tasks) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as executor:
+                for result in executor.map(worker, tasks):
+                    done += 1
+                    yield result
+            return
+        except (BrokenProcessPool, pickle.PicklingError) as e:
+            print(f"Worker processes unavailable ({type(e).__name__}: {e}), "
+                  f"running the remaining {len(tasks) - done} tasks in this process")
+
+    for task in tasks[done:]:
+        yield worker(task)
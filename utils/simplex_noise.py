@@ -0,0 +1,201 @@
+"""Vectorized simplex noise shared by the DJZ noise nodes.
+
+``SimplexNoise`` evaluates noise for whole coordinate arrays in one call
+instead of one ``OpenSimplex.noise2`` call per sample. ``noise2`` is a NumPy
+port of OpenSimplex 2-D noise using the same seeded permutation, so a seed
+gives the same field as ``OpenSimplex(seed).noise2`` did per pixel.
+``noise3`` is 3-D simplex noise over the same permutation, for fields that
+evolve over time.
+
+Usage:
+    from utils.simplex_noise import SimplexNoise
+
+    noise = SimplexNoise(seed=1234)
+    field = noise.noise2(xs, ys)        # any broadcastable arrays, values in -1..1
+    frames = noise.noise3(xs, ys, ts)
+"""
+
+import numpy as np
+
+__all__ = ["SimplexNoise"]
+
+# OpenSimplex 2-D constants
+STRETCH_CONSTANT2 = -0.211324865405187  # (1/sqrt(2+1)-1)/2
+SQUISH_CONSTANT2 = 0.366025403784439  # (sqrt(2+1)-1)/2
+NORM_CONSTANT2 = 47
+
+# Gradients for 2D. They approximate the directions to the
+# vertices of an octagon from the center.
+GRADIENTS2 = np.array([
+    5, 2, 2, 5,
+    -5, 2, -2, 5,
+    5, -2, 2, -5,
+    -5, -2, -2, -5,
+], dtype=np.int64)
+
+# 3-D simplex skew factors and the 12 cube-edge gradients
+SKEW3 = 1.0 / 3.0
+UNSKEW3 = 1.0 / 6.0
+NORM_CONSTANT3 = 32.0
+GRADIENTS3 = np.array([
+    [1, 1, 0], [-1, 1, 0], [1, -1, 0], [-1, -1, 0],
+    [1, 0, 1], [-1, 0, 1], [1, 0, -1], [-1, 0, -1],
+    [0, 1, 1], [0, -1, 1], [0, 1, -1], [0, -1, -1],
+], dtype=np.float64)
+
+
+def _overflow(value):
+    """Wrap a Python int to signed 64 bits, as OpenSimplex seeding does"""
+    value &= 0xFFFFFFFFFFFFFFFF
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _permutation(seed):
+    """The 256-entry permutation OpenSimplex derives from ``seed``"""
+    perm = np.zeros(256, dtype=np.int64)
+    source = list(range(256))
+    seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+    seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+    seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+    for i in range(255, -1, -1):
+        seed = _overflow(seed * 6364136223846793005 + 1442695040888963407)
+        r = int((seed + 31) % (i + 1))
+        if r < 0:
+            r += i + 1
+        perm[i] = source[r]
+        source[r] = source[i]
+    return perm
+
+
+class SimplexNoise:
+    """Seeded 2-D and 3-D simplex noise evaluated over NumPy arrays"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.perm = _permutation(seed)
+
+    def _extrapolate2(self, xsb, ysb, dx, dy):
+        index = self.perm[(self.perm[xsb & 0xFF] + ysb) & 0xFF] & 0x0E
+        return GRADIENTS2[index] * dx + GRADIENTS2[index + 1] * dy
+
+    def _contribution2(self, xsb, ysb, dx, dy):
+        attn = 2 - dx * dx - dy * dy
+        attn = np.maximum(attn, 0)
+        attn *= attn
+        return attn * attn * self._extrapolate2(xsb, ysb, dx, dy)
+
+    def noise2(self, x, y):
+        """OpenSimplex 2-D noise for broadcastable coordinate arrays, in -1..1"""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+
+        # Place input coordinates onto grid.
+        stretch_offset = (x + y) * STRETCH_CONSTANT2
+        xs = x + stretch_offset
+        ys = y + stretch_offset
+
+        # Floor to get grid coordinates of rhombus (stretched square) super-cell origin.
+        xsb = np.floor(xs).astype(np.int64)
+        ysb = np.floor(ys).astype(np.int64)
+
+        # Skew out to get actual coordinates of rhombus origin.
+        squish_offset = (xsb + ysb) * SQUISH_CONSTANT2
+        xb = xsb + squish_offset
+        yb = ysb + squish_offset
+
+        # Grid coordinates relative to rhombus origin, summed to pick the region.
+        xins = xs - xsb
+        yins = ys - ysb
+        in_sum = xins + yins
+
+        # Positions relative to origin point.
+        dx0 = x - xb
+        dy0 = y - yb
+
+        # Contributions (1,0) and (0,1)
+        value = self._contribution2(xsb + 1, ysb + 0, dx0 - 1 - SQUISH_CONSTANT2, dy0 - 0 - SQUISH_CONSTANT2)
+        value = value + self._contribution2(xsb + 0, ysb + 1, dx0 - 0 - SQUISH_CONSTANT2, dy0 - 1 - SQUISH_CONSTANT2)
+
+        # Extra vertex, chosen per region exactly as the scalar OpenSimplex branches do
+        inside = in_sum <= 1  # Inside the triangle at (0,0), else at (1,1)
+        zins = np.where(inside, 1 - in_sum, 2 - in_sum)
+        x_greater = xins > yins
+        near_origin = inside & ((zins > xins) | (zins > yins))
+        near_far = ~inside & ((zins < xins) | (zins < yins))
+
+        xsv_ext = np.select(
+            [near_origin & x_greater, near_origin, inside, near_far & x_greater, near_far],
+            [xsb + 1, xsb - 1, xsb + 1, xsb + 2, xsb + 0],
+            xsb
+        )
+        ysv_ext = np.select(
+            [near_origin & x_greater, near_origin, inside, near_far & x_greater, near_far],
+            [ysb - 1, ysb + 1, ysb + 1, ysb + 0, ysb + 2],
+            ysb
+        )
+        dx_ext = np.select(
+            [near_origin & x_greater, near_origin, inside, near_far & x_greater, near_far],
+            [dx0 - 1, dx0 + 1, dx0 - 1 - 2 * SQUISH_CONSTANT2, dx0 - 2 - 2 * SQUISH_CONSTANT2,
+             dx0 + 0 - 2 * SQUISH_CONSTANT2],
+            dx0
+        )
+        dy_ext = np.select(
+            [near_origin & x_greater, near_origin, inside, near_far & x_greater, near_far],
+            [dy0 + 1, dy0 - 1, dy0 - 1 - 2 * SQUISH_CONSTANT2, dy0 + 0 - 2 * SQUISH_CONSTANT2,
+             dy0 - 2 - 2 * SQUISH_CONSTANT2],
+            dy0
+        )
+
+        # Contribution (0,0) or (1,1)
+        xsb = np.where(inside, xsb, xsb + 1)
+        ysb = np.where(inside, ysb, ysb + 1)
+        dx0 = np.where(inside, dx0, dx0 - 1 - 2 * SQUISH_CONSTANT2)
+        dy0 = np.where(inside, dy0, dy0 - 1 - 2 * SQUISH_CONSTANT2)
+        value = value + self._contribution2(xsb, ysb, dx0, dy0)
+
+        # Extra Vertex
+        value = value + self._contribution2(xsv_ext, ysv_ext, dx_ext, dy_ext)
+
+        return value / NORM_CONSTANT2
+
+    def _contribution3(self, i, j, k, dx, dy, dz):
+        index = self.perm[(i + self.perm[(j + self.perm[k & 0xFF]) & 0xFF]) & 0xFF] % 12
+        attn = np.maximum(0.6 - dx * dx - dy * dy - dz * dz, 0)
+        attn *= attn
+        return attn * attn * (GRADIENTS3[index, 0] * dx + GRADIENTS3[index, 1] * dy + GRADIENTS3[index, 2] * dz)
+
+    def noise3(self, x, y, z):
+        """3-D simplex noise for broadcastable coordinate arrays, in -1..1"""
+        x, y, z = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        )
+
+        # Skew into the simplex grid and find the containing cube
+        skew = (x + y + z) * SKEW3
+        i = np.floor(x + skew).astype(np.int64)
+        j = np.floor(y + skew).astype(np.int64)
+        k = np.floor(z + skew).astype(np.int64)
+        unskew = (i + j + k) * UNSKEW3
+        dx0 = x - (i - unskew)
+        dy0 = y - (j - unskew)
+        dz0 = z - (k - unskew)
+
+        # Rank the offsets to find which of the six tetrahedra holds the point
+        x_ge_y = dx0 >= dy0
+        y_ge_z = dy0 >= dz0
+        x_ge_z = dx0 >= dz0
+        i1 = (x_ge_y & x_ge_z).astype(np.int64)
+        j1 = (~x_ge_y & y_ge_z).astype(np.int64)
+        k1 = (~x_ge_z & ~y_ge_z).astype(np.int64)
+        i2 = (x_ge_y | x_ge_z).astype(np.int64)
+        j2 = (~x_ge_y | y_ge_z).astype(np.int64)
+        k2 = (~(x_ge_z & y_ge_z)).astype(np.int64)
+
+        value = self._contribution3(i, j, k, dx0, dy0, dz0)
+        value = value + self._contribution3(i + i1, j + j1, k + k1,
+                                            dx0 - i1 + UNSKEW3, dy0 - j1 + UNSKEW3, dz0 - k1 + UNSKEW3)
+        value = value + self._contribution3(i + i2, j + j2, k + k2,
+                                            dx0 - i2 + 2 * UNSKEW3, dy0 - j2 + 2 * UNSKEW3, dz0 - k2 + 2 * UNSKEW3)
+        value = value + self._contribution3(i + 1, j + 1, k + 1,
+                                            dx0 - 1 + 3 * UNSKEW3, dy0 - 1 + 3 * UNSKEW3, dz0 - 1 + 3 * UNSKEW3)
+
+        return value * NORM_CONSTANT3